@@ -20,6 +20,7 @@ import {
   Play,
 } from "lucide-react"
 import { MOCK_GAMES, type GameListing, type GameStatus } from "@/lib/games-data"
+import { BridgeTopics } from "@/lib/bridge-topics"
 
 const statusConfig: Record<
   GameStatus,
@@ -53,6 +54,13 @@ const statusConfig: Record<
 
 type FilterTab = "all" | "live" | "upcoming" | "ended"
 
+const BRIDGE_URL = process.env.NEXT_PUBLIC_BRIDGE_URL ?? "http://localhost:8000"
+
+// Bridge games list their thumbnail as a path on the bridge
+function thumbnailSrc(thumbnail: string) {
+  return thumbnail.startsWith("/") ? `${BRIDGE_URL}${thumbnail}` : thumbnail
+}
+
 function GameCard({ game }: { game: GameListing }) {
   const config = statusConfig[game.status]
   const isActive = game.status === "live" || game.status === "starting"
@@ -77,6 +85,11 @@ function GameCard({ game }: { game: GameListing }) {
           }}
         />
 
+        {/* Latest frame from the bridge, when the game is streaming */}
+        {game.thumbnail && (
+          <img src={thumbnailSrc(game.thumbnail)} alt="" className="absolute inset-0 size-full object-cover" />
+        )}
+
         {/* Animated scanline for live games */}
         {isActive && (
           <div className="absolute inset-0 overflow-hidden pointer-events-none">
@@ -243,6 +256,9 @@ function FeaturedGame({ game }: { game: GameListing }) {
             backgroundSize: "32px 32px",
           }}
         />
+        {game.thumbnail && (
+          <img src={thumbnailSrc(game.thumbnail)} alt="" className="absolute inset-0 size-full object-cover" />
+        )}
         <div className="absolute inset-0 overflow-hidden pointer-events-none">
           <div className="absolute left-0 right-0 h-px bg-primary/30 animate-[scan_4s_linear_infinite]" />
         </div>
@@ -356,34 +372,47 @@ function FeaturedGame({ game }: { game: GameListing }) {
   )
 }
 
-const BRIDGE_URL = process.env.NEXT_PUBLIC_BRIDGE_URL ?? "http://localhost:8000"
 
 export function GamesLobby() {
   const [filter, setFilter] = useState<FilterTab>("all")
   const [games, setGames] = useState(MOCK_GAMES)
   const [bridgeOnline, setBridgeOnline] = useState(false)
 
-  // Poll bridge server for live games every 5s
+  // Live games from the bridge's "lobby" topic; poll /games every 5s while the socket is down
   useEffect(() => {
+    function showBridgeGames(bridgeGames: GameListing[]) {
+      setBridgeOnline(true)
+      // Prepend real bridge games, keep mock ones that aren't duplicated
+      setGames((prev) => {
+        const bridgeIds = new Set(bridgeGames.map((g) => g.id))
+        const mocks = prev.filter((g) => !bridgeIds.has(g.id))
+        return [...bridgeGames, ...mocks]
+      })
+    }
     async function fetchBridgeGames() {
       try {
         const res = await fetch(`${BRIDGE_URL}/games`, { signal: AbortSignal.timeout(2000) })
         if (!res.ok) throw new Error()
-        const bridgeGames: GameListing[] = await res.json()
-        setBridgeOnline(true)
-        // Prepend real bridge games, keep mock ones that aren't duplicated
-        setGames((prev) => {
-          const bridgeIds = new Set(bridgeGames.map((g) => g.id))
-          const mocks = prev.filter((g) => !bridgeIds.has(g.id))
-          return [...bridgeGames, ...mocks]
-        })
+        showBridgeGames(await res.json())
       } catch {
         setBridgeOnline(false)
       }
     }
+    let interval: ReturnType<typeof setInterval> | null = null
+    const topics = new BridgeTopics((open) => {
+      if (open && interval) {
+        clearInterval(interval)
+        interval = null
+      } else if (!open && !interval) {
+        interval = setInterval(fetchBridgeGames, 5000)
+      }
+    })
+    topics.subscribe("lobby", (message) => showBridgeGames(message.games))
     fetchBridgeGames()
-    const interval = setInterval(fetchBridgeGames, 5000)
-    return () => clearInterval(interval)
+    return () => {
+      topics.close()
+      if (interval) clearInterval(interval)
+    }
   }, [])
 
   // Simulate live viewer/price fluctuations for mock games
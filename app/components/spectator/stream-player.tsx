@@ -17,9 +17,11 @@ import {
   ShieldAlert,
   Crown,
   Handshake,
+  Rewind,
   type LucideIcon,
 } from "lucide-react"
 import type { GameEventType } from "@/lib/game-types"
+import { VideoFramePainter } from "@/lib/video-frames"
 
 const eventIcons: Record<GameEventType, LucideIcon> = {
   GAME_START: Play,
@@ -69,69 +71,165 @@ const phaseLabels: Record<string, string> = {
 // LiveStream — renders the actual game video feed from FRAME events
 // ---------------------------------------------------------------------------
 
-const BRIDGE_WS = (process.env.NEXT_PUBLIC_BRIDGE_URL ?? "http://localhost:8000")
-  .replace(/^http/, "ws")
+const BRIDGE_HTTP = process.env.NEXT_PUBLIC_BRIDGE_URL ?? "http://localhost:8000"
+const BRIDGE_WS = BRIDGE_HTTP.replace(/^http/, "ws")
+
+const MAIN_FEED = "main"
+
+// Stream renditions the bridge can pick for a viewer ("auto" follows the connection)
+const RENDITIONS = ["auto", "high", "medium", "low"] as const
+type Rendition = (typeof RENDITIONS)[number]
+
+const renditionLabels: Record<Rendition, string> = {
+  auto: "AUTO",
+  high: "HD",
+  medium: "SD",
+  low: "LOW",
+}
+
+function feedLabel(feed: string) {
+  if (feed === MAIN_FEED) return "MAIN"
+  if (feed.startsWith("pov-")) return `POV ${feed.slice(4).toUpperCase()}`
+  return feed.toUpperCase()
+}
 
 function LiveStream({ gameId }: { gameId?: string }) {
-  const imgRef = useRef<HTMLImageElement>(null)
+  const canvasRef = useRef<HTMLCanvasElement>(null)
   const wsRef = useRef<WebSocket | null>(null)
-  const prevUrlRef = useRef<string | null>(null)
   const [connected, setConnected] = useState(false)
+  const [feeds, setFeeds] = useState<string[]>([MAIN_FEED])
+  const [camera, setCamera] = useState(MAIN_FEED)
+  const [rendition, setRendition] = useState<Rendition>("auto")
+  const renditionRef = useRef<Rendition>("auto")
+  const [replaying, setReplaying] = useState(false)
 
+  // Camera feeds the game is currently streaming (imposter, director, POVs...)
   useEffect(() => {
     if (!gameId) return
+    let cancelled = false
+
+    async function poll() {
+      try {
+        const res = await fetch(`${BRIDGE_HTTP}/game/${gameId}/feeds`, { signal: AbortSignal.timeout(2000) })
+        if (!res.ok) return
+        const data = await res.json()
+        if (!cancelled && Array.isArray(data.feeds) && data.feeds.length > 0) setFeeds(data.feeds)
+      } catch {
+        // Bridge unreachable — keep the last known list
+      }
+    }
+
+    poll()
+    const timer = setInterval(poll, 5000)
+    return () => {
+      cancelled = true
+      clearInterval(timer)
+    }
+  }, [gameId])
+
+  useEffect(() => {
+    if (!gameId) return
+    let closed = false
 
     // Dedicated binary video channel — no base64, no JSON parsing
-    const url = `${BRIDGE_WS}/ws/video/${gameId}`
+    const url = camera === MAIN_FEED
+      ? `${BRIDGE_WS}/ws/video/${gameId}`
+      : `${BRIDGE_WS}/ws/video/${gameId}/${camera}`
+
+    const canvas = canvasRef.current
+    if (!canvas) return
+    const painter = new VideoFramePainter(canvas)
 
     function connect() {
-      const ws = new WebSocket(url)
+      const ws = new WebSocket(`${url}?rendition=${renditionRef.current}`)
       ws.binaryType = "arraybuffer"  // Raw bytes, fastest option
       wsRef.current = ws
 
-      ws.onopen = () => setConnected(true)
+      ws.onopen = () => {
+        // The bridge starts every subscription with a keyframe
+        painter.reset()
+        setConnected(true)
+      }
 
       ws.onmessage = (ev) => {
+        // Keyframes and tile deltas; text frames are PINGs, rendition changes and replays
         if (ev.data instanceof ArrayBuffer) {
-          const blob = new Blob([ev.data], { type: "image/jpeg" })
-          const objUrl = URL.createObjectURL(blob)
-          if (imgRef.current) imgRef.current.src = objUrl
-          // Revoke previous URL after new one is set
-          if (prevUrlRef.current) URL.revokeObjectURL(prevUrlRef.current)
-          prevUrlRef.current = objUrl
+          painter.push(ev.data)
+          return
+        }
+        try {
+          const msg = JSON.parse(ev.data)
+          if (msg.type === "RENDITION") painter.renditionChanged()
+          // A replay starts on a keyframe of its own, live video resumes on the next one
+          if (msg.type === "REPLAY_START" || (msg.type === "REPLAY_END" && !msg.error)) {
+            painter.reset()
+            setReplaying(msg.type === "REPLAY_START")
+          }
+        } catch {
+          // Not JSON — ignore
         }
-        // Ignore text PING frames
       }
 
       ws.onclose = () => {
         setConnected(false)
-        setTimeout(connect, 1500)
+        setReplaying(false)
+        if (!closed) setTimeout(connect, 1500)
       }
       ws.onerror = () => ws.close()
     }
 
+    // Report measured capture → painted lag so the bridge can show it in its metrics
+    const statsTimer = setInterval(() => {
+      const stats = painter.takeStats()
+      const ws = wsRef.current
+      if (stats.lagMs !== null && ws?.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({ type: "VIDEO_STATS", lag_ms: stats.lagMs, dropped: stats.dropped }))
+      }
+    }, 5000)
+
     connect()
     return () => {
+      closed = true
+      clearInterval(statsTimer)
       wsRef.current?.close()
-      if (prevUrlRef.current) URL.revokeObjectURL(prevUrlRef.current)
     }
-  }, [gameId])
+  }, [gameId, camera])
+
+  // Switching rendition keeps the connection; the bridge changes over at the next keyframe
+  function chooseRendition(r: Rendition) {
+    renditionRef.current = r
+    setRendition(r)
+    const ws = wsRef.current
+    if (ws?.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: "SET_RENDITION", rendition: r }))
+  }
+
+  // Instant replay of the latest kill or ejection, from the bridge's frame buffer
+  function requestReplay() {
+    const ws = wsRef.current
+    if (ws?.readyState === WebSocket.OPEN && !replaying) ws.send(JSON.stringify({ type: "REPLAY" }))
+  }
 
   if (!gameId) return null
 
   return (
     <div className="absolute inset-0 bg-black">
       {/* Live game video */}
-      {/* eslint-disable-next-line @next/next/no-img-element */}
-      <img
-        ref={imgRef}
-        alt="Live game stream"
+      <canvas
+        ref={canvasRef}
+        aria-label="Live game stream"
         className="w-full h-full object-contain"
-        style={{ imageRendering: "auto" }}
       />
 
-      {/* LIVE badge */}
-      {connected && (
+      {/* LIVE / REPLAY badge */}
+      {connected && replaying && (
+        <div className="absolute top-3 left-3 flex items-center gap-1.5 rounded-md bg-black/70 backdrop-blur-sm border border-accent/50 px-2.5 py-1">
+          <Rewind className="size-3 text-accent" />
+          <span className="font-mono text-[10px] font-bold text-accent tracking-wider">
+            REPLAY
+          </span>
+        </div>
+      )}
+      {connected && !replaying && (
         <div className="absolute top-3 left-3 flex items-center gap-1.5 rounded-md bg-black/70 backdrop-blur-sm border border-destructive/50 px-2.5 py-1">
           <span className="size-1.5 rounded-full bg-destructive animate-pulse" />
           <span className="font-mono text-[10px] font-bold text-destructive tracking-wider">
@@ -140,6 +238,55 @@ function LiveStream({ gameId }: { gameId?: string }) {
         </div>
       )}
 
+      <div className="absolute bottom-3 left-3 z-10 flex items-center gap-2">
+        {/* Camera feed switcher */}
+        {feeds.length > 1 && (
+          <div className="flex items-center gap-1 rounded-md bg-black/70 backdrop-blur-sm border border-border/50 p-1">
+            {feeds.map((f) => (
+              <button
+                key={f}
+                type="button"
+                onClick={() => setCamera(f)}
+                className={`rounded px-2 py-0.5 font-mono text-[10px] font-bold tracking-wider transition-colors ${f === camera
+                  ? "bg-primary/20 text-primary"
+                  : "text-muted-foreground hover:text-foreground"
+                  }`}
+              >
+                {feedLabel(f)}
+              </button>
+            ))}
+          </div>
+        )}
+
+        {/* Rendition picker */}
+        <div className="flex items-center gap-1 rounded-md bg-black/70 backdrop-blur-sm border border-border/50 p-1">
+          {RENDITIONS.map((r) => (
+            <button
+              key={r}
+              type="button"
+              onClick={() => chooseRendition(r)}
+              className={`rounded px-2 py-0.5 font-mono text-[10px] font-bold tracking-wider transition-colors ${r === rendition
+                ? "bg-primary/20 text-primary"
+                : "text-muted-foreground hover:text-foreground"
+                }`}
+            >
+              {renditionLabels[r]}
+            </button>
+          ))}
+        </div>
+
+        {/* Instant replay */}
+        <button
+          type="button"
+          onClick={requestReplay}
+          disabled={!connected || replaying}
+          className="flex items-center gap-1 rounded-md bg-black/70 backdrop-blur-sm border border-border/50 px-2 py-1 font-mono text-[10px] font-bold tracking-wider text-muted-foreground hover:text-foreground disabled:opacity-40"
+        >
+          <Rewind className="size-3" />
+          REPLAY
+        </button>
+      </div>
+
       {/* Connecting overlay */}
       {!connected && (
         <div className="absolute inset-0 flex items-center justify-center bg-black/80">
@@ -10,6 +10,7 @@ import type {
   MarketKind,
   PredictionChoice,
   PredictionMarket,
+  StateSnapshot,
 } from "@/lib/game-types"
 
 const AGENT_COLORS = [
@@ -561,12 +562,46 @@ function resetGame() {
   setState(() => createInitialState())
 }
 
+// Start from the bridge's view of a game already under way; live events follow
+function applySnapshot({ state: snapshot }: StateSnapshot) {
+  if (meetingUnlockTimer) clearTimeout(meetingUnlockTimer)
+  setState((prev) => {
+    const leaderboard = initialLeaderboard()
+    const markets = snapshot.markets.map((m) => {
+      const market = withBotPredictions(
+        createMarket(m.kind, m.question, m.relatedAgent ?? undefined),
+        leaderboard,
+        CURRENT_USER_ID
+      )
+      return m.status === "RESOLVED" && m.resolved
+        ? { ...market, status: "RESOLVED" as const, resolved: m.resolved, resolvedAt: market.createdAt }
+        : market
+    })
+    return {
+      ...createInitialState(),
+      phase: snapshot.phase,
+      agents: snapshot.agents.map((a, i) => ({
+        name: a.name,
+        alive: a.alive,
+        ejected: a.ejected,
+        color: AGENT_COLORS[i % AGENT_COLORS.length],
+      })),
+      markets,
+      leaderboard,
+      imposter: snapshot.imposter,
+      winner: snapshot.winner,
+      connectionStatus: prev.connectionStatus,
+    }
+  })
+}
+
 export function useGameStore() {
   return useSyncExternalStore(subscribe, getSnapshot, getSnapshot)
 }
 
 export const gameActions = {
   processEvent,
+  applySnapshot,
   submitPrediction,
   setConnectionStatus: (status: GameState["connectionStatus"]) =>
     setState((prev) => ({ ...prev, connectionStatus: status })),
@@ -2,7 +2,7 @@
 
 import { useEffect, useRef } from "react"
 import { gameActions } from "./use-game-store"
-import type { GameEvent } from "@/lib/game-types"
+import type { GameEvent, StateSnapshot } from "@/lib/game-types"
 
 const BRIDGE_BASE = process.env.NEXT_PUBLIC_BRIDGE_URL ?? "http://localhost:8000"
 const WS_BASE = BRIDGE_BASE.replace(/^http/, "ws")
@@ -14,12 +14,14 @@ export function useWebSocket(gameId?: string) {
 
   useEffect(() => {
     const wsUrl = gameId ? `${WS_BASE}/ws/game/${gameId}` : `${WS_BASE}/ws`
+    // Sequence number of the last event seen; reconnects resume after it
+    let lastSeq: number | null = null
 
     function connect() {
       gameActions.setConnectionStatus("connecting")
 
       try {
-        const ws = new WebSocket(wsUrl)
+        const ws = new WebSocket(gameId && lastSeq !== null ? `${wsUrl}?since=${lastSeq}` : wsUrl)
         wsRef.current = ws
 
         ws.onopen = () => {
@@ -31,6 +33,11 @@ export function useWebSocket(gameId?: string) {
             // eslint-disable-next-line @typescript-eslint/no-explicit-any
             const data = JSON.parse(event.data) as any
             if (data.type === "PING") return
+            if (typeof data.seq === "number") lastSeq = data.seq
+            if (data.type === "STATE_SNAPSHOT") {
+              gameActions.applySnapshot(data as StateSnapshot)
+              return
+            }
             const gameEvent = data as GameEvent
             if (gameEvent.type) {
               gameActions.processEvent(gameEvent)
@@ -0,0 +1,99 @@
+// One WebSocket to the bridge's /ws/topics for any number of subscriptions
+// (ws_topics in game/bridge_server.py):
+//
+//   "game:<id>"              game events (STATE_SNAPSHOT first), like /ws/game/<id>
+//   "markets:<id>"           MARKETS whenever a prediction market opens or resolves
+//   "lobby"                  LOBBY, the /games list, whenever it changes
+//   "video:<id>[/<feed>]"    binary frames tagged "SUST" | length u8 | topic
+//
+// Subscriptions survive reconnects: they are sent again when the socket reopens.
+
+const BRIDGE_BASE = process.env.NEXT_PUBLIC_BRIDGE_URL ?? "http://localhost:8000"
+const TOPICS_URL = `${BRIDGE_BASE.replace(/^http/, "ws")}/ws/topics`
+const RECONNECT_INTERVAL = 3000
+
+// eslint-disable-next-line @typescript-eslint/no-explicit-any
+type TopicMessage = any
+type Handler = (message: TopicMessage) => void
+
+const TOPIC_MAGIC = "SUST"
+
+// Split a tagged binary message into its topic and the video frame
+export function unpackTopic(data: ArrayBuffer): { topic: string | null; frame: ArrayBuffer } {
+  const bytes = new Uint8Array(data)
+  for (let i = 0; i < 4; i++) {
+    if (bytes[i] !== TOPIC_MAGIC.charCodeAt(i)) return { topic: null, frame: data }
+  }
+  const end = 5 + bytes[4]
+  return { topic: new TextDecoder().decode(bytes.subarray(5, end)), frame: data.slice(end) }
+}
+
+// Which subscription a text message belongs to
+function topicOf(message: TopicMessage): string | null {
+  if (typeof message.topic === "string") return message.topic
+  if (message.type === "LOBBY") return "lobby"
+  if (message.type === "MARKETS") return `markets:${message.game_id}`
+  if (typeof message.game_id === "string") return `game:${message.game_id}`
+  return null
+}
+
+export class BridgeTopics {
+  private ws: WebSocket | null = null
+  private handlers = new Map<string, { handler: Handler; params: Record<string, unknown> }>()
+  private reconnectTimer: ReturnType<typeof setTimeout> | null = null
+  private closed = false
+
+  constructor(private onStatus?: (open: boolean) => void) {
+    this.connect()
+  }
+
+  subscribe(topic: string, handler: Handler, params: Record<string, unknown> = {}) {
+    this.handlers.set(topic, { handler, params })
+    this.send({ op: "subscribe", topic, ...params })
+    return () => this.unsubscribe(topic)
+  }
+
+  unsubscribe(topic: string) {
+    if (this.handlers.delete(topic)) this.send({ op: "unsubscribe", topic })
+  }
+
+  close() {
+    this.closed = true
+    if (this.reconnectTimer) clearTimeout(this.reconnectTimer)
+    this.ws?.close()
+  }
+
+  private send(message: object) {
+    if (this.ws?.readyState === WebSocket.OPEN) this.ws.send(JSON.stringify(message))
+  }
+
+  private connect() {
+    const ws = new WebSocket(TOPICS_URL)
+    ws.binaryType = "arraybuffer"
+    this.ws = ws
+    ws.onopen = () => {
+      this.onStatus?.(true)
+      this.handlers.forEach(({ params }, topic) => this.send({ op: "subscribe", topic, ...params }))
+    }
+    ws.onmessage = (event) => {
+      if (event.data instanceof ArrayBuffer) {
+        const { topic, frame } = unpackTopic(event.data)
+        if (topic) this.handlers.get(topic)?.handler(frame)
+        return
+      }
+      try {
+        const message = JSON.parse(event.data)
+        if (message.type === "PING" || message.type === "SUBSCRIBED" || message.type === "UNSUBSCRIBED") return
+        const topic = topicOf(message)
+        if (topic) this.handlers.get(topic)?.handler(message)
+      } catch {
+        // Ignore malformed messages
+      }
+    }
+    ws.onclose = () => {
+      this.onStatus?.(false)
+      if (!this.closed) this.reconnectTimer = setTimeout(() => this.connect(), RECONNECT_INTERVAL)
+    }
+    ws.onerror = () => ws.close()
+  }
+}
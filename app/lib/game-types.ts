@@ -87,6 +87,31 @@ export interface ChessStalemateEvent {
   turn: string
 }
 
+// --- Snapshot sent by the bridge to a client joining mid-game (game/game_snapshot.py) ---
+export interface SnapshotMarket {
+  kind: MarketKind
+  question: string
+  relatedAgent: string | null
+  status: "OPEN" | "RESOLVED"
+  resolved: PredictionChoice | null
+}
+
+export interface StateSnapshot {
+  type: "STATE_SNAPSHOT"
+  game_id: string
+  seq: number
+  state: {
+    phase: GamePhase
+    agents: { name: string; alive: boolean; ejected?: boolean }[]
+    imposter: string | null
+    winner: string | null
+    meeting: { caller: string | null; votes: Record<string, string | null> } | null
+    markets: SnapshotMarket[]
+    hypeScore: number
+    kills: number
+  }
+}
+
 // --- Feed item for the event log ---
 export interface FeedItem {
   id: string
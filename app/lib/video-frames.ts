@@ -0,0 +1,152 @@
+// Binary video frames from the bridge (/ws/video/...), see game/stream_format.py
+//
+//   header    "SUSF" | seq u32 | tick u32 | captured_at f64 | encode_us u32   (optional)
+//   keyframe  a complete JPEG
+//   delta     "SUSD" | width u16 | height u16 | tile count u16
+//             per tile: x u16 | y u16 | w u16 | h u16 | length u32 | JPEG
+//
+// All integers are little-endian; captured_at is Unix time in seconds.
+
+export type DeltaTile = { x: number; y: number; w: number; h: number; jpeg: Uint8Array }
+
+export type FrameHeader = { seq: number; tick: number; capturedAt: number; encodeUs: number }
+
+export type VideoFrame = { header: FrameHeader | null } & (
+  | { kind: "keyframe"; jpeg: Uint8Array }
+  | { kind: "delta"; width: number; height: number; tiles: DeltaTile[] }
+)
+
+const FRAME_HEADER = 24
+const DELTA_HEADER = 10
+const TILE_HEADER = 12
+
+function hasMagic(bytes: Uint8Array, offset: number, magic: string) {
+  for (let i = 0; i < 4; i++) {
+    if (bytes[offset + i] !== magic.charCodeAt(i)) return false
+  }
+  return true
+}
+
+export function parseVideoFrame(data: ArrayBuffer): VideoFrame {
+  const bytes = new Uint8Array(data)
+  const view = new DataView(data)
+  let header: FrameHeader | null = null
+  let start = 0
+  if (bytes.length >= FRAME_HEADER && hasMagic(bytes, 0, "SUSF")) {
+    header = {
+      seq: view.getUint32(4, true),
+      tick: view.getUint32(8, true),
+      capturedAt: view.getFloat64(12, true),
+      encodeUs: view.getUint32(20, true),
+    }
+    start = FRAME_HEADER
+  }
+  if (bytes.length < start + DELTA_HEADER || !hasMagic(bytes, start, "SUSD")) {
+    return { header, kind: "keyframe", jpeg: bytes.subarray(start) }
+  }
+
+  const width = view.getUint16(start + 4, true)
+  const height = view.getUint16(start + 6, true)
+  const count = view.getUint16(start + 8, true)
+  const tiles: DeltaTile[] = []
+  let offset = start + DELTA_HEADER
+  for (let i = 0; i < count; i++) {
+    const x = view.getUint16(offset, true)
+    const y = view.getUint16(offset + 2, true)
+    const w = view.getUint16(offset + 4, true)
+    const h = view.getUint16(offset + 6, true)
+    const length = view.getUint32(offset + 8, true)
+    offset += TILE_HEADER
+    tiles.push({ x, y, w, h, jpeg: bytes.subarray(offset, offset + length) })
+    offset += length
+  }
+  return { header, kind: "delta", width, height, tiles }
+}
+
+function decodeJpeg(jpeg: Uint8Array) {
+  return createImageBitmap(new Blob([jpeg], { type: "image/jpeg" }))
+}
+
+export type VideoStats = { lagMs: number | null; dropped: number; tick: number | null }
+
+// Paints frames onto a canvas in arrival order. Deltas are only applied on
+// top of a keyframe of the same size; anything else waits for the next one.
+// Frame headers give the capture → painted lag and dropped frames (seq gaps).
+export class VideoFramePainter {
+  private hasKeyframe = false
+  private chain: Promise<void> = Promise.resolve()
+  private lastSeq: number | null = null
+  private lastTick: number | null = null
+  private lagSum = 0
+  private lagCount = 0
+  private dropped = 0
+
+  constructor(private canvas: HTMLCanvasElement) {}
+
+  reset() {
+    this.hasKeyframe = false
+    this.lastSeq = null
+  }
+
+  // Each rendition numbers its frames separately
+  renditionChanged() {
+    this.lastSeq = null
+  }
+
+  push(data: ArrayBuffer) {
+    const frame = parseVideoFrame(data)
+    this.chain = this.chain.then(async () => {
+      await this.paint(frame)
+      this.measure(frame.header)
+    }).catch(() => {
+      // Undecodable frame — resync on the next keyframe
+      this.hasKeyframe = false
+    })
+  }
+
+  // Stats since the previous call
+  takeStats(): VideoStats {
+    const stats = {
+      lagMs: this.lagCount ? Math.round(this.lagSum / this.lagCount) : null,
+      dropped: this.dropped,
+      tick: this.lastTick,
+    }
+    this.lagSum = 0
+    this.lagCount = 0
+    this.dropped = 0
+    return stats
+  }
+
+  private measure(header: FrameHeader | null) {
+    if (!header) return
+    if (this.lastSeq !== null && header.seq > this.lastSeq + 1) this.dropped += header.seq - this.lastSeq - 1
+    this.lastSeq = header.seq
+    this.lastTick = header.tick
+    this.lagSum += Date.now() - header.capturedAt * 1000
+    this.lagCount++
+  }
+
+  private async paint(frame: VideoFrame) {
+    const ctx = this.canvas.getContext("2d")
+    if (!ctx) return
+
+    if (frame.kind === "keyframe") {
+      const bitmap = await decodeJpeg(frame.jpeg)
+      if (this.canvas.width !== bitmap.width || this.canvas.height !== bitmap.height) {
+        this.canvas.width = bitmap.width
+        this.canvas.height = bitmap.height
+      }
+      ctx.drawImage(bitmap, 0, 0)
+      bitmap.close()
+      this.hasKeyframe = true
+      return
+    }
+
+    if (!this.hasKeyframe || frame.width !== this.canvas.width || frame.height !== this.canvas.height) return
+    const bitmaps = await Promise.all(frame.tiles.map((t) => decodeJpeg(t.jpeg)))
+    frame.tiles.forEach((t, i) => {
+      ctx.drawImage(bitmaps[i], t.x, t.y)
+      bitmaps[i].close()
+    })
+  }
+}
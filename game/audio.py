@@ -0,0 +1,212 @@
+"""
+Audio subsystem — lazy decoding, released ambience and a no-audio mode.
+
+The game ships tens of megabytes of WAVs. Decoding all of them into
+pg.mixer.Sound objects up front costs startup time and resident memory,
+and autonomous matches on a server have nobody listening at all.
+
+  LazySound     — decodes its file on first play(); stop()/fadeout() on a
+                  sound that was never played are free.
+  AmbientSound  — a LazySound that drops its decoded samples again once it
+                  is stopped or faded out, so only the rooms currently
+                  audible are resident.
+  NullSound     — shared no-op stand-in used when audio is disabled.
+
+pygame can only stream one file at a time (pg.mixer.music); that stream
+stays reserved for the background loop and is driven through Audio, as is
+mixer channel 0, reserved for the looping sabotage alarm.
+
+Audio is disabled with SUS_AUDIO=off (or Audio(enabled=False)); in that
+mode the mixer is never initialised and every sound is a NullSound.
+"""
+from __future__ import annotations
+
+import os
+from os import path
+from typing import Dict, Iterable, List, Optional
+
+import pygame as pg
+
+ALARM_CHANNEL = 0   # mixer channel the looping sabotage alarm plays on
+
+
+def audio_enabled(default: bool = True) -> bool:
+    """Read the SUS_AUDIO switch (off/0/false/no disables audio)."""
+    value = os.environ.get("SUS_AUDIO", "").strip().lower()
+    if value in {"off", "0", "false", "no", "none"}:
+        return False
+    if value in {"on", "1", "true", "yes"}:
+        return True
+    return default
+
+
+class NullSound:
+    """Accepts the pg.mixer.Sound calls the game makes and does nothing."""
+
+    sound = None
+
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        return None
+
+    def fadeout(self, ms):
+        return None
+
+    def set_volume(self, value):
+        return None
+
+    def get_volume(self):
+        return 0.0
+
+    def get_length(self):
+        return 0.0
+
+    def get_num_channels(self):
+        return 0
+
+
+NULL_SOUND = NullSound()
+
+
+class LazySound:
+    """A sound file that is decoded the first time it is played."""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._sound: Optional[pg.mixer.Sound] = None
+        self._volume: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._sound is not None
+
+    @property
+    def sound(self) -> pg.mixer.Sound:
+        """The decoded pg.mixer.Sound (decodes now if needed)."""
+        if self._sound is None:
+            self._sound = pg.mixer.Sound(self.filename)
+            if self._volume is not None:
+                self._sound.set_volume(self._volume)
+        return self._sound
+
+    def play(self, *args, **kwargs):
+        return self.sound.play(*args, **kwargs)
+
+    def stop(self):
+        if self._sound is not None:
+            self._sound.stop()
+
+    def fadeout(self, ms):
+        if self._sound is not None:
+            self._sound.fadeout(ms)
+
+    def set_volume(self, value):
+        self._volume = value
+        if self._sound is not None:
+            self._sound.set_volume(value)
+
+    def get_volume(self):
+        if self._sound is None:
+            return 1.0 if self._volume is None else self._volume
+        return self._sound.get_volume()
+
+    def get_length(self):
+        return self.sound.get_length()
+
+    def get_num_channels(self):
+        return 0 if self._sound is None else self._sound.get_num_channels()
+
+
+class AmbientSound(LazySound):
+    """
+    Long looping room ambience.
+
+    The decoded samples are released on stop()/fadeout(); a playing
+    channel keeps its own reference, so a fade still completes.
+    """
+
+    def stop(self):
+        super().stop()
+        self._sound = None
+
+    def fadeout(self, ms):
+        super().fadeout(ms)
+        self._sound = None
+
+
+class Audio:
+    """Owns mixer initialisation and hands out sound objects for the game."""
+
+    def __init__(self, sound_folder: str, enabled: Optional[bool] = None):
+        self.sound_folder = sound_folder
+        self.enabled = audio_enabled() if enabled is None else enabled
+        self._music_loaded = False
+        if self.enabled:
+            try:
+                if not pg.mixer.get_init():
+                    pg.mixer.init()
+            except pg.error:
+                # No audio device (e.g. headless host) — run silent.
+                self.enabled = False
+
+    # ------------------------------------------------------------------
+    # Sound factories
+    # ------------------------------------------------------------------
+
+    def _path(self, filename: str) -> str:
+        return path.join(self.sound_folder, filename)
+
+    def effect(self, filename: str):
+        if not self.enabled:
+            return NULL_SOUND
+        return LazySound(self._path(filename))
+
+    def ambient(self, filename: str):
+        if not self.enabled:
+            return NULL_SOUND
+        return AmbientSound(self._path(filename))
+
+    def effects(self, files: Dict[str, str]) -> Dict[str, object]:
+        return {name: self.effect(filename) for name, filename in files.items()}
+
+    def effect_list(self, files: Iterable[str]) -> List[object]:
+        return [self.effect(filename) for filename in files]
+
+    def ambients(self, files: Dict[str, str]) -> Dict[str, object]:
+        return {name: self.ambient(filename) for name, filename in files.items()}
+
+    # ------------------------------------------------------------------
+    # Background music (streamed by pg.mixer.music)
+    # ------------------------------------------------------------------
+
+    def load_music(self, filename: str):
+        if not self.enabled:
+            return
+        pg.mixer.music.load(self._path(filename))
+        self._music_loaded = True
+
+    def play_music(self, loops: int = -1, volume: Optional[float] = None):
+        if not self._music_loaded:
+            return
+        pg.mixer.music.play(loops)
+        if volume is not None:
+            pg.mixer.music.set_volume(volume)
+
+    def stop_music(self):
+        if self._music_loaded:
+            pg.mixer.music.stop()
+
+    # ------------------------------------------------------------------
+    # Alarm channel (a looping effect that can be stopped on its own)
+    # ------------------------------------------------------------------
+
+    def play_alarm(self, sound, loops: int = -1):
+        if not self.enabled:
+            return
+        pg.mixer.Channel(ALARM_CHANNEL).play(sound.sound, loops=loops)
+
+    def stop_alarm(self):
+        if self.enabled:
+            pg.mixer.Channel(ALARM_CHANNEL).stop()
@@ -16,6 +16,7 @@ Implements all Functional Requirements from AGENT.md:
 """
 from __future__ import annotations
 
+import os
 import random
 import math
 import pygame as pg
@@ -23,7 +24,11 @@ import sys
 
 from game import Game
 from sprites import Player, Bot
+from palette import SUIT_COLOURS, agent_sprites, suit_colour
 from settings import *
+from tilemap import ViewportCamera
+from frame_streamer import capture_size
+from camera_feeds import MAIN_FEED, CameraFeed, ScaledAssets, feed_ids_from_env
 from runtime_adapters import AgentRuntime, EventRuntime, LocalAgentRuntime, build_event_runtime
 
 
@@ -31,20 +36,15 @@ from runtime_adapters import AgentRuntime, EventRuntime, LocalAgentRuntime, buil
 # Color-to-sprite lookup (avoids eval)
 # ---------------------------------------------------------------------------
 
-def build_color_sprites():
-    """Build dict mapping colour name -> directional sprite arrays."""
-    return {
-        "Red":    {"left": red_player_imgs_left,    "right": red_player_imgs_right,    "up": red_player_imgs_up,    "down": red_player_imgs_down,    "dead": red_player_imgs_dead},
-        "Blue":   {"left": blue_player_imgs_left,   "right": blue_player_imgs_right,   "up": blue_player_imgs_up,   "down": blue_player_imgs_down,   "dead": blue_player_imgs_dead},
-        "Green":  {"left": green_player_imgs_left,  "right": green_player_imgs_right,  "up": green_player_imgs_up,  "down": green_player_imgs_down,  "dead": green_player_imgs_dead},
-        "Orange": {"left": orange_player_imgs_left, "right": orange_player_imgs_right, "up": orange_player_imgs_up, "down": orange_player_imgs_down, "dead": orange_player_imgs_dead},
-        "Yellow": {"left": yellow_player_imgs_left, "right": yellow_player_imgs_right, "up": yellow_player_imgs_up, "down": yellow_player_imgs_down, "dead": yellow_player_imgs_dead},
-        "Black":  {"left": black_player_imgs_left,  "right": black_player_imgs_right,  "up": black_player_imgs_up,  "down": black_player_imgs_down,  "dead": black_player_imgs_dead},
-        "Brown":  {"left": brown_player_imgs_left,  "right": brown_player_imgs_right,  "up": brown_player_imgs_up,  "down": brown_player_imgs_down,  "dead": brown_player_imgs_dead},
-        "Pink":   {"left": pink_player_imgs_left,   "right": pink_player_imgs_right,   "up": pink_player_imgs_up,   "down": pink_player_imgs_down,   "dead": pink_player_imgs_dead},
-        "Purple": {"left": purple_player_imgs_left, "right": purple_player_imgs_right, "up": purple_player_imgs_up, "down": purple_player_imgs_down, "dead": purple_player_imgs_dead},
-        "White":  {"left": white_player_imgs_left,  "right": white_player_imgs_right,  "up": white_player_imgs_up,  "down": white_player_imgs_down,  "dead": white_player_imgs_dead},
-    }
+def build_color_sprites(colours=None):
+    """
+    Build dict mapping colour name -> directional sprite arrays.
+
+    Sprites come from the shared palette cache, so any number of distinct
+    agent colours can be requested; only colours actually asked for are
+    generated.
+    """
+    return {c: agent_sprites(c) for c in (colours or SUIT_COLOURS)}
 
 
 # Display-color mapping for HUD text
@@ -55,9 +55,33 @@ COLOR_MAP = {
     "White": (230, 230, 230),
 }
 
+
+def hud_colour(colour):
+    """HUD text colour for an agent; generated agents reuse their suit colour."""
+    return COLOR_MAP.get(colour) or suit_colour(colour)
+
+
 vec = pg.math.Vector2
 
 
+# ---------------------------------------------------------------------------
+# Render target
+# ---------------------------------------------------------------------------
+
+RENDER_TARGETS = ("window", "stream")
+
+
+def render_target_from_env(default: str = "window") -> str:
+    """
+    Read SUS_RENDER_TARGET.
+
+      window — draw the full-size game window (local spectating)
+      stream — no window; draw offscreen straight at stream resolution
+    """
+    value = os.environ.get("SUS_RENDER_TARGET", "").strip().lower()
+    return value if value in RENDER_TARGETS else default
+
+
 # ---------------------------------------------------------------------------
 # AutonomousGame
 # ---------------------------------------------------------------------------
@@ -75,6 +99,8 @@ class AutonomousGame:
     MEETING_VOTE_TICKS    = 600     # ticks (10 s) — vote window
     EJECT_TICKS           = 180     # ticks (3 s) — ejection screen
     MAX_GAME_TICKS        = 36000   # ticks (10 min)
+    FEED_FRAME_STRIDE     = 2       # extra camera feeds redraw every Nth frame
+    DIRECTOR_CUT_TICKS    = 480     # ticks (8 s) — director cam idle rotation
     AUTO_MEETING_INTERVAL = 7200    # ticks (2 min) — fallback meeting
     
     # Pre-game trading period
@@ -85,9 +111,37 @@ class AutonomousGame:
         self,
         agent_runtime: AgentRuntime | None = None,
         event_runtime: EventRuntime | None = None,
+        audio_enabled: bool | None = None,
+        render_target: str | None = None,
+        camera_feeds: list[str] | None = None,
     ):
-        self.color_sprites = build_color_sprites()
-        self.game = Game()
+        self.color_sprites: dict = {}   # colour → sprite set (built in setup())
+        # audio_enabled=None defers to SUS_AUDIO; server-side matches pass
+        # False (or set SUS_AUDIO=off) so the mixer is never initialised.
+        self.render_target = render_target or render_target_from_env()
+        if self.render_target not in RENDER_TARGETS:
+            raise ValueError(f"Unknown render target: {self.render_target!r}")
+        headless = self.render_target == "stream"
+        self.game = Game(audio_enabled=audio_enabled, headless=headless)
+
+        # Frame target. Spectator-only deployments draw straight into an
+        # offscreen surface at the largest stream rendition's size, so the
+        # streamer never has to rescale a full-size frame.
+        self.stream_size = capture_size()
+        if headless:
+            self.screen = pg.Surface(self.stream_size).convert()
+        else:
+            self.screen = self.game.screen
+
+        # Camera feeds (built in setup()). feeds[0] is the main feed drawn
+        # to self.screen; extra feeds (None → SUS_CAMERA_FEEDS) each render
+        # into their own stream-resolution surface.
+        self.requested_feeds = camera_feeds
+        self.assets: ScaledAssets | None = None
+        self.feeds: list[CameraFeed] = []
+        self.frames_drawn = 0
+        self.director_colour = None
+        self.director_cut_tick = 0
         self.agent_runtime: AgentRuntime = agent_runtime or LocalAgentRuntime()
         self.event_runtime: EventRuntime = event_runtime or build_event_runtime()
 
@@ -172,6 +226,8 @@ class AutonomousGame:
 
         # Register entities
         bot_list = list(self.game.bots)
+        self.all_colours = ["Red"] + [b.bot_colour for b in bot_list]
+        self.color_sprites = build_color_sprites(self.all_colours)
         self.entities["Red"] = self.game.player
         for bot in bot_list:
             self.entities[bot.bot_colour] = bot
@@ -186,8 +242,6 @@ class AutonomousGame:
             bot.up_img_index = 0
             bot.down_img_index = 0
 
-        self.all_colours = ["Red"] + [b.bot_colour for b in bot_list]
-
         # Pick random imposter
         self.imposter_colour = random.choice(self.all_colours)
 
@@ -199,17 +253,27 @@ class AutonomousGame:
 
         # Camera starts following the imposter
         self.camera_target_idx = self.all_colours.index(self.imposter_colour)
-
-        # Fonts & overlay surface
-        self.hud_font    = pg.font.Font(FONT, 22)
-        self.hud_font_sm = pg.font.Font(FONT, 16)
-        self.hud_font_lg = pg.font.Font(FONT, 42)
-        self.dim_screen  = pg.Surface(self.game.screen.get_size(), pg.SRCALPHA)
-        self.dim_screen.fill((0, 0, 0, 180))
-
-        # Background music
-        pg.mixer.music.play(-1)
-        pg.mixer.music.set_volume(0.5)
+        self.director_colour = self.imposter_colour
+
+        # Camera feeds share one set of scaled map/sprite images
+        self.assets = ScaledAssets(self.game.map_img)
+        self.feeds = [self._make_feed(MAIN_FEED, self.screen)]
+        extra = self.requested_feeds
+        if extra is None:
+            extra = feed_ids_from_env(self.all_colours)
+        for feed_id in extra:
+            surface = pg.Surface(self.stream_size).convert()
+            self.feeds.append(self._make_feed(feed_id, surface))
+
+        # Fonts & overlay surface of the main feed
+        main = self.feeds[0]
+        self.hud_font    = main.font
+        self.hud_font_sm = main.font_sm
+        self.hud_font_lg = main.font_lg
+        self.dim_screen  = main.dim
+
+        # Background music (no-op when audio is disabled)
+        self.game.audio.play_music(-1, volume=0.5)
 
         self.event_runtime.on_game_start(self.all_colours, self.imposter_colour or "")
 
@@ -360,6 +424,7 @@ class AutonomousGame:
         except Exception:
             pass
 
+        self._director_cut(killer_c)
         self._log(f"{killer_c} killed {victim_c}!")
         self.event_runtime.on_kill(killer_c, victim_c)
         return True
@@ -376,6 +441,7 @@ class AutonomousGame:
         self.meeting_timer = 0
         self.meeting_trigger_colour = trigger_colour
         self.votes = {}
+        self._director_cut(trigger_colour)
         
         # Initialize dialogue state (FR-4: shuffled order)
         self.dialogue_order = self.alive_colours()
@@ -541,213 +607,251 @@ class AutonomousGame:
     # Drawing
     # ------------------------------------------------------------------
 
-    def _camera_target(self):
-        idx = self.camera_target_idx % len(self.all_colours)
-        return self.entities[self.all_colours[idx]]
+    def _make_feed(self, feed_id, surface):
+        w, h = surface.get_size()
+        # One uniform factor for the world and the HUD (no aspect stretch)
+        scale = min(w / WIDTH, h / HEIGHT)
+        # game.camera is sized to the window; any other surface (e.g. the
+        # 1280x720 "high" capture) needs a viewport of its own size
+        if feed_id == MAIN_FEED and (w, h) == (WIDTH, HEIGHT):
+            camera = self.game.camera
+        else:
+            camera = ViewportCamera(self.game.map.width, self.game.map.height, w, h, scale)
+        return CameraFeed(feed_id, surface, camera, scale, FONT)
+
+    def _director_cut(self, colour):
+        """Point the director feed at where something just happened."""
+        self.director_colour = colour
+        self.director_cut_tick = self.tick
+
+    def _feed_target(self, feed):
+        """Colour of the agent a feed is following."""
+        if feed.feed_id == "imposter":
+            return self.imposter_colour
+        if feed.feed_id == "director":
+            if self.tick - self.director_cut_tick >= self.DIRECTOR_CUT_TICKS:
+                alive = self.alive_colours()
+                if alive:
+                    self._director_cut(random.choice(alive))
+            return self.director_colour
+        for c in self.all_colours:
+            if feed.feed_id == "pov-" + c.lower():
+                return c
+        return self.all_colours[self.camera_target_idx % len(self.all_colours)]
 
     def _draw(self):
-        assert self.hud_font_sm  # Initialized in setup()
-        screen = self.game.screen
-        cam = self.game.camera
+        for feed in self.feeds:
+            if feed.feed_id != MAIN_FEED and self.frames_drawn % self.FEED_FRAME_STRIDE:
+                continue
+            on_screen = feed.feed_id == MAIN_FEED and self.render_target == "window"
+            if not on_screen and not self.event_runtime.stream_wanted(feed.feed_id):
+                continue    # no frame due for this feed (nobody watching, or rate-limited)
+            self._draw_feed(feed)
+            # Stream this frame to the bridge server (spectator video)
+            self.event_runtime.stream_frame(feed.surface, feed.feed_id)
+        self.frames_drawn += 1
+
+        if self.render_target == "window":
+            pg.display.flip()
+
+    def _draw_feed(self, feed):
+        assert self.assets  # Initialized in setup()
+        screen, cam, scale = feed.surface, feed.camera, feed.scale
+        target_c = self._feed_target(feed)
 
         # Camera follows selected entity
-        cam.update(self._camera_target())
+        cam.update(self.entities[target_c])
 
         # Map
-        screen.blit(self.game.map_img, cam.apply_rect(self.game.map_rect))
+        screen.blit(self.assets.map_image(scale), cam.apply_rect(self.game.map_rect))
 
         # Sprites
         for sprite in self.game.all_sprites:
-            screen.blit(sprite.image, cam.apply(sprite))
+            screen.blit(self.assets.image(sprite.image, scale), cam.apply(sprite))
 
         # Name tags above each alive agent
         for c in self.all_colours:
             ent = self.entities[c]
             if not ent.alive_status:
                 continue
-            tag = self.hud_font_sm.render(c, True, COLOR_MAP.get(c, WHITE))
-            tag_rect = tag.get_rect(centerx=cam.apply(ent).centerx, bottom=cam.apply(ent).top - 2)
+            tag = feed.font_sm.render(c, True, hud_colour(c))
+            ent_rect = cam.apply(ent)
+            tag_rect = tag.get_rect(centerx=ent_rect.centerx, bottom=ent_rect.top - 2)
             screen.blit(tag, tag_rect)
 
         # HUD overlay
-        self._draw_hud(screen)
+        self._draw_hud(feed, target_c)
 
         # Meeting overlay
         if self.meeting_active:
-            self._draw_meeting(screen)
+            self._draw_meeting(feed)
 
         # Eject overlay
         if self.eject_active:
-            self._draw_eject(screen)
+            self._draw_eject(feed)
 
         # Game-over overlay
         if self.game_over:
-            self._draw_game_over(screen)
-
-        # Stream this frame to the bridge server (spectator video)
-        self.event_runtime.stream_frame(screen)
-
-        pg.display.flip()
+            self._draw_game_over(feed)
 
     # ---- HUD ----
 
-    def _draw_hud(self, screen):
-        assert self.hud_font and self.hud_font_sm and self.hud_font_lg  # Initialized in setup()
+    def _draw_hud(self, feed, target_c):
+        screen, w, h, px = feed.surface, feed.width, feed.height, feed.px
         alive = self.alive_colours()
 
         # Status panel (top-left)
-        panel = pg.Surface((360, 125), pg.SRCALPHA)
+        panel = pg.Surface((px(360), px(125)), pg.SRCALPHA)
         panel.fill((0, 0, 0, 160))
-        screen.blit(panel, (10, 10))
+        screen.blit(panel, (px(10), px(10)))
 
-        screen.blit(self.hud_font.render("AUTONOMOUS AGENT MODE", True, (255, 200, 50)), (20, 15))
+        screen.blit(feed.font.render("AUTONOMOUS AGENT MODE", True, (255, 200, 50)), (px(20), px(15)))
 
-        screen.blit(self.hud_font_sm.render(
-            f"Alive: {len(alive)}/{len(self.all_colours)}", True, WHITE), (20, 45))
+        screen.blit(feed.font_sm.render(
+            f"Alive: {len(alive)}/{len(self.all_colours)}", True, WHITE), (px(20), px(45)))
 
         secs = self.tick // 60
-        screen.blit(self.hud_font_sm.render(
-            f"Time: {secs // 60}:{secs % 60:02d}", True, WHITE), (200, 45))
+        screen.blit(feed.font_sm.render(
+            f"Time: {secs // 60}:{secs % 60:02d}", True, WHITE), (px(200), px(45)))
 
-        target_c = self.all_colours[self.camera_target_idx % len(self.all_colours)]
         role = self.agent_runtime.role_for(target_c)
         clr = (255, 80, 80) if role == "IMPOSTER" else (100, 255, 100)
-        screen.blit(self.hud_font_sm.render(
-            f"Following: {target_c} ({role})", True, clr), (20, 70))
+        screen.blit(feed.font_sm.render(
+            f"Following: {target_c} ({role})", True, clr), (px(20), px(70)))
 
         if role == "IMPOSTER" and self.kill_cooldown > 0:
-            screen.blit(self.hud_font_sm.render(
-                f"Kill CD: {self.kill_cooldown // 60}s", True, (255, 100, 100)), (20, 93))
+            screen.blit(feed.font_sm.render(
+                f"Kill CD: {self.kill_cooldown // 60}s", True, (255, 100, 100)), (px(20), px(93)))
 
-        screen.blit(self.hud_font_sm.render(
-            "TAB=cycle camera  ESC=quit", True, (150, 150, 150)), (20, 110))
+        hint = "TAB=cycle camera  ESC=quit" if feed.feed_id == MAIN_FEED else f"Feed: {feed.feed_id}"
+        screen.blit(feed.font_sm.render(hint, True, (150, 150, 150)), (px(20), px(110)))
 
         # Agent roster (top-right)
-        roster = pg.Surface((170, 22 * len(self.all_colours) + 10), pg.SRCALPHA)
+        roster = pg.Surface((px(170), px(22 * len(self.all_colours) + 10)), pg.SRCALPHA)
         roster.fill((0, 0, 0, 140))
-        screen.blit(roster, (WIDTH - 180, 10))
+        screen.blit(roster, (w - px(180), px(10)))
         for i, c in enumerate(self.all_colours):
             is_alive = self.entities[c].alive_status
-            tc = COLOR_MAP.get(c, WHITE) if is_alive else (80, 80, 80)
+            tc = hud_colour(c) if is_alive else (80, 80, 80)
             label = c + ("" if is_alive else " [DEAD]")
             if c == self.imposter_colour:
                 label += " *"   # spectator hint
-            screen.blit(self.hud_font_sm.render(label, True, tc), (WIDTH - 175, 15 + i * 22))
+            screen.blit(feed.font_sm.render(label, True, tc), (w - px(175), px(15 + i * 22)))
 
         # Event log (bottom)
         if self.event_log:
-            log_h = 20 * min(len(self.event_log), 6) + 10
-            log_bg = pg.Surface((550, log_h), pg.SRCALPHA)
+            log_h = px(20 * min(len(self.event_log), 6) + 10)
+            log_bg = pg.Surface((px(550), log_h), pg.SRCALPHA)
             log_bg.fill((0, 0, 0, 140))
-            y0 = HEIGHT - log_h - 10
-            screen.blit(log_bg, (10, y0))
+            y0 = h - log_h - px(10)
+            screen.blit(log_bg, (px(10), y0))
             for i, msg in enumerate(self.event_log[-6:]):
-                screen.blit(self.hud_font_sm.render(msg, True, (220, 220, 220)), (15, y0 + 5 + i * 20))
+                screen.blit(feed.font_sm.render(msg, True, (220, 220, 220)), (px(15), y0 + px(5 + i * 20)))
 
     # ---- Meeting ----
 
-    def _draw_meeting(self, screen):
-        assert self.hud_font and self.hud_font_sm and self.hud_font_lg and self.dim_screen
-        screen.blit(self.dim_screen, (0, 0))
+    def _draw_meeting(self, feed):
+        screen, w, h, px = feed.surface, feed.width, feed.height, feed.px
+        screen.blit(feed.dim, (0, 0))
 
         if self.meeting_phase == 0:
             # Alert splash
-            t1 = self.hud_font_lg.render("EMERGENCY MEETING!", True, (255, 50, 50))
-            screen.blit(t1, t1.get_rect(center=(WIDTH // 2, HEIGHT // 3)))
-            t2 = self.hud_font.render(f"Called by {self.meeting_trigger_colour}", True, WHITE)
-            screen.blit(t2, t2.get_rect(center=(WIDTH // 2, HEIGHT // 3 + 55)))
+            t1 = feed.font_lg.render("EMERGENCY MEETING!", True, (255, 50, 50))
+            screen.blit(t1, t1.get_rect(center=(w // 2, h // 3)))
+            t2 = feed.font.render(f"Called by {self.meeting_trigger_colour}", True, WHITE)
+            screen.blit(t2, t2.get_rect(center=(w // 2, h // 3 + px(55))))
         
         elif self.meeting_phase == 1:
             # Dialogue phase (FR-5: Dialogue Display)
-            t1 = self.hud_font_lg.render("DISCUSSION", True, (100, 200, 255))
-            screen.blit(t1, t1.get_rect(center=(WIDTH // 2, 45)))
+            t1 = feed.font_lg.render("DISCUSSION", True, (100, 200, 255))
+            screen.blit(t1, t1.get_rect(center=(w // 2, px(45))))
             
             remaining = max(0, (self.MEETING_DIALOGUE_TICKS - self.meeting_timer) // 60)
-            t2 = self.hud_font.render(f"Time: {remaining}s", True, (255, 200, 50))
-            screen.blit(t2, t2.get_rect(center=(WIDTH // 2, 85)))
+            t2 = feed.font.render(f"Time: {remaining}s", True, (255, 200, 50))
+            screen.blit(t2, t2.get_rect(center=(w // 2, px(85))))
             
             # Show dialogue messages (scrolling chat log)
-            y = 120
+            y = px(120)
             max_display = 8  # Show last N messages
             messages_to_show = self.dialogue_messages[-max_display:]
             for agent_c, msg in messages_to_show:
-                clr = COLOR_MAP.get(agent_c, WHITE)
+                clr = hud_colour(agent_c)
                 # Agent name
-                name_surf = self.hud_font.render(f"[{agent_c}]:", True, clr)
-                screen.blit(name_surf, (60, y))
+                name_surf = feed.font.render(f"[{agent_c}]:", True, clr)
+                screen.blit(name_surf, (px(60), y))
                 # Message text (truncate if too long)
                 display_msg = msg if len(msg) < 45 else msg[:42] + "..."
-                msg_surf = self.hud_font_sm.render(display_msg, True, (220, 220, 220))
-                screen.blit(msg_surf, (180, y + 4))
-                y += 32
+                msg_surf = feed.font_sm.render(display_msg, True, (220, 220, 220))
+                screen.blit(msg_surf, (px(180), y + px(4)))
+                y += px(32)
             
             # Show who hasn't spoken yet
             not_spoken = [c for c in self.alive_colours() if c not in self.spoken_agents]
             if not_spoken:
                 waiting_text = f"Waiting: {', '.join(not_spoken[:4])}{'...' if len(not_spoken) > 4 else ''}"
-                wait_surf = self.hud_font_sm.render(waiting_text, True, (150, 150, 150))
-                screen.blit(wait_surf, (60, HEIGHT - 80))
+                wait_surf = feed.font_sm.render(waiting_text, True, (150, 150, 150))
+                screen.blit(wait_surf, (px(60), h - px(80)))
         
         elif self.meeting_phase == 2:
             # Vote screen
-            t1 = self.hud_font_lg.render("VOTING", True, WHITE)
-            screen.blit(t1, t1.get_rect(center=(WIDTH // 2, 55)))
+            t1 = feed.font_lg.render("VOTING", True, WHITE)
+            screen.blit(t1, t1.get_rect(center=(w // 2, px(55))))
             remaining = max(0, (self.MEETING_VOTE_TICKS - self.meeting_timer) // 60)
-            t2 = self.hud_font.render(f"Time: {remaining}s", True, (255, 200, 50))
-            screen.blit(t2, t2.get_rect(center=(WIDTH // 2, 95)))
+            t2 = feed.font.render(f"Time: {remaining}s", True, (255, 200, 50))
+            screen.blit(t2, t2.get_rect(center=(w // 2, px(95))))
 
             alive = self.alive_colours()
-            y = 135
+            y = px(135)
             for c in alive:
-                clr = COLOR_MAP.get(c, WHITE)
-                screen.blit(self.hud_font.render(c, True, clr), (WIDTH // 4, y))
+                clr = hud_colour(c)
+                screen.blit(feed.font.render(c, True, clr), (w // 4, y))
                 if c in self.votes:
                     v = self.votes[c]
                     vs = f"-> {v}" if v else "-> SKIP"
-                    screen.blit(self.hud_font_sm.render(vs, True, (180, 180, 180)), (WIDTH // 2, y + 4))
+                    screen.blit(feed.font_sm.render(vs, True, (180, 180, 180)), (w // 2, y + px(4)))
                 else:
-                    screen.blit(self.hud_font_sm.render("thinking...", True, (120, 120, 120)), (WIDTH // 2, y + 4))
+                    screen.blit(feed.font_sm.render("thinking...", True, (120, 120, 120)), (w // 2, y + px(4)))
                 vr = sum(1 for v in self.votes.values() if v == c)
                 if vr:
-                    screen.blit(self.hud_font_sm.render(f"({vr})", True, (255, 100, 100)), (WIDTH * 3 // 4, y + 4))
-                y += 40
+                    screen.blit(feed.font_sm.render(f"({vr})", True, (255, 100, 100)), (w * 3 // 4, y + px(4)))
+                y += px(40)
 
     # ---- Eject ----
 
-    def _draw_eject(self, screen):
-        assert self.hud_font and self.hud_font_lg and self.dim_screen
-        screen.blit(self.dim_screen, (0, 0))
+    def _draw_eject(self, feed):
+        screen, w, h, px = feed.surface, feed.width, feed.height, feed.px
+        screen.blit(feed.dim, (0, 0))
         imp = self.agent_runtime.role_for(self.ejected_colour) == "IMPOSTER"
-        t1 = self.hud_font_lg.render(f"{self.ejected_colour} was ejected.", True, WHITE)
-        screen.blit(t1, t1.get_rect(center=(WIDTH // 2, HEIGHT // 3)))
-        t2 = self.hud_font.render(
+        t1 = feed.font_lg.render(f"{self.ejected_colour} was ejected.", True, WHITE)
+        screen.blit(t1, t1.get_rect(center=(w // 2, h // 3)))
+        t2 = feed.font.render(
             "They were the Imposter!" if imp else "They were NOT the Imposter.",
             True, (255, 80, 80) if imp else (100, 255, 100),
         )
-        screen.blit(t2, t2.get_rect(center=(WIDTH // 2, HEIGHT // 3 + 55)))
+        screen.blit(t2, t2.get_rect(center=(w // 2, h // 3 + px(55))))
 
     # ---- Game Over ----
 
-    def _draw_game_over(self, screen):
-        assert self.hud_font and self.hud_font_sm and self.hud_font_lg and self.dim_screen
-        screen.blit(self.dim_screen, (0, 0))
+    def _draw_game_over(self, feed):
+        screen, w, h, px = feed.surface, feed.width, feed.height, feed.px
+        screen.blit(feed.dim, (0, 0))
         if self.winner == "CREW":
-            t1 = self.hud_font_lg.render("CREW WINS!", True, (60, 200, 255))
+            t1 = feed.font_lg.render("CREW WINS!", True, (60, 200, 255))
         else:
-            t1 = self.hud_font_lg.render("IMPOSTER WINS!", True, (255, 50, 50))
-        screen.blit(t1, t1.get_rect(center=(WIDTH // 2, HEIGHT // 3)))
+            t1 = feed.font_lg.render("IMPOSTER WINS!", True, (255, 50, 50))
+        screen.blit(t1, t1.get_rect(center=(w // 2, h // 3)))
 
-        t2 = self.hud_font.render(f"Imposter was: {self.imposter_colour}", True, (255, 100, 100))
-        screen.blit(t2, t2.get_rect(center=(WIDTH // 2, HEIGHT // 3 + 55)))
+        t2 = feed.font.render(f"Imposter was: {self.imposter_colour}", True, (255, 100, 100))
+        screen.blit(t2, t2.get_rect(center=(w // 2, h // 3 + px(55))))
 
         deaths = len(self.all_colours) - len(self.alive_colours())
         secs = self.tick // 60
-        t3 = self.hud_font_sm.render(
+        t3 = feed.font_sm.render(
             f"Duration: {secs // 60}m {secs % 60:02d}s  |  Deaths: {deaths}", True, (180, 180, 180))
-        screen.blit(t3, t3.get_rect(center=(WIDTH // 2, HEIGHT // 3 + 95)))
+        screen.blit(t3, t3.get_rect(center=(w // 2, h // 3 + px(95))))
 
-        t4 = self.hud_font_sm.render("SPACE = new match  |  ESC = quit", True, (150, 150, 150))
-        screen.blit(t4, t4.get_rect(center=(WIDTH // 2, HEIGHT // 3 + 130)))
+        t4 = feed.font_sm.render("SPACE = new match  |  ESC = quit", True, (150, 150, 150))
+        screen.blit(t4, t4.get_rect(center=(w // 2, h // 3 + px(130))))
 
     # ------------------------------------------------------------------
     # Main loop
@@ -771,6 +875,8 @@ class AutonomousGame:
         while True:
             dt = clock.tick(FPS) / 1000.0
             self.game.dt = dt
+            # Stamped on events and stream frames so the two can be lined up
+            self.event_runtime.set_tick(self.tick)
 
             self._handle_events()
             
@@ -791,7 +897,7 @@ class AutonomousGame:
             # ---- GAME OVER: wait for restart ----
             if self.game_over:
                 if not victory_played:
-                    pg.mixer.music.stop()
+                    self.game.audio.stop_music()
                     try:
                         snd = "victory_crew" if self.winner == "CREW" else "victory_imposter"
                         self.game.effect_sounds[snd].play()
@@ -802,8 +908,8 @@ class AutonomousGame:
                 keys = pg.key.get_pressed()
                 if keys[pg.K_SPACE]:
                     try:
-                        self.game.effect_sounds.get("victory_crew", pg.mixer.Sound(buffer=b'')).stop()
-                        self.game.effect_sounds.get("victory_imposter", pg.mixer.Sound(buffer=b'')).stop()
+                        self.game.effect_sounds["victory_crew"].stop()
+                        self.game.effect_sounds["victory_imposter"].stop()
                     except Exception:
                         pass
                     self.event_runtime.close()
@@ -940,7 +1046,8 @@ class AutonomousGame:
 
     def _draw_pre_game_screen(self):
         """Display countdown and trading info during pre-game period."""
-        screen = self.game.screen
+        main = self.feeds[0]
+        screen, w, h, px = main.surface, main.width, main.height, main.px
         screen.fill((20, 20, 40))  # Dark blue background
         
         # Calculate remaining time
@@ -951,23 +1058,23 @@ class AutonomousGame:
         
         # Title
         title = self.hud_font_lg.render("PRE-GAME TRADING", True, (100, 200, 255))
-        title_rect = title.get_rect(center=(WIDTH // 2, HEIGHT // 4))
+        title_rect = title.get_rect(center=(w // 2, h // 4))
         screen.blit(title, title_rect)
         
         # Countdown timer
         timer_color = (255, 200, 50) if remaining_seconds > 60 else (255, 100, 100)
         timer_text = self.hud_font_lg.render(f"{minutes}:{seconds:02d}", True, timer_color)
-        timer_rect = timer_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+        timer_rect = timer_text.get_rect(center=(w // 2, h // 2))
         screen.blit(timer_text, timer_rect)
         
         # Agent list — shown right below the countdown timer
         agents_title = self.hud_font_sm.render("Agents in this game:", True, (150, 150, 150))
-        agents_rect = agents_title.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 80))
+        agents_rect = agents_title.get_rect(center=(w // 2, h // 2 + px(80)))
         screen.blit(agents_title, agents_rect)
 
         agent_text = ", ".join(self.all_colours)
         agents_display = self.hud_font_sm.render(agent_text, True, (200, 200, 200))
-        agents_display_rect = agents_display.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 110))
+        agents_display_rect = agents_display.get_rect(center=(w // 2, h // 2 + px(110)))
         screen.blit(agents_display, agents_display_rect)
 
         # Info text block — well below the agent list
@@ -977,11 +1084,12 @@ class AutonomousGame:
             ("Winners' token holders split 90% of prize pool.",   (100, 220, 100)),
         ]
 
-        y_offset = HEIGHT // 2 + 165
+        y_offset = h // 2 + px(165)
         for line, color in info_lines:
             info = self.hud_font.render(line, True, color)
-            info_rect = info.get_rect(center=(WIDTH // 2, y_offset))
+            info_rect = info.get_rect(center=(w // 2, y_offset))
             screen.blit(info, info_rect)
-            y_offset += 40
+            y_offset += px(40)
 
-        pg.display.flip()
+        if self.render_target == "window":
+            pg.display.flip()
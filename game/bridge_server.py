@@ -3,29 +3,88 @@ Bridge Server — Real-time game event relay.
 
 Architecture:
   Game engine → POST /game/ingest/{game_id}  (HTTP, fire-and-forget)
-  Browser     ← WS  /ws/game/{game_id}       (per-game subscription)
+  Game engine → POST /game/ingest/{game_id}/batch  (many stamped events, one per line)
+  Browser     ← WS  /ws/game/{game_id}       (per-game subscription, ?since=<seq>)
+  Browser     ← GET /game/{game_id}/state    (current state, see game_snapshot)
+  Browser     ← GET /game/{game_id}/events   (stored history, see event_store)
+  Browser     ← WS  /ws/topics               (game, markets, lobby and video over one socket)
   Browser     ← WS  /ws                      (legacy single-channel)
+  Game engine → WS  /ws/stream/{game_id}[/{feed}]  (keyframes + tile deltas)
+  Browser     ← WS  /ws/video/{game_id}[/{feed}]   (camera feed video,
+                                                     ?rendition=high|medium|low|auto,
+                                                     REPLAY requests for instant replays)
+  Browser     ← GET /vod/{game_id}/{feed}/...      (recorded video, see stream_recorder)
 
 Run:
   cd game
   python bridge_server.py
+
+With SUS_BRIDGE_WORKERS > 1 this runs that many uvicorn workers and a
+pub/sub broker that relays game events between them (see pubsub.py). The
+worker a feed streams to relays its video to the others (see _receive), so
+it can be watched, replayed and thumbnailed on any of them; only that
+worker records it, and only the worker a game was started on runs it.
 """
 
 import asyncio
+import itertools
 import json
+import math
+import os
+import struct
 import subprocess
 import sys
+import tempfile
 import time
 import uuid
-from collections import defaultdict
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 
-app = FastAPI(title="MonadSus Bridge Server")
+from event_store import EventStore, StoredEvent, event_store_path_from_env
+from game_snapshot import SNAPSHOT_EVENTS, GameSnapshot
+from pubsub import MemoryPubSub, Published, PubSubUnavailable, Relayed, pubsub_from_env
+from stream_format import (
+    DEFAULT_RENDITION,
+    RENDITIONS,
+    FrameHeader,
+    is_keyframe,
+    merge_deltas,
+    unpack_frame,
+    topic_tag,
+    unpack_rendition,
+)
+from stream_recorder import (
+    StreamRecorder,
+    read_clip,
+    recording_dir_from_env,
+    recording_rendition_from_env,
+    recording_summary,
+    segment_lengths,
+    segment_name,
+    valid_name,
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _open_event_store()     # before any seq is handed out, see _latest_seq
+    await pubsub.start(_deliver, _receive)
+    evictor = asyncio.create_task(_evict_periodically())
+    yield
+    evictor.cancel()
+    await pubsub.stop()
+    if event_store is not None:
+        event_store.close()
+
+
+app = FastAPI(title="MonadSus Bridge Server", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -41,14 +100,119 @@ app.add_middleware(
 # game_id → game metadata dict
 active_games: Dict[str, dict] = {}
 
-# game_id → Set[WebSocket] — per-game subscribers
-game_subscribers: Dict[str, Set[WebSocket]] = defaultdict(set)
+class EventSubscriber:
+    """
+    One /ws/game or /ws connection: the events waiting to be sent to it,
+    drained by its own writer task (run()).
+
+    broadcast() only queues the already serialized event, so ingest never
+    waits on a browser. Slow consumers: a FRAME event replaces a FRAME that
+    is still waiting (only the newest picture matters); when MAX_PENDING
+    other events are waiting the connection is closed with 1013 ("try again
+    later") and the client catches up with ?since=<seq> on reconnect (on
+    /ws/topics only that topic is dropped, see TopicSocket).
+    """
+
+    MAX_PENDING = 256
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.sent = 0
+        self.coalesced = 0          # FRAME events replaced before they were sent
+        self.overflowed = False
+        self._pending: Deque[str] = deque()
+        self._frame: Optional[str] = None
+        self._ready = asyncio.Event()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending) + (self._frame is not None)
+
+    def push(self, data: str, frame: bool = False):
+        if self.overflowed:
+            return
+        if frame:
+            self.coalesced += self._frame is not None
+            self._frame = data
+        elif len(self._pending) >= self.MAX_PENDING:
+            self.overflowed = True
+            fanout_stats["slow_disconnects"] += 1
+        else:
+            self._pending.append(data)
+        self._ready.set()
+
+    async def run(self):
+        """Writer task: send what is queued, oldest first, the newest FRAME last."""
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                if self.overflowed:
+                    await self.websocket.close(code=1013)
+                    return
+                while self._pending:
+                    await self.websocket.send_text(self._pending.popleft())
+                    self.sent += 1
+                if self._frame is not None:
+                    frame, self._frame = self._frame, None
+                    await self.websocket.send_text(frame)
+                    self.sent += 1
+        except Exception:
+            pass    # the socket is gone; its handler notices and cleans up
+
+
+# game_id → WebSocket → EventSubscriber — per-game subscribers
+game_subscribers: Dict[str, Dict[WebSocket, EventSubscriber]] = defaultdict(dict)
 
 # legacy single-channel subscribers (/ws)
-legacy_subscribers: Set[WebSocket] = set()
+legacy_subscribers: Dict[WebSocket, EventSubscriber] = {}
+
+# event fan-out totals since start
+fanout_stats: Dict[str, int] = {"events": 0, "slow_disconnects": 0}
+
+class HistoryEvent(NamedTuple):
+    seq: int
+    type: str
+    timestamp: float
+    data: str           # the event as sent to subscribers, "seq" included
+
+
+HISTORY_LIMIT = 500
+
+# game_id → ring of recent events (replay for late joiners)
+event_history: Dict[str, Deque[HistoryEvent]] = defaultdict(lambda: deque(maxlen=HISTORY_LIMIT))
+
+# game_id → seq of the last event ingested (FRAME events are not numbered)
+event_seq: Dict[str, int] = defaultdict(int)
 
-# game_id → list of recent events (replay for late joiners)
-event_history: Dict[str, List[dict]] = defaultdict(list)
+# game_id → current state, sent to clients joining mid-game
+game_snapshots: Dict[str, GameSnapshot] = {}
+
+# game_id → (task rebuilding its snapshot from the event store,
+#            state events delivered while it runs)
+snapshot_restores: Dict[str, Tuple[asyncio.Task, List[Tuple[str, dict]]]] = {}
+
+# how ingested events reach every bridge worker (SUS_PUBSUB, see pubsub.py)
+pubsub = pubsub_from_env()
+
+# every event, on disk (None when SUS_EVENT_STORE is off); see _open_event_store()
+EVENT_STORE_PATH: Optional[Path] = event_store_path_from_env()
+event_store: Optional[EventStore] = None
+
+# game_id → when it last ingested an event or had a feed (dis)connect
+last_activity: Dict[str, float] = {}
+
+# game_id → {GameEmitter id → last emit_seq ingested}, to drop redelivered events
+ingest_marks: Dict[str, Dict[str, int]] = {}
+
+# games whose ingest_marks have been read back from the event store
+marks_loaded: Set[str] = set()
+
+# game_id → events its emitter still had queued or spooled at its last batch
+emitter_backlog: Dict[str, int] = {}
+
+# batch ingest totals since start
+ingest_stats: Dict[str, int] = {"events": 0, "duplicates": 0}
 
 # game_id → subprocess.Popen
 game_processes: Dict[str, object] = {}
@@ -58,25 +222,38 @@ game_processes: Dict[str, object] = {}
 # Fan-out helper
 # ---------------------------------------------------------------------------
 
-async def broadcast(game_id: str, event: dict):
-    """Send an event to all WS subscribers of this game AND the legacy channel."""
-    data = json.dumps(event)
+def _open_event_store() -> Optional[EventStore]:
+    """The event store, opened at startup (None when SUS_EVENT_STORE is off)."""
+    global event_store
+    if event_store is None and EVENT_STORE_PATH is not None:
+        event_store = EventStore(EVENT_STORE_PATH)
+        print(f"[EVENTS] Storing events in {EVENT_STORE_PATH}")
+    return event_store
 
-    dead: Set[WebSocket] = set()
-    for ws in list(game_subscribers.get(game_id, set())):
-        try:
-            await ws.send_text(data)
-        except Exception:
-            dead.add(ws)
-    game_subscribers[game_id] -= dead
 
-    dead_legacy: Set[WebSocket] = set()
-    for ws in list(legacy_subscribers):
-        try:
-            await ws.send_text(data)
-        except Exception:
-            dead_legacy.add(ws)
-    legacy_subscribers.difference_update(dead_legacy)
+def _latest_seq(game_id: str) -> int:
+    """Seq of the game's last event, also for a game only the store remembers."""
+    store = _open_event_store()
+    if game_id in event_seq or store is None:
+        return event_seq.get(game_id, 0)
+    return store.last_seq(game_id)
+
+
+def broadcast(game_id: str, event: dict):
+    """
+    Queue an event for all WS subscribers of this game AND the legacy
+    channel. Serialized once; returns without waiting for any of them.
+    """
+    broadcast_raw(game_id, json.dumps(event), event.get("type") == "FRAME")
+
+
+def broadcast_raw(game_id: str, data: str, frame: bool = False):
+    """broadcast() for an event that is already serialized."""
+    fanout_stats["events"] += 1
+    for subscriber in game_subscribers.get(game_id, {}).values():
+        subscriber.push(data, frame)
+    for subscriber in legacy_subscribers.values():
+        subscriber.push(data, frame)
 
 
 # ---------------------------------------------------------------------------
@@ -85,7 +262,11 @@ async def broadcast(game_id: str, event: dict):
 
 @app.get("/games")
 def list_games():
-    return list(active_games.values())
+    games = []
+    for game_id, game in list(active_games.items()):
+        thumbnail = _thumbnail_url(game_id)
+        games.append({**game, "thumbnail": thumbnail} if thumbnail else game)
+    return games
 
 
 @app.get("/game/{game_id}")
@@ -95,6 +276,79 @@ def get_game(game_id: str):
     return active_games[game_id]
 
 
+@app.get("/game/{game_id}/state")
+async def get_game_state(game_id: str):
+    """The STATE_SNAPSHOT a client joining /ws/game now would get first."""
+    await _restored(game_id)
+    snapshot = game_snapshots.get(game_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return Response(content=snapshot.message(event_seq[game_id]), media_type="application/json")
+
+
+# ---------------------------------------------------------------------------
+# REST — Stored event history (see event_store.py)
+# ---------------------------------------------------------------------------
+
+EXPORT_PAGE = 1000
+
+
+def _require_event_store() -> EventStore:
+    store = _open_event_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="Event store is off (SUS_EVENT_STORE)")
+    return store
+
+
+@app.get("/events/games")
+def stored_games():
+    """Every game in the event store, most recent first."""
+    return _require_event_store().games()
+
+
+@app.get("/game/{game_id}/events")
+def game_events(game_id: str, after: int = 0, limit: int = Query(100, ge=1, le=1000),
+                types: List[str] = Query([], alias="type")):
+    """
+    A page of a game's stored events: seq > `after`, oldest first, of the
+    given ?type= (repeatable) if any. `next_after` continues from the page.
+    """
+    events = _require_event_store().query(game_id, after, limit, types)
+    next_after = events[-1].seq if len(events) == limit else None
+    # The stored events are already JSON, pasted in as they are
+    body = (f'{{"game_id":{json.dumps(game_id)},"events":[{",".join(e.data for e in events)}],'
+            f'"next_after":{json.dumps(next_after)}}}')
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/game/{game_id}/events/export")
+def export_game_events(game_id: str, types: List[str] = Query([], alias="type")):
+    """All of a game's stored events as NDJSON, one per line, oldest first."""
+    store = _require_event_store()
+
+    def lines():
+        after = 0
+        while True:
+            events = store.query(game_id, after, EXPORT_PAGE, types)
+            if events:
+                yield "".join(event.data + "\n" for event in events)
+            if len(events) < EXPORT_PAGE:
+                return
+            after = events[-1].seq
+
+    disposition = f'attachment; filename="{game_id}-events.ndjson"'
+    return StreamingResponse(lines(), media_type="application/x-ndjson",
+                             headers={"Content-Disposition": disposition})
+
+
+def _list_starting_game(game_id: str, game: dict):
+    """Put a game just launched here in the lobby, on every worker."""
+    active_games[game_id] = game
+    last_activity[game_id] = time.time()
+    pubsub.relay("GAME_STARTING", game_id, "", json.dumps(game).encode())
+    _lobby_changed()
+
+
 @app.post("/game/start")
 async def start_game():
     """Spawn a new autonomous game subprocess tagged as game-001 by default."""
@@ -103,7 +357,11 @@ async def start_game():
 
     try:
         import os
-        env = {**os.environ, "BRIDGE_GAME_ID": game_id}
+        # Spectators only see the streamed video — skip audio and the
+        # window, and render straight at stream resolution
+        env = {**os.environ, "BRIDGE_GAME_ID": game_id, "SUS_AUDIO": "off",
+               "SUS_RENDER_TARGET": "stream"}
+        env.setdefault("SUS_CAMERA_FEEDS", "imposter,director")
         proc = subprocess.Popen(
             [sys.executable, "main_autonomous.py"],
             cwd=str(game_dir),
@@ -113,7 +371,7 @@ async def start_game():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    active_games[game_id] = {
+    _list_starting_game(game_id, {
         "id": game_id,
         "title": "Live Game — Skeld Station",
         "status": "starting",
@@ -126,7 +384,7 @@ async def start_game():
         "startTime": "Just started",
         "tags": ["New", "Live"],
         "started_at": time.time(),
-    }
+    })
 
     return {"game_id": game_id, "status": "starting"}
 
@@ -149,7 +407,7 @@ async def start_chess_game():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-    active_games[game_id] = {
+    _list_starting_game(game_id, {
         "id": game_id,
         "title": "Live Chess — Autonomous Agents",
         "status": "starting",
@@ -162,7 +420,7 @@ async def start_chess_game():
         "startTime": "Just started",
         "tags": ["New", "Live", "Chess"],
         "started_at": time.time(),
-    }
+    })
 
     return {"game_id": game_id, "status": "starting"}
 
@@ -171,33 +429,304 @@ async def start_chess_game():
 # REST — Event ingestion endpoint (game engine → bridge)
 # ---------------------------------------------------------------------------
 
+# Events that change active_games or the snapshot, so the bridge has to read them
+STATE_EVENTS = SNAPSHOT_EVENTS
+
+
+def _stamped_event(request: Request) -> Optional[Tuple[str, float]]:
+    """(type, timestamp) from the X-Event-* headers of a stamped event, if present."""
+    etype = request.headers.get("x-event-type")
+    try:
+        timestamp = float(request.headers.get("x-event-timestamp", ""))
+    except ValueError:
+        return None
+    return (etype, timestamp) if etype else None
+
+
+def _stamped_line(line: bytes) -> Optional[Tuple[str, float, Tuple[str, int], str]]:
+    """(type, timestamp, (emitter, emit_seq), data) of a stamped batch line, if it is one."""
+    if line.startswith(b"{"):
+        return None
+    try:
+        etype, timestamp, emitter, emit_seq, data = line.decode().split(" ", 4)
+        stamped = (etype, float(timestamp), (emitter, int(emit_seq)), data)
+    except ValueError:
+        return None
+    return stamped if data.startswith("{") else None
+
+
+def _with_seq(data: str, seq: int) -> str:
+    """Put "seq" first in a serialized JSON object, without re-encoding the rest."""
+    rest = data.lstrip()[1:].lstrip()
+    return f'{{"seq":{seq}' + ("" if rest.startswith("}") else ",") + rest
+
+
 @app.post("/game/ingest/{game_id}")
 async def ingest_event(game_id: str, request: Request):
     """
-    The game engine POSTs every event here.
-    The bridge stores it and fans out to all live WebSocket subscribers.
+    Senders POST one event at a time here (GameEmitter batches them and
+    stamps each line instead, see ingest_batch). It is published to every
+    bridge worker (_deliver), which store it and fan out to their live
+    WebSocket subscribers.
+
+    Stamped events (game_id and timestamp in the body, type
+    and timestamp repeated in X-Event-Type / X-Event-Timestamp) are
+    forwarded as the exact body bytes; only STATE_EVENTS are decoded. Other
+    senders get the body parsed and game_id / timestamp filled in. Either
+    way, every event but FRAME gets the game's next "seq" spliced in front.
+    """
+    body = await request.body()
+    stamped = _stamped_event(request)
+    event: Optional[dict] = None
+    if stamped is None or stamped[0] in STATE_EVENTS:
+        try:
+            event = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        if not isinstance(event, dict):
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+
+    if stamped is not None:
+        etype, timestamp = stamped
+        try:
+            data = body.decode()
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+    else:
+        etype, timestamp, data = _filled_in(game_id, event)
+
+    _publish(game_id, [(etype, timestamp, data, event, None)])
+    return {"ok": True}
+
+
+@app.post("/game/ingest/{game_id}/batch")
+async def ingest_batch(game_id: str, request: Request):
+    """
+    Many events in one request, as GameEmitter sends them, published in
+    order. Each line is either stamped (type, timestamp, emitter and
+    emit_seq in front of the event, see ws_emitter.stamped_line), and then
+    forwarded as it is with only STATE_EVENTS decoded, or one JSON object,
+    decoded and forwarded as it is if it has game_id and timestamp. A line
+    that is neither rejects the whole batch.
+
+    GameEmitter redelivers a batch it isn't sure arrived, so events with an
+    emitter and emit_seq are dropped when that emitter has already got that
+    far (ingest_marks). X-Emitter-Backlog reports what the emitter has yet
+    to send.
     """
+    batch = []
+    for line in (await request.body()).splitlines():
+        if not line.strip():
+            continue
+        stamped = _stamped_line(line)
+        if stamped is not None:
+            etype, timestamp, mark, data = stamped
+            event = None
+            if etype in STATE_EVENTS:
+                event = _decoded_line(data, len(batch) + 1)
+            batch.append((etype, timestamp, data, event, mark))
+            continue
+        try:
+            data = line.decode()
+        except UnicodeDecodeError:
+            data = ""
+        event = _decoded_line(data, len(batch) + 1)
+        mark = (event.get("emitter"), event.get("emit_seq"))
+        if not (isinstance(mark[0], str) and isinstance(mark[1], int)):
+            mark = None
+        if "game_id" in event and "timestamp" in event:
+            batch.append((str(event.get("type", "")), event["timestamp"], data, event, mark))
+        else:
+            batch.append((*_filled_in(game_id, event), event, mark))
+
+    await _load_marks(game_id)
+    # Nothing awaited from here on: no other batch can publish in between
+    marks = dict(ingest_marks.get(game_id, {}))
+    fresh = []
+    for etype, timestamp, data, event, mark in batch:
+        if mark is not None:
+            emitter, emit_seq = mark
+            if emit_seq <= marks.get(emitter, 0):
+                continue
+            marks[emitter] = emit_seq
+        fresh.append((etype, timestamp, data, event, mark))
+    ingest_stats["duplicates"] += len(batch) - len(fresh)
+    _publish(game_id, fresh)
+
+    ingest_stats["events"] += len(fresh)
+    now = time.time()
+    for _, timestamp, _, _, _ in fresh:
+        if isinstance(timestamp, (int, float)):
+            ingest_lag.add(now - timestamp)
+    backlog = request.headers.get("x-emitter-backlog", "")
+    if backlog.isdigit():
+        emitter_backlog[game_id] = int(backlog)
+    return {"ok": True, "events": len(fresh), "duplicates": len(batch) - len(fresh)}
+
+
+def _decoded_line(data: str, number: int) -> dict:
+    """Line `number` of a batch as a JSON object, or the batch is rejected."""
     try:
-        event = await request.json()
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid JSON body")
+        event = json.loads(data)
+    except ValueError:
+        event = None
+    if not isinstance(event, dict):
+        raise HTTPException(status_code=400, detail=f"Invalid JSON in line {number}")
+    return event
+
 
+async def _load_marks(game_id: str):
+    """
+    ingest_marks of a game the bridge doesn't remember (restart, eviction),
+    from the event store, so a batch redelivered across a restart is still
+    recognized. Read in the threadpool once the writer has committed what
+    is queued; once per game.
+    """
+    store = _open_event_store()
+    if game_id in marks_loaded or store is None:
+        return
+
+    def read() -> Dict[str, int]:
+        store.flush()
+        return store.emitter_marks(game_id)
+
+    stored = await run_in_threadpool(read)
+    for emitter, emit_seq in stored.items():
+        _advance_mark(game_id, (emitter, emit_seq))
+    marks_loaded.add(game_id)
+
+
+def _advance_mark(game_id: str, mark: Tuple[str, int]):
+    marks = ingest_marks.setdefault(game_id, {})
+    emitter, emit_seq = mark
+    if emit_seq > marks.get(emitter, 0):
+        marks[emitter] = emit_seq
+
+
+def _filled_in(game_id: str, event: dict) -> Tuple[str, float, str]:
+    """(type, timestamp, data) of an event from a sender that didn't stamp it."""
     event.setdefault("game_id", game_id)
     event.setdefault("timestamp", time.time())
+    return str(event.get("type", "")), event["timestamp"], json.dumps(event)
+
+
+def _publish(game_id: str, batch: List[Tuple[str, float, str, Optional[dict],
+                                             Optional[Tuple[str, int]]]]):
+    """
+    Publish (type, timestamp, data, decoded event or None, emitter mark or
+    None) in order. Each event's mark advances as soon as it is published,
+    so a batch cut short by a 503 is recognized in part when it comes again.
+    """
+    try:
+        for etype, timestamp, data, event, mark in batch:
+            if not isinstance(timestamp, (int, float)):
+                timestamp = 0.0
+            pubsub.publish(game_id, etype, timestamp, data, _latest_seq(game_id), event, mark)
+            if mark is not None:
+                _advance_mark(game_id, mark)
+    except PubSubUnavailable:
+        raise HTTPException(status_code=503, detail="Event relay unavailable")
+
 
-    etype = event.get("type", "")
+def _deliver(message: Published, event: Optional[dict]):
+    """
+    Take in an event published by any worker (see pubsub.py): keep it and
+    fan it out. `event` is the decoded event when this worker had it at
+    hand; state events are decoded here otherwise.
+    """
+    game_id, etype = message.game_id, message.type
 
     # FRAME events are high-frequency — never store in history, just fan-out
     if etype == "FRAME":
-        await broadcast(game_id, event)
-        return {"ok": True}
+        broadcast_raw(game_id, message.data, frame=True)
+        return
+
+    # Every worker follows every emitter's progress, wherever it ingests next
+    if message.mark is not None:
+        _advance_mark(game_id, message.mark)
 
     # Keep capped event history for late joiners (non-frame events only)
-    history = event_history[game_id]
-    history.append(event)
-    if len(history) > 500:
-        history.pop(0)
+    seq = event_seq[game_id] = message.seq
+    data = _with_seq(message.data, seq)
+    event_history[game_id].append(HistoryEvent(seq, etype, message.timestamp, data))
+    store = _open_event_store() if message.origin else event_store
+    if message.origin and store is not None:
+        store.append(StoredEvent(game_id, seq, etype, message.timestamp, data))
+    last_activity[game_id] = time.time()
+    evict_finished_games()
+
+    if event is None and etype in STATE_EVENTS:
+        try:
+            event = json.loads(message.data)
+        except ValueError:
+            pass
+    snapshot = game_snapshots.get(game_id)
+    if snapshot is None:
+        snapshot = game_snapshots[game_id] = GameSnapshot(game_id)
+        if seq > 1 and event_store is not None:
+            _restore_snapshot(game_id, seq, snapshot)
+    if event is not None:
+        restore = snapshot_restores.get(game_id)
+        if restore is not None:
+            restore[1].append((etype, event))
+        markets_version = snapshot.markets_version
+        snapshot.apply(etype, event)
+        _markets_changed(game_id, snapshot, markets_version)
+    _update_game(game_id, etype, event or {}, snapshot)
+
+    broadcast_raw(game_id, data)
+
+
+def _restore_snapshot(game_id: str, seq: int, placeholder: GameSnapshot):
+    """
+    Rebuild the snapshot of a game that began before this worker knew of it
+    (restart, eviction, a worker started later) from the event store: the
+    state events before `seq`, then those delivered since. The store is
+    read in the threadpool, after the writer has committed what this worker
+    queued; until then `placeholder` takes live events and clients wait
+    (_restored). One indexed read of the state events, once per game.
+    """
+    store = event_store
+    live: List[Tuple[str, dict]] = []
+
+    def read() -> List[StoredEvent]:
+        store.flush()
+        return store.query(game_id, 0, seq - 1, SNAPSHOT_EVENTS)
 
+    async def restore():
+        try:
+            stored = await run_in_threadpool(read)
+        except Exception as e:
+            print(f"[EVENTS] Could not restore the state of {game_id}: {e}")
+            return
+        finally:
+            snapshot_restores.pop(game_id, None)
+        if game_snapshots.get(game_id) is not placeholder:
+            return      # evicted meanwhile
+        snapshot = GameSnapshot(game_id)
+        for event in stored:
+            if event.seq < seq:
+                snapshot.apply(event.type, json.loads(event.data))
+        for etype, event in live:
+            snapshot.apply(etype, event)
+        game_snapshots[game_id] = snapshot
+        _markets_changed(game_id, snapshot, -1)
+        if game_id in active_games:
+            active_games[game_id]["hypeScore"] = snapshot.hype_score
+            _lobby_changed()
+
+    snapshot_restores[game_id] = (asyncio.create_task(restore()), live)
+
+
+async def _restored(game_id: str):
+    """Wait for the game's snapshot if it is still being restored."""
+    restore = snapshot_restores.get(game_id)
+    if restore is not None:
+        await asyncio.shield(restore[0])
+
+
+def _update_game(game_id: str, etype: str, event: dict, snapshot: GameSnapshot):
+    """Keep the lobby entry (active_games) in step with the game's events."""
     # Ensure game entry exists
     if game_id not in active_games:
         active_games[game_id] = {
@@ -220,51 +749,111 @@ async def ingest_event(game_id: str, request: Request):
     if etype == "GAME_START":
         g["status"] = "live"
         g["tags"] = ["Live"]
+        g.pop("ended_at", None)
         agents = event.get("agents", [])
         if agents:
             g["players"] = len(agents)
     elif etype == "GAME_END":
         g["status"] = "ended"
+        g["ended_at"] = time.time()     # evicted GAME_TTL after this
         winner = event.get("winner", "")
         g["tags"] = ["Crew Won" if winner == "crew" else "Impostor Won"]
-    elif etype == "KILL":
-        g["hypeScore"] = min(100, g.get("hypeScore", 0) + 15)
-    elif etype == "MEETING_START":
-        g["hypeScore"] = min(100, g.get("hypeScore", 0) + 10)
-
-    await broadcast(game_id, event)
-    return {"ok": True}
+    g["hypeScore"] = snapshot.hype_score
+    _lobby_changed()
 
 
 # ---------------------------------------------------------------------------
 # WebSocket — Per-game channel
 # ---------------------------------------------------------------------------
 
-@app.websocket("/ws/game/{game_id}")
-async def ws_game(websocket: WebSocket, game_id: str):
-    await websocket.accept()
-    game_subscribers[game_id].add(websocket)
-    print(f"[WS] Client connected → game/{game_id} ({len(game_subscribers[game_id])} total)")
+def _join_events(websocket: WebSocket, subscribers: Dict[WebSocket, EventSubscriber],
+                 backlog: List[str]) -> Tuple[EventSubscriber, asyncio.Task]:
+    """Queue `backlog`, join the fan-out and start the subscriber's writer."""
+    subscriber = EventSubscriber(websocket)
+    for data in backlog:
+        subscriber.push(data)
+    subscribers[websocket] = subscriber     # right after the backlog, nothing missed
+    return subscriber, asyncio.create_task(subscriber.run())
 
-    # Replay recent history so late joiners catch up
-    for evt in event_history.get(game_id, [])[-50:]:
-        try:
-            await websocket.send_text(json.dumps(evt))
-        except Exception:
-            break
 
+async def _serve_events(websocket: WebSocket, subscribers: Dict[WebSocket, EventSubscriber],
+                        backlog: List[str]):
+    """Queue `backlog`, join the fan-out and keep the connection until it closes."""
+    subscriber, writer = _join_events(websocket, subscribers, backlog)
     try:
         while True:
-            await asyncio.sleep(25)
+            # Wait on the socket itself so a closing client is noticed at
+            # once; PING only when it has been quiet for a while.
             try:
-                await websocket.send_text('{"type":"PING"}')
-            except Exception:
+                message = await asyncio.wait_for(websocket.receive(), timeout=25)
+            except asyncio.TimeoutError:
+                if writer.done():
+                    break
+                subscriber.push('{"type":"PING"}')
+                continue
+            if message["type"] == "websocket.disconnect":
                 break
     except (WebSocketDisconnect, Exception):
         pass
     finally:
-        game_subscribers[game_id].discard(websocket)
-        print(f"[WS] Client disconnected → game/{game_id}")
+        subscribers.pop(websocket, None)
+        writer.cancel()
+
+
+MAX_STORED_CATCH_UP = 2000     # events read back from the store for one reconnect
+
+
+def _events_since(game_id: str, since: Optional[int],
+                  stored: List[StoredEvent] = ()) -> List[str]:
+    """
+    What a (re)connecting client is missing: the events after `since` when
+    `stored` (read from the event store) and the history still have all of
+    them, otherwise (new client, events lost, or a `since` from a bridge
+    that had other games under that id) one STATE_SNAPSHOT of the game as
+    it is now.
+    """
+    history = event_history.get(game_id, ())
+    latest = _latest_seq(game_id)
+    first = history[0].seq if history else latest + 1
+    after = stored[-1].seq if stored else since
+    if since is not None and since <= latest and after + 1 >= first:
+        return ([event.data for event in stored] +
+                [event.data for event in itertools.islice(history, after + 1 - first, None)])
+    snapshot = game_snapshots.get(game_id)
+    return [snapshot.message(latest)] if snapshot is not None else []
+
+
+async def _catch_up(game_id: str, since: Optional[int]) -> List[str]:
+    """_events_since(), reading what memory no longer has from the event store."""
+    await _restored(game_id)
+    stored: List[StoredEvent] = []
+    history = event_history.get(game_id, ())
+    first = history[0].seq if history else _latest_seq(game_id) + 1
+    missing = first - since - 1 if since is not None else 0
+    if event_store is not None and 0 < missing <= MAX_STORED_CATCH_UP:
+        stored = await run_in_threadpool(event_store.query, game_id, since, missing)
+        if not stored or stored[0].seq != since + 1:
+            stored = []     # not all written yet; a snapshot will do
+    # Nothing awaited from here on: no event can slip in before subscribing
+    return _events_since(game_id, since, stored)
+
+
+@app.websocket("/ws/game/{game_id}")
+async def ws_game(websocket: WebSocket, game_id: str):
+    """
+    Live events of one game, after a STATE_SNAPSHOT of it; ?since=<seq>
+    replays exactly what came after that event instead, when it can.
+    """
+    await websocket.accept()
+    print(f"[WS] Client connected → game/{game_id} ({len(game_subscribers[game_id]) + 1} total)")
+    try:
+        since: Optional[int] = int(websocket.query_params["since"])
+    except (KeyError, ValueError):
+        since = None
+    await _serve_events(websocket, game_subscribers[game_id], await _catch_up(game_id, since))
+    if not game_subscribers.get(game_id):
+        game_subscribers.pop(game_id, None)
+    print(f"[WS] Client disconnected → game/{game_id}")
 
 
 # ---------------------------------------------------------------------------
@@ -274,69 +863,1389 @@ async def ws_game(websocket: WebSocket, game_id: str):
 @app.websocket("/ws")
 async def ws_legacy(websocket: WebSocket):
     await websocket.accept()
-    legacy_subscribers.add(websocket)
-    print(f"[WS] Legacy client connected ({len(legacy_subscribers)} total)")
-    try:
-        while True:
-            await asyncio.sleep(25)
-            try:
-                await websocket.send_text('{"type":"PING"}')
-            except Exception:
-                break
-    except (WebSocketDisconnect, Exception):
-        pass
-    finally:
-        legacy_subscribers.discard(websocket)
+    print(f"[WS] Legacy client connected ({len(legacy_subscribers) + 1} total)")
+    await _serve_events(websocket, legacy_subscribers, [])
 
 
 # ---------------------------------------------------------------------------
 # WebSocket — Game engine pushes binary video frames here
 # ---------------------------------------------------------------------------
 
-# game_id → Set[WebSocket] — browser video subscribers
-video_subscribers: Dict[str, Set[WebSocket]] = defaultdict(set)
+MAIN_FEED = "main"
+AUTO_RENDITION = "auto"
 
 
-@app.websocket("/ws/stream/{game_id}")
-async def ws_stream_ingest(websocket: WebSocket, game_id: str):
+class LagWindow:
+    """Average and worst of a latency over the last WINDOW seconds, in ms."""
+
+    WINDOW = 5.0
+
+    def __init__(self):
+        self._start = time.monotonic()
+        self._sum = 0.0
+        self._count = 0
+        self._max = 0.0
+        self._last = {"avg_ms": None, "max_ms": None, "samples": 0}
+
+    def add(self, seconds: float, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        if now - self._start >= self.WINDOW:
+            self._last = self._current()
+            self._sum, self._count, self._max, self._start = 0.0, 0, 0.0, now
+        self._sum += seconds
+        self._count += 1
+        self._max = max(self._max, seconds)
+
+    def _current(self) -> dict:
+        if not self._count:
+            return {"avg_ms": None, "max_ms": None, "samples": 0}
+        return {"avg_ms": round(self._sum / self._count * 1000, 1),
+                "max_ms": round(self._max * 1000, 1), "samples": self._count}
+
+    def snapshot(self) -> dict:
+        """The window in progress, or the last full one while it is empty."""
+        return self._current() if self._count else self._last
+
+
+# event timestamp → batch ingest, including any time spent in an emitter's spool
+ingest_lag = LagWindow()
+
+
+class RenditionStats:
+    """Frames of one rendition as they arrive from the game engine."""
+
+    def __init__(self):
+        self.frames = 0
+        self.dropped = 0            # seq gaps: frames the streamer never sent
+        self.last_seq: Optional[int] = None
+        self.last_tick: Optional[int] = None
+        self.ingest_lag = LagWindow()   # capture → bridge
+        self.encode = LagWindow()
+
+    def record(self, header: Optional[FrameHeader], now: float):
+        self.frames += 1
+        if header is None:
+            return
+        if self.last_seq is not None and header.seq > self.last_seq + 1:
+            self.dropped += header.seq - self.last_seq - 1
+        self.last_seq = header.seq      # a lower seq means the streamer restarted
+        self.last_tick = header.tick
+        self.ingest_lag.add(now - header.captured_at)
+        self.encode.add(header.encode_us / 1e6)
+
+    def snapshot(self) -> dict:
+        return {"frames": self.frames, "dropped": self.dropped, "last_seq": self.last_seq,
+                "last_tick": self.last_tick, "ingest_lag": self.ingest_lag.snapshot(),
+                "encode": self.encode.snapshot()}
+
+
+class LatestFrames:
     """
-    The game engine connects here and pushes raw binary JPEG frames.
-    Bridge immediately fans them out to all /ws/video/{game_id} subscribers.
+    The newest keyframe of one rendition and the deltas after it, so a new
+    viewer sees the current picture at once instead of waiting for the
+    next keyframe. The keyframe alone also serves as the thumbnail.
     """
+
+    MAX_FRAMES = 120    # deltas kept after a keyframe before giving up until the next
+
+    def __init__(self):
+        self.keyframe: Optional[bytes] = None
+        self.keyframe_at = 0.0
+        self.frames: List[bytes] = []   # replaced, never cleared, at each keyframe
+        self._open = False
+
+    def add(self, framed: bytes, keyframe: bool, now: float):
+        if keyframe:
+            self.keyframe, self.keyframe_at = framed, now
+            self.frames = [framed]
+            self._open = True
+        elif self._open:
+            if len(self.frames) < self.MAX_FRAMES:
+                self.frames.append(framed)
+            else:
+                self.frames, self._open = [], False
+
+    def restart(self):
+        """The streamer (re)connected: its deltas don't apply to what we hold."""
+        self.frames, self._open = [], False
+
+
+def seconds_from_env(name: str, default: float) -> float:
+    """
+    Read a duration in seconds; empty is 0. A value that isn't a finite
+    number is ignored with a warning, keeping `default`.
+    """
+    value = os.environ.get(name, f"{default:g}").strip()
+    if not value:
+        return 0.0
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = math.nan
+    if not math.isfinite(seconds):
+        print(f"[BRIDGE] Ignoring {name}={value!r}; keeping {default:g} s")
+        return default
+    return max(seconds, 0.0)
+
+
+def replay_seconds_from_env(default: float = 20.0) -> float:
+    """Read SUS_REPLAY_SECONDS; 0 (or empty) turns instant replays off."""
+    return seconds_from_env("SUS_REPLAY_SECONDS", default)
+
+
+class ReplayRing:
+    """
+    The last SECONDS of one rendition's frames, exactly as received, for
+    instant replays.
+
+    Frames are grouped by keyframe (a keyframe and the deltas after it) so
+    a clip can always start on one; a group is only dropped once the group
+    after it starts before the window.
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.bytes = 0
+        self._groups: Deque[List[Tuple[float, bytes]]] = deque()
+
+    def add(self, captured_at: float, framed: bytes, keyframe: bool):
+        if keyframe:
+            self._groups.append([])
+        elif not self._groups:
+            return          # nothing to apply a delta to
+        self._groups[-1].append((captured_at, framed))
+        self.bytes += len(framed)
+        cutoff = captured_at - self.seconds
+        while len(self._groups) > 1 and self._groups[1][0][0] <= cutoff:
+            self.bytes -= sum(len(f) for _, f in self._groups.popleft())
+
+    def clip(self, start: float, end: float) -> List[Tuple[float, bytes]]:
+        """(captured_at, frame) up to `end`, from the last keyframe at or before `start`."""
+        groups = list(self._groups)
+        first = 0
+        for i, group in enumerate(groups):
+            if group[0][0] > start:
+                break
+            first = i
+        frames: List[Tuple[float, bytes]] = []
+        for group in groups[first:]:
+            for captured_at, framed in group:
+                if captured_at > end:
+                    return frames
+                frames.append((captured_at, framed))
+        return frames
+
+    def snapshot(self) -> dict:
+        frames = sum(len(group) for group in self._groups)
+        span = self._groups[-1][-1][0] - self._groups[0][0][0] if self._groups else 0.0
+        return {"frames": frames, "bytes": self.bytes, "seconds": round(span, 1)}
+
+
+class VideoViewer:
+    """
+    One browser watching a feed: the rendition it gets, the frames waiting
+    to be sent to it and how long sends to it take.
+
+    The ingest loop only offers frames to a viewer's mailbox; the viewer's
+    own sender task sends them, so a slow browser holds up nobody else.
+    Frames it has not sent yet are overwritten: a keyframe replaces
+    everything pending and a delta is merged into a pending delta. When
+    merging gets out of hand (MAX_MERGED_BYTES) the viewer drops what it
+    has and waits for the next keyframe.
+
+    `requested` is a rendition name or "auto". Auto viewers start on the
+    default rendition; a WINDOW in which sending to them kept their sender
+    busy for more than SLOW_SEND_LOAD of the time steps them one rendition
+    down, UPGRADE_AFTER seconds below FAST_SEND_LOAD one up. A switch only
+    takes effect at the next keyframe of the new rendition.
+    """
+
+    WINDOW = 1.0
+    SLOW_SEND_LOAD = 0.25
+    FAST_SEND_LOAD = 0.05
+    UPGRADE_AFTER = 5.0
+    MAX_MERGED_BYTES = 1024 * 1024
+
+    def __init__(self, requested: str = AUTO_RENDITION,
+                 available: Tuple[str, ...] = RENDITIONS, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        self.requested = requested if requested in RENDITIONS else AUTO_RENDITION
+        self.available = available
+        self.rendition = self._preferred(DEFAULT_RENDITION)
+        self.pending: Optional[str] = None   # switch to this at its next keyframe
+        self.synced = False                  # has had a keyframe of `rendition`
+        self.switched = False                # rendition changed, viewer not told yet
+        self.replay: Optional[asyncio.Task] = None   # live frames wait while one plays
+        self.ready = asyncio.Event()         # the mailbox has frames
+        self.send_lock = asyncio.Lock()      # one writer on the socket at a time
+        self.skipped = 0                     # frames overwritten before they were sent
+        self.resyncs = 0                     # times it fell behind and waited for a keyframe
+        self.throughput = 0.0                # bytes/s over the last window
+        self.frames_sent = 0
+        self.delivery_lag = LagWindow()      # capture → sent to this viewer
+        self.client_lag_ms: Optional[float] = None   # capture → painted, as reported
+        self.client_dropped = 0                      # seq gaps the player saw
+        self._window_start = now
+        self._headroom_since = now
+        self._busy = 0.0
+        self._bytes = 0
+        # (frame, header, keyframe, rendition to announce): a keyframe, a delta or both
+        self._mailbox: List[Tuple[bytes, Optional[FrameHeader], bool, Optional[str]]] = []
+
+    @property
+    def auto(self) -> bool:
+        return self.requested == AUTO_RENDITION
+
+    def _preferred(self, fallback: str) -> str:
+        wanted = fallback if self.auto else self.requested
+        if wanted in self.available:
+            return wanted
+        if DEFAULT_RENDITION in self.available:
+            return DEFAULT_RENDITION
+        return self.available[0]
+
+    def _switch(self, rendition: str):
+        self.pending = None if rendition == self.rendition else rendition
+
+    def request(self, requested: str):
+        self.requested = requested if requested in RENDITIONS else AUTO_RENDITION
+        self._switch(self._preferred(self.rendition))
+
+    def set_available(self, available: Tuple[str, ...]):
+        self.available = tuple(available) or (DEFAULT_RENDITION,)
+        self._switch(self._preferred(self.rendition))
+
+    @property
+    def replaying(self) -> bool:
+        return self.replay is not None and not self.replay.done()
+
+    def accepts(self, rendition: str, keyframe: bool) -> bool:
+        """Whether this message is for the viewer; switches at a keyframe."""
+        if self.replaying:
+            return False
+        if keyframe and rendition == self.pending:
+            self.rendition, self.pending, self.synced = rendition, None, False
+            self.switched = True
+        return rendition == self.rendition and (keyframe or self.synced)
+
+    def offer(self, framed: bytes, header: Optional[FrameHeader], keyframe: bool) -> bool:
+        """Put an accepted frame in the mailbox; True when it lost sync (needs a keyframe)."""
+        box = self._mailbox
+        if keyframe:
+            announce, self.switched = (self.rendition if self.switched else None), False
+            self.skipped += len(box)
+            box[:] = [(framed, header, True, announce)]
+            self.synced = True
+        elif not box or box[-1][2]:
+            box.append((framed, header, False, None))
+        else:
+            _, newer = unpack_frame(framed)
+            _, older = unpack_frame(box[-1][0])
+            try:
+                merged = framed[:len(framed) - len(newer)] + merge_deltas(older, newer)
+            except (ValueError, struct.error):
+                merged = None
+            if merged is None or len(merged) > self.MAX_MERGED_BYTES:
+                self.skipped += len(box) + 1
+                self.resyncs += 1
+                box.clear()
+                self.synced = False
+                return True
+            box[-1] = (merged, header, False, None)
+            self.skipped += 1
+        self.ready.set()
+        return False
+
+    def take(self) -> List[Tuple[bytes, Optional[FrameHeader], bool, Optional[str]]]:
+        """Everything in the mailbox, oldest first, leaving it empty."""
+        box, self._mailbox = self._mailbox, []
+        self.ready.clear()
+        return box
+
+    def sent(self, keyframe: bool, nbytes: int, seconds: float, now: Optional[float] = None) -> bool:
+        """Record one send; True when the viewer decided to switch rendition."""
+        now = time.monotonic() if now is None else now
+        self._busy += seconds
+        self._bytes += nbytes
+        elapsed = now - self._window_start
+        if elapsed < self.WINDOW:
+            return False
+        pending = self.pending
+        self._evaluate(self._busy / elapsed, now)
+        self.throughput = self._bytes / elapsed
+        self._busy, self._bytes, self._window_start = 0.0, 0, now
+        return self.pending != pending
+
+    def delivered(self, header: Optional[FrameHeader], now: float):
+        self.frames_sent += 1
+        if header is not None:
+            self.delivery_lag.add(now - header.captured_at)
+
+    def snapshot(self) -> dict:
+        return {"rendition": self.rendition, "requested": self.requested,
+                "frames_sent": self.frames_sent, "throughput_kbps": round(self.throughput / 125, 1),
+                "delivery_lag": self.delivery_lag.snapshot(), "client_lag_ms": self.client_lag_ms,
+                "client_dropped": self.client_dropped, "skipped": self.skipped,
+                "resyncs": self.resyncs, "pending": len(self._mailbox),
+                "replaying": self.replaying}
+
+    def _evaluate(self, load: float, now: float):
+        if not self.auto or self.pending is not None or self.rendition not in self.available:
+            return
+        index = self.available.index(self.rendition)
+        if load > self.SLOW_SEND_LOAD:
+            self._headroom_since = now
+            if index + 1 < len(self.available):
+                self.pending = self.available[index + 1]
+        elif load >= self.FAST_SEND_LOAD:
+            self._headroom_since = now
+        elif index > 0 and now - self._headroom_since >= self.UPGRADE_AFTER:
+            self._headroom_since = now
+            self.pending = self.available[index - 1]
+
+
+# (game_id, feed) → WebSocket → VideoViewer — browser video subscribers
+video_subscribers: Dict[Tuple[str, str], Dict[WebSocket, VideoViewer]] = defaultdict(dict)
+
+# game_id → feeds that currently have a game engine streaming into them
+live_feeds: Dict[str, Set[str]] = defaultdict(set)
+
+# game_id → feed → latest STREAM_STATE (adaptive operating point) reported
+stream_states: Dict[str, Dict[str, dict]] = defaultdict(dict)
+
+# (game_id, feed) → rendition → arrival stats from the frame headers
+stream_metrics: Dict[Tuple[str, str], Dict[str, RenditionStats]] = defaultdict(dict)
+
+# (game_id, feed) → the game engine's /ws/stream socket, and the last
+# DEMAND sent on it
+stream_ingests: Dict[Tuple[str, str], WebSocket] = {}
+_sent_demand: Dict[Tuple[str, str], tuple] = {}
+
+# Where feeds are recorded (None: not recorded), and the recorder of each
+# feed that is streaming right now
+RECORDING_DIR: Optional[Path] = recording_dir_from_env()
+RECORDING_RENDITION = recording_rendition_from_env()
+recorders: Dict[Tuple[str, str], StreamRecorder] = {}
+
+# (game_id, feed) → rendition → the last REPLAY_SECONDS of frames
+REPLAY_SECONDS = replay_seconds_from_env()
+REPLAY_EVENTS = ("KILL", "AGENT_EJECTED")
+replay_rings: Dict[Tuple[str, str], Dict[str, ReplayRing]] = defaultdict(dict)
+
+# (game_id, feed) → rendition → newest keyframe and deltas, kept after the
+# streamer leaves for thumbnails
+latest_frames: Dict[Tuple[str, str], Dict[str, LatestFrames]] = defaultdict(dict)
+
+# (game_id, feed) → renditions whose deltas are skipped until their next
+# keyframe, after a seq gap
+_broken_renditions: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+
+# Feeds streaming to other workers, relayed here (see _receive):
+# (game_id, feed) → (the worker it streams to, when it last relayed), and
+# (game_id, feed) → worker → DEMAND of its viewers, for feeds streaming here.
+# An unwatched streamer still sends a frame every few seconds, so a feed
+# silent for REMOTE_FEED_TIMEOUT lost its worker.
+REMOTE_FEED_TIMEOUT = 30.0
+remote_feeds: Dict[Tuple[str, str], Tuple[str, float]] = {}
+remote_demand: Dict[Tuple[str, str], Dict[str, dict]] = defaultdict(dict)
+
+
+def _local_demand(key: Tuple[str, str]) -> dict:
+    """What this worker's viewers of a feed need from its streamer."""
+    renditions: Set[str] = set()
+    keyframe: Set[str] = set()
+    viewers = video_subscribers.get(key, {})
+    for viewer in viewers.values():
+        renditions.add(viewer.rendition)
+        if not viewer.synced:
+            keyframe.add(viewer.rendition)
+        if viewer.pending is not None:
+            renditions.add(viewer.pending)
+            keyframe.add(viewer.pending)
+    # The recorder watches like any viewer, so unwatched feeds still record
+    recorder = recorders.get(key)
+    if recorder is not None:
+        renditions.add(recorder.rendition)
+        if recorder.needs_keyframe:
+            keyframe.add(recorder.rendition)
+    return {"type": "DEMAND", "viewers": len(viewers) + (recorder is not None),
+            "renditions": sorted(renditions), "keyframe": sorted(keyframe)}
+
+
+def _demand(key: Tuple[str, str]) -> dict:
+    """What the viewers of a feed on every worker need from its streamer."""
+    demand = _local_demand(key)
+    renditions, keyframe = set(demand["renditions"]), set(demand["keyframe"])
+    for other in remote_demand.get(key, {}).values():
+        demand["viewers"] += other["viewers"]
+        renditions.update(other["renditions"])
+        keyframe.update(other["keyframe"])
+    demand["renditions"], demand["keyframe"] = sorted(renditions), sorted(keyframe)
+    return demand
+
+
+async def _report_demand(key: Tuple[str, str], force: bool = False):
+    """
+    Tell the feed's streamer which renditions are watched, when that changed.
+
+    With no viewers the streamer stops encoding (bar an occasional idle
+    frame); a viewer waiting for a keyframe gets one on the next frame.
+    A worker the feed does not stream to relays its own viewers' demand
+    instead, for the worker it streams to to add up.
+    """
+    ws = stream_ingests.get(key)
+    demand = _demand(key) if ws is not None else _local_demand(key)
+    signature = (demand["viewers"], tuple(demand["renditions"]), tuple(demand["keyframe"]))
+    if not force and _sent_demand.get(key) == signature:
+        return
+    if ws is None:
+        if pubsub.relay("DEMAND", *key, json.dumps(demand).encode()):
+            _sent_demand[key] = signature
+        return
+    _sent_demand[key] = signature
+    try:
+        await ws.send_text(json.dumps(demand))
+    except Exception:
+        pass
+
+
+def _demand_changed(key: Tuple[str, str]):
+    """_report_demand() from code that can't wait for it."""
+    asyncio.get_running_loop().create_task(_report_demand(key))
+
+
+def _stream_renditions(game_id: str, feed: str) -> Tuple[str, ...]:
+    state = stream_states.get(game_id, {}).get(feed)
+    if state is None:
+        return RENDITIONS   # not reported yet — whatever arrives
+    return tuple(state.get("renditions") or (DEFAULT_RENDITION,))
+
+
+async def _start_recording(key: Tuple[str, str]):
+    """Record the feed (continuing an earlier recording in a new segment)."""
+    previous = recorders.pop(key, None)     # a streamer that reconnected
+    if previous is not None:
+        await run_in_threadpool(previous.close)
+    game_id, feed = key
+    if RECORDING_DIR is None or not valid_name(game_id) or not valid_name(feed):
+        return
+    try:
+        recorders[key] = await run_in_threadpool(StreamRecorder, RECORDING_DIR, game_id, feed,
+                                                 RECORDING_RENDITION)
+    except OSError as e:
+        print(f"[STREAM] Not recording {game_id}/{feed}: {e}")
+
+
+def _start_feed(key: Tuple[str, str]):
+    """A streamer (re)connected, here or at another worker."""
+    game_id, feed = key
+    live_feeds[game_id].add(feed)
+    last_activity[game_id] = time.time()
+    for latest in latest_frames.get(key, {}).values():
+        latest.restart()
+
+
+def _end_feed(key: Tuple[str, str]):
+    """The feed's streamer left: drop what only held while it streamed."""
+    game_id, feed = key
+    live_feeds[game_id].discard(feed)
+    stream_states[game_id].pop(feed, None)
+    last_activity[game_id] = time.time()
+    stream_metrics.pop(key, None)
+    replay_rings.pop(key, None)
+    _broken_renditions.pop(key, None)
+    for latest in latest_frames.get(key, {}).values():
+        latest.restart()
+
+
+def _take_stream_state(key: Tuple[str, str], state: dict):
+    """A STREAM_STATE (the streamer's operating point) of a feed."""
+    game_id, feed = key
+    state["received_at"] = time.time()
+    stream_states[game_id][feed] = state
+    available = _stream_renditions(game_id, feed)
+    for viewer in video_subscribers.get(key, {}).values():
+        viewer.set_available(available)
+    recorder = recorders.get(key)
+    if recorder is not None and recorder.rendition not in available:
+        recorder.switch_rendition(DEFAULT_RENDITION if DEFAULT_RENDITION in available
+                                  else available[0])
+
+
+def _take_frame(key: Tuple[str, str], frame_bytes: bytes) -> bool:
+    """
+    Keep one frame of a feed (metrics, latest frames, replay ring, the
+    recording) and offer it to the feed's viewers here; True when that
+    changed their demand. After a seq gap the rendition's deltas have
+    nothing to apply to, so they are skipped up to its next keyframe.
+    """
+    # Viewers get the frame header along with the picture
+    rendition, framed = unpack_rendition(frame_bytes)
+    header, payload = unpack_frame(framed)
+    keyframe = is_keyframe(payload)
+    now = time.time()
+    stats = stream_metrics[key].get(rendition)
+    if stats is None:
+        stats = stream_metrics[key][rendition] = RenditionStats()
+    broken = _broken_renditions[key]
+    gap = (header is not None and stats.last_seq is not None
+           and header.seq > stats.last_seq + 1)
+    stats.record(header, now)
+    demand_changed = keyframe
+    if gap and not keyframe:
+        broken.add(rendition)
+        for viewer in video_subscribers.get(key, {}).values():
+            if viewer.rendition == rendition and viewer.synced:
+                viewer.synced = False
+                demand_changed = True
+    if keyframe:
+        broken.discard(rendition)
+    elif rendition in broken:
+        return demand_changed
+    latest = latest_frames[key].get(rendition)
+    if latest is None:
+        latest = latest_frames[key][rendition] = LatestFrames()
+    latest.add(framed, keyframe, now)
+    if REPLAY_SECONDS > 0:
+        ring = replay_rings[key].get(rendition)
+        if ring is None:
+            ring = replay_rings[key][rendition] = ReplayRing(REPLAY_SECONDS)
+        ring.add(header.captured_at if header else now, framed, keyframe)
+    recorder = recorders.get(key)
+    if recorder is not None and rendition == recorder.rendition:
+        recorder.append(framed, keyframe)
+    # Hand the frame to each viewer's sender; never wait on a browser
+    for viewer in video_subscribers.get(key, {}).values():
+        if viewer.accepts(rendition, keyframe) and viewer.offer(framed, header, keyframe):
+            demand_changed = True
+    return demand_changed
+
+
+async def _ingest_stream(websocket: WebSocket, game_id: str, feed: str):
+    key = (game_id, feed)
     await websocket.accept()
-    print(f"[STREAM] Game engine connected for {game_id}")
+    _start_feed(key)
+    stream_ingests[key] = websocket
+    remote_feeds.pop(key, None)
+    print(f"[STREAM] Game engine connected for {game_id}/{feed}")
     try:
+        await _start_recording(key)
+        await _report_demand(key, force=True)
         while True:
-            frame_bytes = await websocket.receive_bytes()
-            dead: Set[WebSocket] = set()
-            for ws in list(video_subscribers.get(game_id, set())):
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            frame_bytes = message.get("bytes")
+            if frame_bytes is None:
+                # Text frames carry the streamer's operating point
+                text = message.get("text") or ""
                 try:
-                    await ws.send_bytes(frame_bytes)
-                except Exception:
-                    dead.add(ws)
-            video_subscribers[game_id] -= dead
+                    state = json.loads(text)
+                except ValueError:
+                    continue
+                if isinstance(state, dict) and state.get("type") == "STREAM_STATE":
+                    _take_stream_state(key, state)
+                    pubsub.relay("VIDEO_STATE", game_id, feed, text.encode())
+                    await _report_demand(key)
+                continue
+            # The other workers' viewers get it too; a frame dropped on the
+            # way is a seq gap there
+            pubsub.relay("VIDEO", game_id, feed, frame_bytes)
+            if _take_frame(key, frame_bytes):
+                await _report_demand(key)
     except WebSocketDisconnect:
-        print(f"[STREAM] Game engine disconnected for {game_id}")
+        print(f"[STREAM] Game engine disconnected for {game_id}/{feed}")
+    finally:
+        last_activity[game_id] = time.time()
+        # A streamer that reconnected owns the feed now; leave its state be
+        if stream_ingests.get(key) is websocket:
+            _end_feed(key)
+            pubsub.relay("VIDEO_END", game_id, feed, b"")
+            del stream_ingests[key]
+            _sent_demand.pop(key, None)
+            recorder = recorders.pop(key, None)
+            if recorder is not None:
+                await run_in_threadpool(recorder.close)
+
+
+def _receive(message: Relayed):
+    """
+    Take in what another worker relayed (see pubsub.relay):
+
+      VIDEO, VIDEO_STATE, VIDEO_END   a feed streaming there, served here
+                                      like one streaming here bar recording
+      DEMAND                          its viewers' demand, added to that of
+                                      a feed streaming here
+      GAME_STARTING                   the lobby entry of a game it launched
+    """
+    key = (message.game_id, message.feed)
+    if message.kind == "GAME_STARTING":
+        active_games[message.game_id] = json.loads(message.data)
+        last_activity[message.game_id] = time.time()
+        _lobby_changed()
+        return
+    if message.kind == "DEMAND":
+        demand = json.loads(message.data)
+        if demand.get("viewers"):
+            remote_demand[key][message.worker] = demand
+        else:
+            remote_demand[key].pop(message.worker, None)
+            if not remote_demand[key]:
+                del remote_demand[key]
+        if key in stream_ingests:
+            _demand_changed(key)
+        return
+    if key in stream_ingests:
+        return      # it streams here (too); ours is the newer connection
+    if message.kind == "VIDEO_END":
+        if remote_feeds.get(key, (None,))[0] == message.worker:
+            del remote_feeds[key]
+            _end_feed(key)
+        return
+    if remote_feeds.get(key, (None,))[0] != message.worker:
+        _start_feed(key)        # streaming to another worker than before
+    remote_feeds[key] = (message.worker, time.time())
+    if message.kind == "VIDEO_STATE":
+        _take_stream_state(key, json.loads(message.data))
+        _demand_changed(key)
+    elif message.kind == "VIDEO":
+        if _take_frame(key, message.data):
+            _demand_changed(key)
+
+
+def _end_silent_feeds(now: float):
+    """End feeds whose worker went away without relaying VIDEO_END."""
+    for key, (_, seen) in list(remote_feeds.items()):
+        if now - seen >= REMOTE_FEED_TIMEOUT:
+            del remote_feeds[key]
+            _end_feed(key)
+
+
+def _replay_moment(game_id: str, request: dict) -> Optional[float]:
+    """The capture time a replay is about: `at`, or the latest `event` of a kind."""
+    at = request.get("at")
+    if isinstance(at, (int, float)):
+        return float(at)
+    kinds = (request["event"],) if isinstance(request.get("event"), str) else REPLAY_EVENTS
+    for event in reversed(event_history.get(game_id, [])):
+        if event.type in kinds and event.timestamp:
+            return float(event.timestamp)
+    return None
+
+
+def _replay_window(request: dict) -> Tuple[float, float]:
+    """Seconds (before, after) the moment, limited to what the ring holds."""
+    def seconds(name: str, default: float) -> float:
+        value = request.get(name, default)
+        return min(max(float(value), 0.0), REPLAY_SECONDS) \
+            if isinstance(value, (int, float)) else default
+    return seconds("before", 5.0), seconds("after", 2.0)
+
+
+def _replay_clip(key: Tuple[str, str], rendition: str, at: float,
+                 before: float, after: float) -> List[Tuple[float, bytes]]:
+    rings = replay_rings.get(key, {})
+    ring = rings.get(rendition) or next(iter(rings.values()), None)
+    return ring.clip(at - before, at + after) if ring is not None else []
+
+
+async def _play_replay(websocket: WebSocket, viewer: VideoViewer, key: Tuple[str, str],
+                       at: float, before: float, after: float, speed: float):
+    """
+    Re-send cached frames around `at` at their original pace (times
+    1/speed), then hand the viewer back to live video at its next keyframe.
+    """
+    try:
+        # Let the moments after the event happen first
+        await asyncio.sleep(min(max(at + after - time.time(), 0.0), after))
+        frames = _replay_clip(key, viewer.rendition, at, before, after)
+        viewer.take()               # live frames still waiting are out of date now
+        async with viewer.send_lock:
+            await websocket.send_text(json.dumps({
+                "type": "REPLAY_START", "at": at, "frames": len(frames),
+                "start": frames[0][0] if frames else None,
+                "end": frames[-1][0] if frames else None}))
+        previous = frames[0][0] if frames else 0.0
+        for captured_at, framed in frames:
+            await asyncio.sleep(min(max(captured_at - previous, 0.0), 1.0) / speed)
+            previous = captured_at
+            async with viewer.send_lock:
+                await websocket.send_bytes(framed)
+        async with viewer.send_lock:
+            await websocket.send_text(json.dumps({"type": "REPLAY_END"}))
+    except Exception:
+        pass
+    finally:
+        viewer.synced = False       # live again from the next keyframe
+        await _report_demand(key)
+
+
+async def _send_latest(websocket: WebSocket, viewer: VideoViewer, key: Tuple[str, str]):
+    """
+    Send a new viewer the newest keyframe of its rendition and the deltas
+    since, including ones that arrive meanwhile. Nothing is awaited after
+    the last check, so the caller joins the live fan-out without a gap.
+    """
+    sent: Optional[List[bytes]] = None
+    count = 0
+    while True:
+        latest = latest_frames.get(key, {}).get(viewer.rendition)
+        frames = latest.frames if latest is not None else []
+        if frames is not sent:
+            sent, count = frames, 0     # a new keyframe arrived: start over from it
+        if count >= len(frames):
+            viewer.synced = count > 0
+            return
+        await websocket.send_bytes(frames[count])
+        count += 1
+
+
+async def _send_video(websocket: WebSocket, viewer: VideoViewer, key: Tuple[str, str]):
+    """A viewer's sender: drains its mailbox at whatever pace the browser takes."""
+    try:
+        while True:
+            await viewer.ready.wait()
+            for framed, header, keyframe, announce in viewer.take():
+                started = time.monotonic()
+                async with viewer.send_lock:
+                    if announce is not None:
+                        # Frame seqs restart per rendition; let the player know
+                        await websocket.send_text(json.dumps({"type": "RENDITION",
+                                                              "rendition": announce}))
+                    await websocket.send_bytes(framed)
+                viewer.delivered(header, time.time())
+                if viewer.sent(keyframe, len(framed), time.monotonic() - started):
+                    await _report_demand(key)
+    except Exception:
+        pass    # the socket is gone; the subscriber loop notices and cleans up
+
+
+async def _watch(websocket: WebSocket, viewer: VideoViewer, key: Tuple[str, str]) -> asyncio.Task:
+    """Catch a new viewer up, add it to the feed's fan-out and start its sender."""
+    await _send_latest(websocket, viewer, key)
+    video_subscribers[key][websocket] = viewer
+    sender = asyncio.create_task(_send_video(websocket, viewer, key))
+    print(f"[VIDEO] Browser subscribed to {key[0]}/{key[1]} ({len(video_subscribers[key])} total)")
+    await _report_demand(key)
+    return sender
+
+
+async def _unwatch(websocket: WebSocket, viewer: VideoViewer, key: Tuple[str, str],
+                   sender: Optional[asyncio.Task]):
+    if viewer.replaying:
+        viewer.replay.cancel()
+    if sender is not None:
+        sender.cancel()
+    video_subscribers[key].pop(websocket, None)
+    if not video_subscribers.get(key):
+        video_subscribers.pop(key, None)
+    print(f"[VIDEO] Browser unsubscribed from {key[0]}/{key[1]}")
+    await _report_demand(key)
+
+
+async def _video_request(websocket: WebSocket, viewer: VideoViewer, key: Tuple[str, str],
+                         request: dict):
+    """
+    A viewer's message about its video:
+
+      {"type": "SET_RENDITION", "rendition": "low" | ... | "auto"}
+      {"type": "VIDEO_STATS", "lag_ms": <capture → painted>}
+      {"type": "REPLAY", "at": <unix time> | "event": "KILL", "before": 5,
+       "after": 2, "speed": 1}   (no at/event: the latest KILL / AGENT_EJECTED)
+    """
+    if request.get("type") == "SET_RENDITION":
+        viewer.request(str(request.get("rendition", AUTO_RENDITION)))
+        await _report_demand(key)
+    elif request.get("type") == "VIDEO_STATS":
+        lag, dropped = request.get("lag_ms"), request.get("dropped")
+        viewer.client_lag_ms = float(lag) if isinstance(lag, (int, float)) else None
+        if isinstance(dropped, int) and dropped > 0:
+            viewer.client_dropped += dropped
+    elif request.get("type") == "REPLAY" and not viewer.replaying:
+        at = _replay_moment(key[0], request)
+        if at is None:
+            async with viewer.send_lock:
+                await websocket.send_text(json.dumps({"type": "REPLAY_END",
+                                                      "error": "nothing to replay"}))
+            return
+        speed = request.get("speed", 1.0)
+        speed = min(max(float(speed), 0.1), 4.0) if isinstance(speed, (int, float)) else 1.0
+        viewer.replay = asyncio.create_task(
+            _play_replay(websocket, viewer, key, at, *_replay_window(request), speed))
+
+
+async def _subscribe_video(websocket: WebSocket, game_id: str, feed: str):
+    await websocket.accept()
+    key = (game_id, feed)
+    viewer = VideoViewer(websocket.query_params.get("rendition", AUTO_RENDITION),
+                         _stream_renditions(game_id, feed))
+    sender: Optional[asyncio.Task] = None
+    try:
+        sender = await _watch(websocket, viewer, key)
+        while True:
+            # Wait on the socket itself so a closing browser is noticed at
+            # once; PING only when it has been quiet for a while.
+            try:
+                message = await asyncio.wait_for(websocket.receive(), timeout=30)
+            except asyncio.TimeoutError:
+                if sender.done():
+                    break
+                try:
+                    async with viewer.send_lock:
+                        await websocket.send_text('{"type":"PING"}')
+                except Exception:
+                    break
+                continue
+            if message["type"] == "websocket.disconnect":
+                break
+            try:
+                request = json.loads(message.get("text") or "")
+            except ValueError:
+                continue
+            if isinstance(request, dict):
+                await _video_request(websocket, viewer, key, request)
+    except (WebSocketDisconnect, Exception):
+        pass
+    finally:
+        await _unwatch(websocket, viewer, key, sender)
+
+
+@app.websocket("/ws/stream/{game_id}")
+async def ws_stream_ingest(websocket: WebSocket, game_id: str):
+    """
+    The game engine connects here and pushes binary keyframes (JPEG) and
+    tile deltas. Bridge immediately fans them out to all /ws/video/{game_id} subscribers.
+    """
+    await _ingest_stream(websocket, game_id, MAIN_FEED)
+
+
+@app.websocket("/ws/stream/{game_id}/{feed}")
+async def ws_stream_feed_ingest(websocket: WebSocket, game_id: str, feed: str):
+    """Extra camera feed of a game (imposter, director, pov-<colour>, ...)."""
+    await _ingest_stream(websocket, game_id, feed)
 
 
 @app.websocket("/ws/video/{game_id}")
 async def ws_video_subscribe(websocket: WebSocket, game_id: str):
-    """Browser connects here to receive raw binary JPEG video frames."""
+    """Browser connects here to receive binary video frames, keyframe first."""
+    await _subscribe_video(websocket, game_id, MAIN_FEED)
+
+
+@app.websocket("/ws/video/{game_id}/{feed}")
+async def ws_video_feed_subscribe(websocket: WebSocket, game_id: str, feed: str):
+    """Browser connects here to watch one camera feed of a game."""
+    await _subscribe_video(websocket, game_id, feed)
+
+
+# ---------------------------------------------------------------------------
+# WebSocket — Topics: many subscriptions over one socket
+# ---------------------------------------------------------------------------
+
+MAX_TOPICS = 64                 # subscriptions per /ws/topics connection
+LOBBY_INTERVAL = 1.0            # at most one LOBBY message per this many seconds
+
+# /ws/topics "lobby" subscribers and "markets:<game>" subscribers
+lobby_subscribers: Dict["TopicSocket", EventSubscriber] = {}
+market_subscribers: Dict[str, Dict["TopicSocket", EventSubscriber]] = defaultdict(dict)
+_lobby_push: Optional[asyncio.TimerHandle] = None
+
+
+class TopicSocket:
+    """
+    One subscription's view of a /ws/topics connection. Sends from all of
+    them go through the connection's lock; a topic set here tags video:
+    binary messages get a stream_format topic tag, text ones a "topic".
+    close() from an event subscription that fell too far behind ends only
+    that subscription (`overflowed`), not the connection.
+    """
+
+    def __init__(self, websocket: WebSocket, lock: asyncio.Lock, topic: Optional[str] = None,
+                 overflowed: Optional[Callable[[], Awaitable[None]]] = None):
+        self.websocket = websocket
+        self.topic = topic
+        self._overflowed = overflowed
+        self._lock = lock
+        self._tag = topic_tag(topic) if topic else b""
+        self._field = f'"topic":{json.dumps(topic)}' if topic else ""
+
+    async def send_text(self, data: str):
+        if self._field:
+            rest = data.lstrip()[1:].lstrip()
+            data = "{" + self._field + ("" if rest.startswith("}") else ",") + rest
+        async with self._lock:
+            await self.websocket.send_text(data)
+
+    async def send_bytes(self, data: bytes):
+        async with self._lock:
+            await self.websocket.send_bytes(self._tag + data)
+
+    async def close(self, code: int = 1000):
+        if self._overflowed is not None:
+            await self._overflowed()
+        else:
+            await self.websocket.close(code=code)
+
+
+def _lobby_message() -> str:
+    return json.dumps({"type": "LOBBY", "games": list_games()})
+
+
+def _lobby_changed():
+    """Schedule a LOBBY message for "lobby" subscribers, coalescing changes."""
+    global _lobby_push
+    if lobby_subscribers and _lobby_push is None:
+        _lobby_push = asyncio.get_running_loop().call_later(LOBBY_INTERVAL, _push_lobby)
+
+
+def _push_lobby():
+    global _lobby_push
+    _lobby_push = None
+    if lobby_subscribers:
+        data = _lobby_message()
+        for subscriber in lobby_subscribers.values():
+            subscriber.push(data)
+
+
+def _markets_changed(game_id: str, snapshot: GameSnapshot, version: int):
+    """Send "markets:<game>" subscribers the markets if an event changed them."""
+    subscribers = market_subscribers.get(game_id)
+    if subscribers and snapshot.markets_version != version:
+        data = snapshot.markets_message()
+        for subscriber in subscribers.values():
+            subscriber.push(data)
+
+
+def _video_topic(rest: str) -> Optional[Tuple[str, str]]:
+    game_id, _, feed = rest.partition("/")
+    return (game_id, feed or MAIN_FEED) if game_id else None
+
+
+class TopicSubscription(NamedTuple):
+    stop: Callable[[], Awaitable[None]]
+    video: Optional[Tuple[TopicSocket, VideoViewer, Tuple[str, str]]] = None
+
+
+async def _subscribe_topic(websocket: WebSocket, lock: asyncio.Lock, topic: str,
+                           request: dict, overflowed: Callable[[str], Awaitable[None]]
+                           ) -> TopicSubscription:
+    """
+    Acknowledge and start one subscription. ValueError for unknown topics.
+    overflowed(topic) ends an event subscription its client fell too far behind on.
+    """
+    kind, _, rest = topic.partition(":")
+    video = _video_topic(rest) if kind == "video" else None
+    if topic != "lobby" and not (kind in ("game", "markets") and rest) and video is None:
+        raise ValueError(f"unknown topic {topic!r}")
+    if video is not None:
+        socket = TopicSocket(websocket, lock, topic)
+    else:
+        socket = TopicSocket(websocket, lock, overflowed=lambda: overflowed(topic))
+    # The acknowledgement goes first, before anything of the topic
+    await TopicSocket(websocket, lock).send_text(json.dumps({"type": "SUBSCRIBED",
+                                                             "topic": topic}))
+
+    if video is not None:
+        viewer = VideoViewer(str(request.get("rendition", AUTO_RENDITION)),
+                             _stream_renditions(*video))
+        sender = await _watch(socket, viewer, video)
+        return TopicSubscription(lambda: _unwatch(socket, viewer, video, sender),
+                                 (socket, viewer, video))
+
+    if topic == "lobby":
+        subscribers = lobby_subscribers
+        backlog = [_lobby_message()]
+    elif kind == "game":
+        subscribers = game_subscribers[rest]
+        since = request.get("since")
+        backlog = await _catch_up(rest, since if isinstance(since, int) else None)
+    else:
+        await _restored(rest)
+        subscribers = market_subscribers[rest]
+        snapshot = game_snapshots.get(rest)
+        backlog = [snapshot.markets_message()] if snapshot is not None else []
+    _, writer = _join_events(socket, subscribers, backlog)
+
+    async def stop():
+        subscribers.pop(socket, None)
+        writer.cancel()
+        for table in (game_subscribers, market_subscribers):
+            if rest in table and not table[rest]:
+                del table[rest]
+    return TopicSubscription(stop)
+
+
+@app.websocket("/ws/topics")
+async def ws_topics(websocket: WebSocket):
+    """
+    One socket for any number of subscriptions, instead of one per game and
+    feed or the /ws firehose. The client sends
+
+      {"op": "subscribe", "topic": "game:<id>", "since": <seq>}   events, as /ws/game
+      {"op": "subscribe", "topic": "markets:<id>"}                MARKETS on every change
+      {"op": "subscribe", "topic": "lobby"}                       LOBBY (the /games list)
+      {"op": "subscribe", "topic": "video:<id>[/<feed>]", "rendition": "auto"}
+      {"op": "unsubscribe", "topic": ...}
+      {"op": "video", "topic": "video:...", "type": "SET_RENDITION" | "VIDEO_STATS" | "REPLAY", ...}
+
+    and gets SUBSCRIBED / UNSUBSCRIBED / ERROR (with "topic") back. Game
+    events, snapshots and markets name their game in game_id; video frames
+    carry a topic tag (stream_format.topic_tag), video text messages a
+    "topic" field. A game, markets or lobby topic the client falls too far
+    behind on is dropped with UNSUBSCRIBED and "reason": "overflow"; the
+    rest carry on, and the client can subscribe again ("since" for a game).
+    """
     await websocket.accept()
-    video_subscribers[game_id].add(websocket)
-    print(f"[VIDEO] Browser subscribed to {game_id} ({len(video_subscribers[game_id])} total)")
+    lock = asyncio.Lock()
+    control = TopicSocket(websocket, lock)
+    subscriptions: Dict[str, TopicSubscription] = {}
+
+    async def reply(kind: str, topic, **extra):
+        await control.send_text(json.dumps({"type": kind, "topic": topic, **extra}))
+
+    async def overflowed(topic: str):
+        # Runs in the topic's own writer task, which stop() cancels: reply first
+        subscription = subscriptions.pop(topic, None)
+        if subscription is not None:
+            await reply("UNSUBSCRIBED", topic, reason="overflow")
+            await subscription.stop()
+
     try:
         while True:
-            await asyncio.sleep(30)
             try:
-                await websocket.send_text('{"type":"PING"}')
-            except Exception:
+                message = await asyncio.wait_for(websocket.receive(), timeout=25)
+            except asyncio.TimeoutError:
+                await control.send_text('{"type":"PING"}')
+                continue
+            if message["type"] == "websocket.disconnect":
                 break
+            try:
+                request = json.loads(message.get("text") or "")
+            except ValueError:
+                continue
+            if not isinstance(request, dict):
+                continue
+            op, topic = request.get("op"), request.get("topic")
+            if not isinstance(topic, str):
+                await reply("ERROR", topic, error="topic missing")
+            elif op == "subscribe":
+                if topic in subscriptions:
+                    await reply("ERROR", topic, error="already subscribed")
+                elif len(subscriptions) >= MAX_TOPICS:
+                    await reply("ERROR", topic, error="too many topics")
+                else:
+                    try:
+                        subscriptions[topic] = await _subscribe_topic(websocket, lock, topic,
+                                                                      request, overflowed)
+                    except ValueError as e:
+                        await reply("ERROR", topic, error=str(e))
+            elif op == "unsubscribe" and topic in subscriptions:
+                await subscriptions.pop(topic).stop()
+                await reply("UNSUBSCRIBED", topic)
+            elif op == "video" and topic in subscriptions and subscriptions[topic].video:
+                await _video_request(*subscriptions[topic].video, request)
+            else:
+                await reply("ERROR", topic, error=f"cannot {op} this topic")
     except (WebSocketDisconnect, Exception):
         pass
     finally:
-        video_subscribers[game_id].discard(websocket)
-        print(f"[VIDEO] Browser unsubscribed from {game_id}")
+        for subscription in list(subscriptions.values()):
+            await subscription.stop()
+
+
+@app.get("/game/{game_id}/feeds")
+def list_feeds(game_id: str):
+    """
+    Camera feeds currently streaming for a game (main first), their
+    operating points and how many viewers watch each rendition.
+    """
+    feeds = sorted(live_feeds.get(game_id, set()), key=lambda f: (f != MAIN_FEED, f))
+    states = stream_states.get(game_id, {})
+    viewers: Dict[str, Dict[str, int]] = {}
+    for f in feeds:
+        counts: Dict[str, int] = defaultdict(int)
+        for viewer in video_subscribers.get((game_id, f), {}).values():
+            counts[viewer.rendition] += 1
+        viewers[f] = dict(counts)
+    return {"game_id": game_id, "feeds": feeds,
+            "stream": {f: states[f] for f in feeds if f in states},
+            "viewers": viewers}
+
+
+@app.get("/game/{game_id}/stream/metrics")
+def stream_metrics_report(game_id: str):
+    """
+    Video pipeline latency per feed, from the frame headers.
+
+    Per rendition: frames received, frames the streamer dropped (seq gaps),
+    capture → bridge lag and encode time. Per viewer: capture → sent lag,
+    throughput, and the capture → painted lag and drops its player reports.
+    All lags are wall-clock differences (same-host or NTP-synced clocks).
+    """
+    feeds = sorted(live_feeds.get(game_id, set()), key=lambda f: (f != MAIN_FEED, f))
+    report = {}
+    for f in feeds:
+        key = (game_id, f)
+        report[f] = {
+            "renditions": {r: st.snapshot() for r, st in stream_metrics.get(key, {}).items()},
+            "viewers": [v.snapshot() for v in video_subscribers.get(key, {}).values()],
+            "replay": {r: ring.snapshot() for r, ring in replay_rings.get(key, {}).items()},
+        }
+    return {"game_id": game_id, "feeds": report}
+
+
+def _thumbnail_frame(game_id: str, feed: str = MAIN_FEED,
+                     rendition: Optional[str] = None) -> Optional[LatestFrames]:
+    """The latest keyframe of a feed, from the smallest rendition unless asked."""
+    renditions = latest_frames.get((game_id, feed), {})
+    for name in ((rendition,) if rendition else tuple(reversed(RENDITIONS))):
+        latest = renditions.get(name)
+        if latest is not None and latest.keyframe is not None:
+            return latest
+    return None
+
+
+def _thumbnail_url(game_id: str) -> Optional[str]:
+    latest = _thumbnail_frame(game_id)
+    if latest is None:
+        return None
+    return f"/game/{game_id}/thumbnail?t={int(latest.keyframe_at)}"   # changes with the picture
+
+
+@app.get("/game/{game_id}/thumbnail")
+def game_thumbnail(game_id: str, feed: str = MAIN_FEED, rendition: Optional[str] = None):
+    """The feed's latest keyframe as an image, straight from the stream (no encoding)."""
+    latest = _thumbnail_frame(game_id, feed, rendition)
+    if latest is None:
+        raise HTTPException(status_code=404, detail="No frame yet")
+    _, image = unpack_frame(latest.keyframe)
+    media_type = "image/png" if image[:4] == b"\x89PNG" else "image/jpeg"
+    return Response(image, media_type=media_type, headers={"Cache-Control": "max-age=2"})
+
+
+@app.get("/game/{game_id}/replay")
+async def replay_clip(game_id: str, feed: str = MAIN_FEED, rendition: str = DEFAULT_RENDITION,
+                at: Optional[float] = None, event: Optional[str] = None,
+                before: float = 5.0, after: float = 2.0):
+    """
+    Instant replay from memory: frames around `at` (Unix time) or the latest
+    `event` (default: the latest KILL / AGENT_EJECTED), as length-prefixed
+    records like /vod clips, starting at a keyframe. (Async: the rings are
+    only touched from the event loop.)
+    """
+    request = {"at": at, "event": event, "before": before, "after": after}
+    moment = _replay_moment(game_id, request)
+    if moment is None:
+        raise HTTPException(status_code=404, detail="Nothing to replay")
+    frames = _replay_clip((game_id, feed), rendition, moment, *_replay_window(request))
+    if not frames:
+        raise HTTPException(status_code=404, detail="Not in the replay buffer")
+    return Response(b"".join(len(f).to_bytes(4, "little") + f for _, f in frames),
+                    media_type="application/octet-stream",
+                    headers={"X-Replay-At": str(moment)})
+
+
+# ---------------------------------------------------------------------------
+# REST — Recorded video (VOD)
+# ---------------------------------------------------------------------------
+
+def _recording_path(game_id: str, feed: str) -> Path:
+    if RECORDING_DIR is None or not valid_name(game_id) or not valid_name(feed):
+        raise HTTPException(status_code=404, detail="Recording not found")
+    return RECORDING_DIR / game_id / feed
+
+
+def _byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """A single "bytes=" range as (start, end inclusive); None for the whole."""
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    first, dash, last = spec.strip().partition("-")
+    try:
+        if unit.strip() != "bytes" or not dash or "," in spec:
+            raise ValueError
+        if first:
+            start, end = int(first), int(last) if last else size - 1
+        else:
+            start, end = size - int(last), size - 1     # suffix: the last N bytes
+    except ValueError:
+        raise HTTPException(status_code=416, detail="Unsupported range",
+                            headers={"Content-Range": f"bytes */{size}"})
+    start, end = max(start, 0), min(end, size - 1)
+    if start > end:
+        raise HTTPException(status_code=416, detail="Range not satisfiable",
+                            headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _read_bytes(path: Path, start: int, length: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(length)
+
+
+@app.get("/vod/{game_id}")
+def list_recordings(game_id: str):
+    """Recorded feeds of a game."""
+    root = _recording_path(game_id, MAIN_FEED).parent
+    feeds = sorted((p.name for p in root.iterdir() if (p / "meta.json").exists()),
+                   key=lambda f: (f != MAIN_FEED, f)) if root.is_dir() else []
+    return {"game_id": game_id, "feeds": feeds}
+
+
+@app.get("/vod/{game_id}/{feed}/index")
+def recording_index(game_id: str, feed: str):
+    """
+    Segments (bytes readable so far) and keyframes of a recording. Each
+    keyframe entry gives the segment and byte offset to start playing from,
+    plus its game tick and capture time.
+    """
+    summary = recording_summary(_recording_path(game_id, feed), recorders.get((game_id, feed)))
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    return summary
+
+
+@app.get("/vod/{game_id}/{feed}/segment/{number}")
+async def recording_segment(game_id: str, feed: str, number: int, request: Request):
+    """
+    One segment file (length u32 | frame records), with Range support for
+    seeking. A segment still being recorded is served up to what is written.
+    """
+    path = _recording_path(game_id, feed)
+    size = segment_lengths(path, recorders.get((game_id, feed))).get(number)
+    if size is None:
+        raise HTTPException(status_code=404, detail="Segment not found")
+    byte_range = _byte_range(request.headers.get("range"), size)
+    start, end = byte_range or (0, size - 1)
+    data = await run_in_threadpool(_read_bytes, path / segment_name(number), start, end - start + 1)
+    headers = {"Accept-Ranges": "bytes", "Cache-Control": "no-cache"}
+    if byte_range is None:
+        return Response(data, media_type="application/octet-stream", headers=headers)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return Response(data, status_code=206, media_type="application/octet-stream",
+                    headers=headers)
+
+
+@app.get("/vod/{game_id}/{feed}/clip")
+async def recording_clip(game_id: str, feed: str, start: float, end: float):
+    """
+    Frames captured between two Unix times as length-prefixed records (the
+    segment format), from the keyframe before `start` so the clip plays on
+    its own.
+    """
+    if end < start:
+        raise HTTPException(status_code=400, detail="end is before start")
+    path = _recording_path(game_id, feed)
+    live = recorders.get((game_id, feed))
+
+    def collect() -> bytes:
+        return b"".join(len(frame).to_bytes(4, "little") + frame
+                        for frame in read_clip(path, start, end, live))
+
+    data = await run_in_threadpool(collect)
+    if not data:
+        raise HTTPException(status_code=404, detail="Nothing recorded in that window")
+    return Response(data, media_type="application/octet-stream")
+
+
+# ---------------------------------------------------------------------------
+# Housekeeping — forgetting finished games
+# ---------------------------------------------------------------------------
+
+GAME_TTL = seconds_from_env("SUS_GAME_TTL", 600.0)
+GAME_IDLE_TTL = seconds_from_env("SUS_GAME_IDLE_TTL", 3600.0)
+EVICT_INTERVAL = 30.0
+_next_eviction = 0.0
+
+
+def _known_games() -> Set[str]:
+    return {*active_games, *event_history, *last_activity,
+            *(game_id for game_id, _ in latest_frames)}
+
+
+def _game_expired(game_id: str, now: float) -> bool:
+    if live_feeds.get(game_id):
+        return False
+    proc = game_processes.get(game_id)
+    if proc is not None and proc.poll() is None:
+        return False
+    # A TTL of 0 (or empty) never evicts for that reason
+    ended_at = active_games.get(game_id, {}).get("ended_at")
+    if GAME_TTL and ended_at is not None and now - ended_at >= GAME_TTL:
+        return True
+    return bool(GAME_IDLE_TTL) and now - last_activity.get(game_id, 0.0) >= GAME_IDLE_TTL
+
+
+def _evict_game(game_id: str):
+    """Drop everything kept about a game; connected clients keep their sockets."""
+    for table in (active_games, event_history, event_seq, game_snapshots, last_activity,
+                  ingest_marks, emitter_backlog, live_feeds, stream_states, game_processes):
+        table.pop(game_id, None)
+    marks_loaded.discard(game_id)
+    if not game_subscribers.get(game_id):
+        game_subscribers.pop(game_id, None)
+    for table in (latest_frames, stream_metrics, replay_rings, _broken_renditions,
+                  remote_demand, _sent_demand):
+        for key in [key for key in table if key[0] == game_id]:
+            del table[key]
+    for key in [key for key, viewers in video_subscribers.items()
+                if key[0] == game_id and not viewers]:
+        del video_subscribers[key]
+    _lobby_changed()
+    print(f"[BRIDGE] Evicted finished game {game_id}")
+
+
+def evict_finished_games(now: Optional[float] = None, force: bool = False) -> List[str]:
+    """
+    Forget games that ended more than GAME_TTL ago, or went GAME_IDLE_TTL
+    without events or video, unless something still streams or runs. Runs
+    at most every EVICT_INTERVAL (callers are the ingest, /health and
+    _evict_periodically).
+    """
+    global _next_eviction
+    now = time.time() if now is None else now
+    if not force and now < _next_eviction:
+        return []
+    _next_eviction = now + EVICT_INTERVAL
+    _end_silent_feeds(now)
+    expired = [game_id for game_id in _known_games() if _game_expired(game_id, now)]
+    for game_id in expired:
+        _evict_game(game_id)
+    return expired
+
+
+async def _evict_periodically():
+    """Evict every EVICT_INTERVAL, so a bridge that has gone quiet still forgets games."""
+    while True:
+        await asyncio.sleep(EVICT_INTERVAL)
+        try:
+            evict_finished_games(force=True)
+        except Exception as e:
+            print(f"[BRIDGE] Eviction failed: {e}")
+
+
+def _game_memory(game_id: str) -> dict:
+    """Bytes held for a game: event payloads and cached video, not Python overhead."""
+    history = event_history.get(game_id, ())
+    replay = sum(ring.bytes for (g, _), rings in replay_rings.items() if g == game_id
+                 for ring in rings.values())
+    latest = sum(len(latest.keyframe or b"") + sum(len(f) for f in latest.frames[1:])
+                 for (g, _), renditions in latest_frames.items() if g == game_id
+                 for latest in renditions.values())
+    subscribers = game_subscribers.get(game_id, {})
+    return {
+        "status": active_games.get(game_id, {}).get("status"),
+        "last_seq": event_seq.get(game_id, 0),
+        "history_events": len(history),
+        "history_bytes": sum(len(event.data) for event in history),
+        "replay_bytes": replay,
+        "latest_frame_bytes": latest,
+        "event_subscribers": len(subscribers),
+        "pending_events": sum(sub.pending for sub in subscribers.values()),
+        "video_viewers": sum(len(v) for (g, _), v in video_subscribers.items() if g == game_id),
+        "idle_s": round(time.time() - last_activity[game_id], 1)
+        if game_id in last_activity else None,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -344,8 +2253,21 @@ async def ws_video_subscribe(websocket: WebSocket, game_id: str):
 # ---------------------------------------------------------------------------
 
 @app.get("/health")
-def health():
-    return {"status": "ok", "games": len(active_games)}
+async def health():
+    evict_finished_games()
+    subscribers = [*legacy_subscribers.values(),
+                   *(sub for subs in game_subscribers.values() for sub in subs.values())]
+    memory = {game_id: _game_memory(game_id) for game_id in sorted(_known_games())}
+    return {"status": "ok", "games": len(active_games),
+            "event_fanout": {**fanout_stats, "subscribers": len(subscribers),
+                             "pending": sum(sub.pending for sub in subscribers)},
+            "event_store": event_store.stats() if event_store is not None else None,
+            "pubsub": pubsub.stats(),
+            "ingest": {**ingest_stats, "lag": ingest_lag.snapshot(),
+                       "emitter_backlog": dict(emitter_backlog)},
+            "memory": {"games": memory,
+                       "total_bytes": sum(m["history_bytes"] + m["replay_bytes"] +
+                                          m["latest_frame_bytes"] for m in memory.values())}}
 
 
 # ---------------------------------------------------------------------------
@@ -363,4 +2285,20 @@ if __name__ == "__main__":
     print("  Among Us: ws://localhost:8000/ws/video/game-001")
     print("  Chess:    ws://localhost:8000/ws/video/game-002")
     print("=" * 50)
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="warning")
+    workers = int(os.environ.get("SUS_BRIDGE_WORKERS", "1") or 1)
+    if workers <= 1:
+        uvicorn.run(app, host="0.0.0.0", port=8000, log_level="warning")
+    else:
+        broker = None
+        if isinstance(pubsub, MemoryPubSub):
+            # Workers are separate processes: start a broker and point them at it
+            socket_path = os.path.join(tempfile.gettempdir(), "sus-bridge.sock")
+            broker = subprocess.Popen([sys.executable, str(Path(__file__).with_name("pubsub.py")),
+                                       socket_path])
+            os.environ["SUS_PUBSUB"] = f"unix:{socket_path}"
+        try:
+            uvicorn.run("bridge_server:app", host="0.0.0.0", port=8000, log_level="warning",
+                        workers=workers)
+        finally:
+            if broker is not None:
+                broker.terminate()
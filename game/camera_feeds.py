@@ -0,0 +1,104 @@
+"""
+Camera feeds — several viewports rendered from one simulation.
+
+The main feed is the one the local spectator steers (TAB / 1-9). Extra
+feeds are listed in SUS_CAMERA_FEEDS (comma separated):
+
+  imposter      — always follows the imposter
+  director      — cuts to the action (kills, meetings) and otherwise
+                  rotates between alive agents
+  pov-<colour>  — follows one agent, e.g. pov-blue
+  pov-all       — one pov feed per agent in the match
+
+Each feed is drawn into its own stream-resolution surface every time it
+is due and streamed under its own feed id (/ws/video/{game_id}/{feed}).
+The map and sprite images are scaled once per render scale and shared by
+every feed, so an extra viewpoint costs one blit pass, not a new process.
+"""
+from __future__ import annotations
+
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame as pg
+
+MAIN_FEED = "main"
+FIXED_FEEDS = ("imposter", "director")
+POV_PREFIX = "pov-"
+
+
+def pov_feed(colour: str) -> str:
+    return POV_PREFIX + colour.lower()
+
+
+def feed_ids_from_env(colours: Iterable[str], value: Optional[str] = None) -> List[str]:
+    """
+    Resolve the extra feed ids requested by SUS_CAMERA_FEEDS.
+
+    Unknown names are ignored; the main feed is always implied and never
+    returned. Order follows the request, duplicates are dropped.
+    """
+    if value is None:
+        value = os.environ.get("SUS_CAMERA_FEEDS", "")
+    colours = list(colours)
+    known_pov = {pov_feed(c) for c in colours}
+    feeds: List[str] = []
+    for name in (part.strip().lower() for part in value.split(",")):
+        if name == "pov-all":
+            wanted = [pov_feed(c) for c in colours]
+        elif name in FIXED_FEEDS or name in known_pov:
+            wanted = [name]
+        else:
+            wanted = []
+        feeds.extend(f for f in wanted if f not in feeds)
+    return feeds
+
+
+class ScaledAssets:
+    """Map and sprite images at a given render scale, shared by all feeds."""
+
+    def __init__(self, map_img: pg.Surface):
+        self._maps: Dict[float, pg.Surface] = {1.0: map_img}
+        self._images: Dict[Tuple[pg.Surface, float], pg.Surface] = {}
+
+    def map_image(self, scale: float) -> pg.Surface:
+        scaled = self._maps.get(scale)
+        if scaled is None:
+            base = self._maps[1.0]
+            w, h = base.get_size()
+            scaled = pg.transform.smoothscale(base, (int(w * scale), int(h * scale)))
+            self._maps[scale] = scaled
+        return scaled
+
+    def image(self, image: pg.Surface, scale: float) -> pg.Surface:
+        if scale == 1:
+            return image
+        key = (image, scale)
+        scaled = self._images.get(key)
+        if scaled is None:
+            w, h = image.get_size()
+            scaled = pg.transform.smoothscale(
+                image, (max(1, int(w * scale)), max(1, int(h * scale))))
+            self._images[key] = scaled
+        return scaled
+
+
+class CameraFeed:
+    """One viewport: its target surface, camera, render scale and HUD fonts."""
+
+    def __init__(self, feed_id: str, surface: pg.Surface, camera, scale: float,
+                 font_file: str):
+        self.feed_id = feed_id
+        self.surface = surface
+        self.camera = camera
+        self.scale = scale
+        self.width, self.height = surface.get_size()
+        self.font = pg.font.Font(font_file, self.px(22))
+        self.font_sm = pg.font.Font(font_file, self.px(16))
+        self.font_lg = pg.font.Font(font_file, self.px(42))
+        self.dim = pg.Surface(surface.get_size(), pg.SRCALPHA)
+        self.dim.fill((0, 0, 0, 180))
+
+    def px(self, n) -> int:
+        """Scale a HUD length laid out for the full-size window."""
+        return int(n * self.scale)
@@ -0,0 +1,193 @@
+"""
+Event store — every numbered game event, appended to SQLite as it goes out.
+
+The bridge keeps only the last HISTORY_LIMIT events of a game in memory
+and forgets finished games. EventStore keeps all of them, across bridge
+restarts, for history queries and export:
+
+  events(game_id, seq, type, timestamp, data)
+    primary key (game_id, seq), index (game_id, type, seq)
+
+`data` is the event exactly as it was sent to subscribers ("seq"
+included), so reads hand it out without re-encoding.
+
+Writes never touch the event loop: append() queues the event and a writer
+thread commits whatever has queued up in one transaction (group commit),
+so a burst of events costs one fsync. The database runs in WAL mode, so
+readers (the /game/{id}/events endpoints, in the threadpool) don't block
+the writer.
+
+Enable with SUS_EVENT_STORE (default "events.db", empty/"off" disables).
+"""
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+BATCH_EVENTS = 1000     # most events committed in one transaction
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    game_id   TEXT    NOT NULL,
+    seq       INTEGER NOT NULL,
+    type      TEXT    NOT NULL,
+    timestamp REAL    NOT NULL,
+    data      TEXT    NOT NULL,
+    PRIMARY KEY (game_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS events_by_type ON events (game_id, type, seq);
+"""
+
+
+def event_store_path_from_env() -> Optional[Path]:
+    """Read SUS_EVENT_STORE; None when the store is off."""
+    value = os.environ.get("SUS_EVENT_STORE", "events.db").strip()
+    if not value or value.lower() in {"off", "0", "false", "no"}:
+        return None
+    return Path(value)
+
+
+class StoredEvent(NamedTuple):
+    game_id: str
+    seq: int
+    type: str
+    timestamp: float
+    data: str
+
+
+class EventStore:
+    """Appends events from the bridge and answers queries about them."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self._local = threading.local()     # one reading connection per thread
+        db = self._connect()
+        db.executescript(_SCHEMA)
+        # Where each game's numbering continues after a restart
+        self._last_seq: Dict[str, int] = dict(
+            db.execute("SELECT game_id, MAX(seq) FROM events GROUP BY game_id"))
+        db.close()
+        self._q: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._run, daemon=True, name="EventStore")
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")     # power loss may cost the last commits
+        return db
+
+    # ------------------------------------------------------------------
+    # Live side (bridge event loop)
+    # ------------------------------------------------------------------
+
+    def append(self, event: StoredEvent):
+        """Queue one event for the writer; never blocks."""
+        self._last_seq[event.game_id] = event.seq
+        self._q.put(event)
+
+    def last_seq(self, game_id: str) -> int:
+        """Seq of the game's last event, stored or queued (0 for none)."""
+        return self._last_seq.get(game_id, 0)
+
+    @property
+    def pending(self) -> int:
+        return self._q.qsize()
+
+    def stats(self) -> dict:
+        return {"written": self.written, "batches": self.batches, "pending": self.pending,
+                "errors": self.errors}
+
+    def flush(self, timeout: float = 10) -> bool:
+        """Wait until everything queued so far is committed (blocks)."""
+        committed = threading.Event()
+        self._q.put(committed)
+        return committed.wait(timeout)
+
+    def close(self):
+        """Commit everything queued and stop the writer (blocks)."""
+        self._q.put(None)
+        self._writer.join(timeout=10)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        db = self._connect()
+        try:
+            while True:
+                batch = [self._q.get()]
+                while batch[-1] is not None and len(batch) < BATCH_EVENTS:
+                    try:
+                        batch.append(self._q.get_nowait())
+                    except queue.Empty:
+                        break
+                done = batch[-1] is None
+                events = [event for event in batch if isinstance(event, StoredEvent)]
+                if events:
+                    self._write(db, events)
+                for flushed in batch:
+                    if isinstance(flushed, threading.Event):
+                        flushed.set()
+                if done:
+                    return
+        finally:
+            db.close()
+
+    def _write(self, db: sqlite3.Connection, events: List[StoredEvent]):
+        try:
+            with db:
+                db.executemany("INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?)", events)
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"[EVENTS] Could not store {len(events)} events: {e}")
+            return
+        self.written += len(events)
+        self.batches += 1
+
+    # ------------------------------------------------------------------
+    # Reading (any thread but the event loop)
+    # ------------------------------------------------------------------
+
+    def _reader(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = self._connect()
+        return db
+
+    def query(self, game_id: str, after: int = 0, limit: int = 100,
+              types: Iterable[str] = ()) -> List[StoredEvent]:
+        """Events of a game with seq > `after`, oldest first, optionally of some types."""
+        types = list(types)
+        sql = "SELECT game_id, seq, type, timestamp, data FROM events WHERE game_id = ? AND seq > ?"
+        if types:
+            sql += f" AND type IN ({','.join('?' * len(types))})"
+        sql += " ORDER BY seq LIMIT ?"
+        rows = self._reader().execute(sql, (game_id, after, *types, limit))
+        return [StoredEvent(*row) for row in rows]
+
+    def emitter_marks(self, game_id: str) -> Dict[str, int]:
+        """The highest emit_seq stored from each GameEmitter of a game."""
+        rows = self._reader().execute(
+            "SELECT json_extract(data, '$.emitter') AS emitter,"
+            " MAX(json_extract(data, '$.emit_seq')) FROM events"
+            " WHERE game_id = ? AND emitter IS NOT NULL GROUP BY emitter", (game_id,))
+        return {emitter: seq for emitter, seq in rows if isinstance(seq, int)}
+
+    def games(self) -> List[dict]:
+        """Every stored game: event count, seq range and time span."""
+        rows = self._reader().execute(
+            "SELECT game_id, COUNT(*), MIN(seq), MAX(seq), MIN(timestamp), MAX(timestamp)"
+            " FROM events GROUP BY game_id ORDER BY MAX(timestamp) DESC")
+        return [{"game_id": game_id, "events": count, "first_seq": first, "last_seq": last,
+                 "started_at": start, "last_event_at": end}
+                for game_id, count, first, last, start, end in rows]
@@ -6,19 +6,48 @@ and pumps raw binary JPEG frames at up to 25 FPS.
 
 No base64, no HTTP overhead — the bridge receives bytes and immediately
 forwards them to all browser /ws/video/{game_id} subscribers.
+
+Extra camera feeds of the same game stream on /ws/stream/{game_id}/{feed}
+and are watched on /ws/video/{game_id}/{feed}.
+
+With SUS_STREAM_DELTA on (the default) only tiles that changed since the
+previous frame are re-encoded and sent, with periodic full keyframes; see
+stream_format for the wire format.
+
+Each captured frame is encoded into the renditions listed in
+SUS_STREAM_RENDITIONS (default high,medium,low) in parallel; the bridge
+gives every viewer the rendition it asked for or one matched to its
+connection.
+
+The bridge reports demand back on the same socket (DEMAND text messages:
+viewer count, renditions in use, renditions needing a keyframe). Only
+watched renditions are encoded; with no viewers at all the streamer drops
+to one low frame every IDLE_FRAME_INTERVAL, and the game can skip drawing
+the feed (wants_frame).
 """
 
 import io
+import json
 import os
 import queue
 import threading
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import pygame
 
+from stream_format import (
+    DEFAULT_RENDITION,
+    RENDITIONS,
+    is_delta,
+    pack_delta,
+    pack_frame_header,
+    pack_rendition,
+)
+
 try:
-    from PIL import Image
+    from PIL import Image, ImageChops
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
@@ -32,75 +61,515 @@ STREAM_HEIGHT = 450
 JPEG_QUALITY  = 72          # Good balance: quality vs. bandwidth
 TARGET_FPS    = 25          # Frames per second (game runs at 60 fps)
 FRAME_INTERVAL = 1.0 / TARGET_FPS
+IDLE_FRAME_INTERVAL = 5.0   # Nobody watching: keep one fresh low frame this often
+
+
+class StreamPoint(NamedTuple):
+    width: int
+    height: int
+    fps: int
+    quality: int
+
+
+# Operating points, best first. The controller walks this ladder one rung
+# at a time: frame rate and quality give way before resolution does.
+STREAM_LADDER = (
+    StreamPoint(STREAM_WIDTH, STREAM_HEIGHT, TARGET_FPS, JPEG_QUALITY),
+    StreamPoint(800, 450, 20, 62),
+    StreamPoint(640, 360, 20, 58),
+    StreamPoint(640, 360, 15, 50),
+    StreamPoint(480, 270, 12, 45),
+    StreamPoint(320, 180, 8, 40),
+)
+
+
+class StreamController:
+    """
+    Picks the stream operating point from backpressure.
+
+    Encode time, send time and dropped frames are collected per WINDOW.
+    A window with drops, or where encoding or sending eats more than
+    STEP_DOWN_LOAD of the frame budget, steps one rung down the ladder;
+    UPGRADE_AFTER seconds of windows below STEP_UP_LOAD step one rung up.
+    """
+
+    WINDOW = 1.0
+    STEP_DOWN_LOAD = 0.85
+    STEP_UP_LOAD = 0.5
+    UPGRADE_AFTER = 5.0
+    REPORT_INTERVAL = 5.0
+
+    def __init__(self, ladder=STREAM_LADDER, level: int = 0):
+        self.ladder = ladder
+        self.level = level
+        self._lock = threading.Lock()
+        now = time.monotonic()
+        self._window_start = now
+        self._headroom_since = now
+        self._last_report = None
+        self._encode = [0.0, 0]     # total seconds, count
+        self._send = [0.0, 0]
+        self._drops = 0
+        self._last = {"encode_ms": 0.0, "send_ms": 0.0, "drops": 0}
+
+    @property
+    def point(self) -> StreamPoint:
+        return self.ladder[self.level]
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.point.fps
+
+    def record_encode(self, seconds: float):
+        with self._lock:
+            self._encode[0] += seconds
+            self._encode[1] += 1
+
+    def record_send(self, seconds: float):
+        with self._lock:
+            self._send[0] += seconds
+            self._send[1] += 1
+
+    def record_drop(self):
+        with self._lock:
+            self._drops += 1
+
+    def evaluate(self, now: Optional[float] = None) -> bool:
+        """Close the window if it is due; return True if the level moved."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if now - self._window_start < self.WINDOW:
+                return False
+            encode = self._encode[0] / self._encode[1] if self._encode[1] else 0.0
+            send = self._send[0] / self._send[1] if self._send[1] else 0.0
+            drops = self._drops
+            self._last = {"encode_ms": round(encode * 1000, 1),
+                          "send_ms": round(send * 1000, 1), "drops": drops}
+            self._encode = [0.0, 0]
+            self._send = [0.0, 0]
+            self._drops = 0
+            self._window_start = now
+
+            load = max(encode, send) / self.interval
+            old = self.level
+            if drops or load > self.STEP_DOWN_LOAD:
+                self.level = min(self.level + 1, len(self.ladder) - 1)
+                self._headroom_since = now
+            elif load >= self.STEP_UP_LOAD:
+                self._headroom_since = now
+            elif self.level > 0 and now - self._headroom_since >= self.UPGRADE_AFTER:
+                self.level -= 1
+                self._headroom_since = now
+            return self.level != old
+
+    def snapshot(self) -> dict:
+        p = self.point
+        return {"level": self.level, "width": p.width, "height": p.height,
+                "fps": p.fps, "quality": p.quality, **self._last}
+
+    def pop_report(self, now: Optional[float] = None, changed: bool = False) -> Optional[dict]:
+        """The operating point, when it changed or REPORT_INTERVAL elapsed."""
+        now = time.monotonic() if now is None else now
+        if (not changed and self._last_report is not None
+                and now - self._last_report < self.REPORT_INTERVAL):
+            return None
+        self._last_report = now
+        return self.snapshot()
+
+
+# Fixed renditions as (width, height, JPEG quality); DEFAULT_RENDITION
+# follows the StreamController ladder instead. Frames are captured at the
+# largest enabled size (capture_size); no rendition is encoded larger than
+# the captured frame, and "low" never above the default.
+FIXED_RENDITIONS = {
+    "high": (1280, 720, 85),
+    "low": (480, 270, 45),
+}
+
+
+def stream_renditions_from_env(value: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Read SUS_STREAM_RENDITIONS (comma separated, e.g. "medium,low").
+
+    Unknown names are ignored; the default rendition is always included.
+    Result is ordered best first, like RENDITIONS.
+    """
+    if value is None:
+        value = os.environ.get("SUS_STREAM_RENDITIONS", ",".join(RENDITIONS))
+    wanted = {part.strip().lower() for part in value.split(",")}
+    wanted.add(DEFAULT_RENDITION)
+    return tuple(r for r in RENDITIONS if r in wanted)
+
+
+def capture_size(renditions: Optional[Tuple[str, ...]] = None) -> Tuple[int, int]:
+    """
+    Size to draw stream frames at: that of the largest rendition encoded.
+
+    Renditions are never scaled up, so with "high" enabled frames are drawn
+    at its size and every other rendition is downscaled from them.
+    """
+    if renditions is None:
+        renditions = stream_renditions_from_env() if PIL_AVAILABLE else (DEFAULT_RENDITION,)
+    sizes = [FIXED_RENDITIONS[r][:2] if r in FIXED_RENDITIONS else (STREAM_WIDTH, STREAM_HEIGHT)
+             for r in renditions]
+    return max(sizes, default=(STREAM_WIDTH, STREAM_HEIGHT))
+
+
+def stream_delta_enabled(default: bool = True) -> bool:
+    """Read SUS_STREAM_DELTA (off/0/false/no sends full JPEG frames only)."""
+    value = os.environ.get("SUS_STREAM_DELTA", "").strip().lower()
+    if value in {"off", "0", "false", "no"}:
+        return False
+    if value in {"on", "1", "true", "yes"}:
+        return True
+    return default
+
+
+class TileDeltaEncoder:
+    """
+    Turns a sequence of Pillow frames into keyframes and tile deltas.
+
+    The frame is cut into a GRID of tiles and compared with the previous
+    frame (one ImageChops.difference, then a bounding-box test per tile
+    inside the changed area); only changed tiles are JPEG-encoded. Nothing
+    at all is sent for an unchanged frame. A full keyframe goes out every
+    KEYFRAME_INTERVAL seconds, when the size changes, when more than
+    KEYFRAME_RATIO of the tiles changed, or after request_keyframe().
+    """
+
+    GRID = (16, 9)              # 50 px tiles at 800x450; whole tiles on every rung
+    KEYFRAME_INTERVAL = 2.0
+    KEYFRAME_RATIO = 0.6
+
+    def __init__(self):
+        self._size = None
+        self._boxes: list = []
+        self._previous = None
+        self._last_keyframe = 0.0
+        self._force_keyframe = True
+
+    def request_keyframe(self):
+        self._force_keyframe = True
+
+    def _tile_boxes(self, size):
+        if size != self._size:
+            w, h = size
+            cols, rows = self.GRID
+            xs = [w * i // cols for i in range(cols + 1)]
+            ys = [h * j // rows for j in range(rows + 1)]
+            self._boxes = [(xs[i], ys[j], xs[i + 1], ys[j + 1])
+                           for j in range(rows) for i in range(cols)]
+            self._size = size
+            self._previous = None
+        return self._boxes
+
+    def _changed_tiles(self, previous, img) -> list:
+        diff = ImageChops.difference(previous, img)
+        bbox = diff.getbbox()
+        if bbox is None:
+            return []
+        left, top, right, bottom = bbox
+        return [box for box in self._boxes
+                if box[0] < right and box[2] > left and box[1] < bottom and box[3] > top
+                and diff.crop(box).getbbox() is not None]
+
+    def encode(self, img, quality: int, now: Optional[float] = None) -> Optional[bytes]:
+        """Keyframe JPEG, delta message, or None when nothing changed."""
+        now = time.monotonic() if now is None else now
+        boxes = self._tile_boxes(img.size)
+        previous, self._previous = self._previous, img
+
+        keyframe_due = (previous is None or self._force_keyframe
+                        or now - self._last_keyframe >= self.KEYFRAME_INTERVAL)
+        if not keyframe_due:
+            changed = self._changed_tiles(previous, img)
+            if not changed:
+                return None
+            if len(changed) <= self.KEYFRAME_RATIO * len(boxes):
+                return pack_delta(img.size, [
+                    (box[0], box[1], box[2] - box[0], box[3] - box[1],
+                     _jpeg(img.crop(box), quality))
+                    for box in changed])
+
+        self._force_keyframe = False
+        self._last_keyframe = now
+        return _jpeg(img, quality)
+
+
+def _jpeg(img, quality: int) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=quality, optimize=False)
+    return buf.getvalue()
+
+
+# Pillow raw decoder mode for 32-bit surfaces, keyed by (R, G, B) shifts.
+# Lets the encoder read the surface's own pixel bytes without converting.
+_RAW_MODES = {
+    (16, 8, 0): "BGRX",
+    (0, 8, 16): "RGBX",
+}
+
+
+def _put_latest(q: queue.Queue, item) -> bool:
+    """
+    Enqueue without blocking; if the queue is full the oldest item goes.
+
+    Returns True when an item had to be dropped.
+    """
+    try:
+        q.put_nowait(item)
+        return False
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            q.put_nowait(item)
+        except queue.Full:
+            pass
+        return True
 
 
 class FrameStreamer:
     """
-    Background thread that captures pygame Surface frames and streams
-    them over a persistent WebSocket to the bridge as raw binary JPEGs.
+    Captures pygame Surface frames and streams them over a persistent
+    WebSocket to the bridge as raw binary JPEGs.
+
+    The game thread only copies the pixels once (submit); an encoder thread
+    turns them into JPEG — Pillow releases the GIL while encoding, so this
+    overlaps with the next tick — and a sender thread owns the socket.
+
+    Resolution, frame rate and JPEG quality follow a StreamController that
+    reacts to encode time, send time and dropped frames; the operating
+    point is reported to the bridge as a STREAM_STATE text message.
+
+    Every rendition of a frame is encoded on its own worker thread and the
+    set is sent together, each message tagged with its rendition and
+    carrying a frame header (per-rendition seq, game tick, capture time,
+    encode time) for latency and drop measurement downstream.
     """
 
-    def __init__(self, game_id: str = "game-001"):
+    def __init__(self, game_id: str = "game-001", feed: str = "main"):
         self.game_id = game_id
-        self._q: queue.Queue = queue.Queue(maxsize=4)  # Drop stale frames if slow
+        self.feed = feed
+        self._raw_q: queue.Queue = queue.Queue(maxsize=1)  # Latest captured frame wins
+        self._q: queue.Queue = queue.Queue(maxsize=4)      # Drop stale frames if slow
         self._stopped = False
         self._last_capture = 0.0
-        self._worker = threading.Thread(target=self._run, daemon=True, name="FrameStreamer")
+        self.controller = StreamController()
+        # Without Pillow frames are PNGs at the default rendition only
+        self.renditions = stream_renditions_from_env() if PIL_AVAILABLE else (DEFAULT_RENDITION,)
+        self._delta: Dict[str, TileDeltaEncoder] = {}
+        if PIL_AVAILABLE and stream_delta_enabled():
+            self._delta = {r: TileDeltaEncoder() for r in self.renditions}
+        self._seq: Dict[str, int] = {}   # last frame seq sent per rendition
+        # Renditions the bridge's viewers use; None until it says (encode all)
+        self._demand: Optional[Tuple[str, ...]] = None
+        self._pool = (ThreadPoolExecutor(max_workers=len(self.renditions),
+                                         thread_name_prefix=f"FrameRendition-{feed}")
+                      if len(self.renditions) > 1 else None)
+        self._encoder = threading.Thread(target=self._encode_loop, daemon=True,
+                                         name=f"FrameEncoder-{feed}")
+        self._worker = threading.Thread(target=self._run, daemon=True, name=f"FrameStreamer-{feed}")
+        self._encoder.start()
         self._worker.start()
 
-    def submit(self, surface: pygame.Surface):
-        """Call from the game draw loop each frame. Rate-limited to TARGET_FPS."""
+    def capture_interval(self) -> float:
+        """Seconds between captures: the operating point's, or idle while unwatched."""
+        return IDLE_FRAME_INTERVAL if self._demand == () else self.controller.interval
+
+    def wants_frame(self) -> bool:
+        """Whether the next submit() would capture; lets the game skip drawing."""
+        return time.monotonic() - self._last_capture >= self.capture_interval()
+
+    def frame_due(self) -> bool:
+        """Rate limiter for the current frame rate."""
         now = time.monotonic()
-        if now - self._last_capture < FRAME_INTERVAL:
-            return
+        if now - self._last_capture < self.capture_interval():
+            return False
         self._last_capture = now
+        return True
 
-        try:
-            jpeg = self._to_jpeg(surface)
-        except Exception:
+    def apply_demand(self, viewers: int, renditions=(), keyframe=()):
+        """
+        Follow the bridge's DEMAND report.
+
+        Renditions nobody watches stop being encoded; newly watched ones and
+        those listed in `keyframe` restart from a keyframe, captured on the
+        next submit() rather than at the next rate-limited slot.
+        """
+        wanted = tuple(r for r in self.renditions if r in renditions) if viewers else ()
+        if viewers and not wanted:
+            wanted = (DEFAULT_RENDITION,)
+        previous, self._demand = self._demand, wanted
+        restart = (set(wanted) - set(previous or ())) | (set(keyframe) & set(wanted))
+        for rendition in restart:
+            delta = self._delta.get(rendition)
+            if delta is not None:
+                delta.request_keyframe()
+        if restart:
+            self._last_capture = 0.0
+
+    def _active_renditions(self) -> Tuple[str, ...]:
+        demand = self._demand
+        if demand is None:
+            return self.renditions
+        return demand or self.renditions[-1:]   # unwatched: the lowest only
+
+    def submit(self, surface: pygame.Surface, tick: int = 0):
+        """Call from the game draw loop each frame. Rate-limited to the current FPS."""
+        if not self.frame_due():
             return
 
         try:
-            self._q.put_nowait(jpeg)
-        except queue.Full:
-            # Drop oldest, enqueue newest
-            try:
-                self._q.get_nowait()
-            except queue.Empty:
-                pass
-            try:
-                self._q.put_nowait(jpeg)
-            except queue.Full:
-                pass
+            frame = (self._capture(surface), tick, time.time())
+        except Exception:
+            return
+        if _put_latest(self._raw_q, frame):
+            self.controller.record_drop()
 
     def close(self):
         self._stopped = True
-        try:
-            self._q.put_nowait(None)  # Sentinel to unblock worker
-        except queue.Full:
-            pass
+        _put_latest(self._raw_q, None)  # Sentinel — the encoder passes it on
+        self._encoder.join(timeout=3)
         self._worker.join(timeout=3)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
 
     # ------------------------------------------------------------------
     # Frame capture (on game/main thread)
     # ------------------------------------------------------------------
 
-    def _to_jpeg(self, surface: pygame.Surface) -> bytes:
-        if surface.get_width() != STREAM_WIDTH or surface.get_height() != STREAM_HEIGHT:
-            scaled = pygame.transform.smoothscale(surface, (STREAM_WIDTH, STREAM_HEIGHT))
+    def _capture(self, surface: pygame.Surface) -> tuple:
+        """
+        Copy the frame's pixels once and return (data, size, rawmode, stride).
+
+        32-bit surfaces are copied straight out of the surface buffer in
+        their native layout; scaling to the operating point's resolution
+        happens on the encoder thread.
+        """
+        rawmode = None
+        if PIL_AVAILABLE and surface.get_bitsize() == 32:
+            rawmode = _RAW_MODES.get(surface.get_shifts()[:3])
+        if rawmode is not None:
+            return surface.get_buffer().raw, surface.get_size(), rawmode, surface.get_pitch()
+        return pygame.image.tobytes(surface, "RGB"), surface.get_size(), "RGB", 0
+
+    # ------------------------------------------------------------------
+    # Background encoder thread
+    # ------------------------------------------------------------------
+
+    def _encode_loop(self):
+        while True:
+            frame = self._raw_q.get()
+            if frame is None:
+                _put_latest(self._q, None)
+                return
+            pixels, tick, captured_at = frame
+            started = time.monotonic()
+            try:
+                encoded = self._encode(*pixels)
+            except Exception:
+                continue
+            elapsed = time.monotonic() - started
+            self.controller.record_encode(elapsed)
+            if not encoded:
+                continue            # unchanged frame — nothing to send
+            encode_us = int(elapsed * 1e6)
+            messages = []
+            for rendition, payload in encoded:
+                seq = self._seq[rendition] = self._seq.get(rendition, 0) + 1
+                messages.append((rendition, pack_frame_header(seq, tick, captured_at, encode_us),
+                                 payload))
+            # A dropped item shows up as a seq gap downstream
+            if self._enqueue(messages):
+                self.controller.record_drop()
+                self._request_keyframes()   # the dropped frame may have held deltas
+            self.controller.evaluate()
+
+    def _enqueue(self, messages: list) -> bool:
+        """
+        Queue one frame's messages for the sender; True if frames were dropped.
+
+        When the queue is full the oldest frame goes, and with it every
+        queued delta of the same rendition up to that rendition's next
+        keyframe: they were encoded against the dropped frame and would
+        paint a corrupt picture.
+        """
+        try:
+            self._q.put_nowait(messages)
+            return False
+        except queue.Full:
+            pass
+        queued = []
+        while True:
+            try:
+                queued.append(self._q.get_nowait())
+            except queue.Empty:
+                break
+            self._q.task_done()
+        queued.append(messages)
+        broken = {rendition for rendition, _, _ in queued.pop(0)}
+        for frame in queued:
+            kept = []
+            for message in frame:
+                rendition, _, payload = message
+                if rendition in broken:
+                    if is_delta(payload):
+                        continue
+                    broken.discard(rendition)
+                kept.append(message)
+            if kept:
+                _put_latest(self._q, kept)
+        return True
+
+    def _request_keyframes(self):
+        for delta in self._delta.values():
+            delta.request_keyframe()
+
+    def _rendition_target(self, rendition: str, source: tuple) -> Tuple[tuple, int]:
+        """Size and JPEG quality of one rendition at the current operating point."""
+        point = self.controller.point
+        if rendition in FIXED_RENDITIONS:
+            width, height, quality = FIXED_RENDITIONS[rendition]
+            if rendition == "low" and width > point.width:
+                width, height = point.width, point.height
         else:
-            scaled = surface
+            width, height, quality = point.width, point.height, point.quality
+        if width > source[0] or height > source[1]:
+            width, height = source
+        return (width, height), quality
 
-        if PIL_AVAILABLE:
-            raw = pygame.image.tobytes(scaled, "RGB")
-            img = Image.frombytes("RGB", (STREAM_WIDTH, STREAM_HEIGHT), raw)
+    def _encode(self, data: bytes, size: tuple, rawmode: str, stride: int) -> List[Tuple[str, bytes]]:
+        """Encode every rendition of one frame; unchanged renditions are left out."""
+        if not PIL_AVAILABLE:
+            target, _ = self._rendition_target(DEFAULT_RENDITION, size)
+            img = pygame.image.frombuffer(data, size, "RGB")
+            if size != target:
+                img = pygame.transform.smoothscale(img, target)
             buf = io.BytesIO()
-            img.save(buf, format="JPEG", quality=JPEG_QUALITY, optimize=False)
-            return buf.getvalue()
+            pygame.image.save(img, buf, ".png")
+            return [(DEFAULT_RENDITION, buf.getvalue())]
+
+        img = Image.frombuffer("RGB", size, data, "raw", rawmode, stride, 1)
+        renditions = self._active_renditions()
+        if self._pool is None or len(renditions) == 1:
+            results = [self._encode_rendition(img, r) for r in renditions]
         else:
-            buf = io.BytesIO()
-            pygame.image.save(scaled, buf, ".png")
-            return buf.getvalue()
+            # Resize and JPEG encode release the GIL, so renditions overlap
+            futures = [self._pool.submit(self._encode_rendition, img, r) for r in renditions]
+            results = [f.result() for f in futures]
+        return [(r, payload) for r, payload in zip(renditions, results) if payload is not None]
+
+    def _encode_rendition(self, img, rendition: str) -> Optional[bytes]:
+        target, quality = self._rendition_target(rendition, img.size)
+        if img.size != target:
+            img = img.resize(target, Image.BILINEAR)
+        delta = self._delta.get(rendition)
+        if delta is not None:
+            return delta.encode(img, quality)
+        return _jpeg(img, quality)
 
     # ------------------------------------------------------------------
     # Background sender thread
@@ -118,6 +587,8 @@ class FrameStreamer:
 
     def _stream_loop(self):
         uri = f"{WS_BASE}/ws/stream/{self.game_id}"
+        if self.feed != "main":
+            uri += f"/{self.feed}"
 
         try:
             from websockets.sync.client import connect as ws_connect
@@ -128,34 +599,74 @@ class FrameStreamer:
 
         with ws_connect(uri, max_size=8 * 1024 * 1024, open_timeout=5) as ws:
             print(f"[FrameStreamer] Connected → {uri}")
+            self._request_keyframes()   # deltas before this connection are lost
+            threading.Thread(target=self._receive_loop, args=(ws,), daemon=True,
+                             name=f"FrameDemand-{self.feed}").start()
+            level = None
             while not self._stopped:
                 try:
-                    frame = self._q.get(timeout=1.0)
+                    encoded = self._q.get(timeout=1.0)
                 except queue.Empty:
                     continue
-                if frame is None:
+                if encoded is None:
                     break
+                # State first, so the bridge knows the renditions before frames arrive
+                report = self.controller.pop_report(changed=self.controller.level != level)
+                if report is not None:
+                    level = report["level"]
+                    ws.send(json.dumps({"type": "STREAM_STATE", "feed": self.feed,
+                                        "renditions": list(self.renditions), **report}))
+
+                started = time.monotonic()
                 try:
-                    ws.send(frame)  # Raw binary JPEG
+                    for rendition, header, payload in encoded:
+                        ws.send(pack_rendition(rendition, header, payload))
                 except Exception:
                     raise  # Reconnect outer loop
+                self.controller.record_send(time.monotonic() - started)
                 self._q.task_done()
 
+    def _receive_loop(self, ws):
+        """Read DEMAND reports from the bridge until the connection closes."""
+        try:
+            for message in ws:
+                if isinstance(message, bytes):
+                    continue
+                try:
+                    report = json.loads(message)
+                except ValueError:
+                    continue
+                if report.get("type") == "DEMAND":
+                    self.apply_demand(int(report.get("viewers", 0)),
+                                      report.get("renditions", ()), report.get("keyframe", ()))
+        except Exception:
+            pass
+        finally:
+            self._demand = None   # unknown until the next connection reports
+
     def _run_http_fallback(self):
         """HTTP POST fallback when websockets.sync not available."""
         import urllib.request
         import base64
         import json as _json
 
+        # FRAME events are standalone images of the default rendition
+        self._delta = {}
+        self.renditions = (DEFAULT_RENDITION,)
+
         while not self._stopped:
             try:
-                frame = self._q.get(timeout=1.0)
+                encoded = self._q.get(timeout=1.0)
             except queue.Empty:
                 continue
-            if frame is None:
+            if encoded is None:
                 break
+            frame = next((p for r, _, p in encoded if r == DEFAULT_RENDITION), None)
+            if frame is None:
+                continue
             b64 = base64.b64encode(frame).decode("ascii")
-            payload = _json.dumps({"type": "FRAME", "game_id": self.game_id, "data": b64}).encode()
+            payload = _json.dumps({"type": "FRAME", "game_id": self.game_id,
+                                 "feed": self.feed, "data": b64}).encode()
             url = f"{BRIDGE_URL}/game/ingest/{self.game_id}"
             req = urllib.request.Request(url, data=payload,
                                           headers={"Content-Type": "application/json"}, method="POST")
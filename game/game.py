@@ -9,7 +9,6 @@ import tasks
 from settings import *
 from sprites import *
 from tilemap import *
-from pygame import mixer
 from menu import Menu
 from board import Board
 from gamefunctions import GameFunctions
@@ -20,14 +19,26 @@ from pygame.locals import *
 import pickle
 import select
 import socket
+import audio
+import os
 
 BUFFERSIZE = 8192
 
 
 class Game:
-    def __init__(self):
-        pg.init()
-        # pg.mixer.init()
+    def __init__(self, audio_enabled=None, headless=False):
+        if headless:
+            # Offscreen rendering only — no window is ever shown. A driver
+            # chosen explicitly by the environment still wins.
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        if audio_enabled is None:
+            audio_enabled = audio.audio_enabled()
+        if audio_enabled:
+            pg.init()
+        else:
+            # Silent mode: never touch the mixer (or the audio device)
+            pg.display.init()
+            pg.font.init()
         self.screen = pg.display.set_mode((WIDTH, HEIGHT))
         self.board = Board(WIDTH, HEIGHT, self)
         self.tasks = Task(self)
@@ -49,6 +60,7 @@ class Game:
         self.Menu_folder = path.join(self.game_folder, 'Assets/Images/Menu')
         self.sound_folder = path.join(self.game_folder, 'Assets/Sounds')
         self.font_folder = path.join(self.game_folder, 'Assets/Fonts')
+        self.audio = audio.Audio(self.sound_folder, audio_enabled)
         self.playing = False
         self.sound_playing = False
         self.game_left = False
@@ -629,11 +641,11 @@ class Game:
         self.bgY = 0
 
         # Background music
-        self.asteroid_bg = mixer.Sound("Assets/Sounds/Clear Asteroids/AMB_Space.wav")
+        self.asteroid_bg = self.audio.ambient("Clear Asteroids/AMB_Space.wav")
         # Bullet Sound
-        self.bullet_sound = mixer.Sound("Assets/Sounds/Clear Asteroids/fire3.mp3")
+        self.bullet_sound = self.audio.effect("Clear Asteroids/fire3.mp3")
         # Collision Sound
-        self.collision_sound = mixer.Sound("Assets/Sounds/Clear Asteroids/explosion2.mp3")
+        self.collision_sound = self.audio.effect("Clear Asteroids/explosion2.mp3")
 
         # Score Board
         self.score_box_img = pg.image.load("Assets/Images/Tasks/Clear Asteroids/score_box.png").convert_alpha()
@@ -647,28 +659,18 @@ class Game:
 
 
         # SOUND LOADING __________________________
-        pg.mixer.music.load(path.join(self.sound_folder, BG_MUSIC3))
+        # Sounds are decoded lazily on first play (see audio.py); long room
+        # ambience is released again once it fades out.
+        self.audio.load_music(BG_MUSIC3)
 
-        self.effect_sounds = {}
-        # Load each sound from sound directory into EFFECTS_SOUNDS array
-        for type in EFFECT_SOUNDS:
-            self.effect_sounds[type] = pg.mixer.Sound(path.join(self.sound_folder, EFFECT_SOUNDS[type]))
+        self.effect_sounds = self.audio.effects(EFFECT_SOUNDS)
         self.foot_sounds = {}
-        self.foot_sounds['footsteps'] = []
-        for i in FOOTSTEP_SOUNDS:
-            self.foot_sounds['footsteps'].append(pg.mixer.Sound(path.join(self.sound_folder, i)))
+        self.foot_sounds['footsteps'] = self.audio.effect_list(FOOTSTEP_SOUNDS)
         self.electric_shock_sounds = {}
-        self.electric_shock_sounds['electric_shock'] = []
-        for i in ELECTRIC_SHOCK_SOUNDS:
-            self.electric_shock_sounds['electric_shock'].append(pg.mixer.Sound(path.join(self.sound_folder, i)))
+        self.electric_shock_sounds['electric_shock'] = self.audio.effect_list(ELECTRIC_SHOCK_SOUNDS)
         self.comms_radio_sounds = {}
-        self.comms_radio_sounds['comms_radio'] = []
-        for i in COMMS_RADIO_SOUNDS:
-            self.comms_radio_sounds['comms_radio'].append(pg.mixer.Sound(path.join(self.sound_folder, i)))
-        self.ambient_sounds = {}
-        # Load each sound from sound directory into AMBIENT_SOUNDS array
-        for type in AMBIENT_SOUNDS:
-            self.ambient_sounds[type] = pg.mixer.Sound(path.join(self.sound_folder, AMBIENT_SOUNDS[type]))
+        self.comms_radio_sounds['comms_radio'] = self.audio.effect_list(COMMS_RADIO_SOUNDS)
+        self.ambient_sounds = self.audio.ambients(AMBIENT_SOUNDS)
 
     # THIS METHOD CREATES ALL OBJECTS, INSTANCES & VARIABLES
     # create sprites/ objects/ walls/ camera = all sprites
@@ -973,8 +975,7 @@ class Game:
     def runfreeplay(self):
         # Game main loop - set self.playing = False to end the game
         # bg music
-        mixer.music.play(-1)
-        mixer.music.set_volume(0.7)
+        self.audio.play_music(-1, volume=0.7)
 
         self.player = Player(self, random.choice(self.player_pos), 0, True, self.player_colour)
 
@@ -1016,8 +1017,8 @@ class Game:
             # If missions are completed then win or loss display
             # For crew mate
             if self.missions_done == 8:
-                pg.mixer.music.stop()  # turn off background music
-                pg.mixer.Channel(0).stop()
+                self.audio.stop_music()  # turn off background music
+                self.audio.stop_alarm()
                 for m in self.foot_sounds['footsteps']:
                     m.stop()
                 for m in self.effect_sounds.values():
@@ -1034,8 +1035,8 @@ class Game:
             # For imposter
             # if imposter kills all the bots or reactor meltdown sabotage timer equals to 0 then imposter wins
             elif self.bot_count == 0 or (self.sabotagecritical == True and (self.sabotagecriticaltimer - self.sabotagecriticaltimer_start) > 20000):
-                pg.mixer.music.stop()  # turn off background music
-                pg.mixer.Channel(0).stop()
+                self.audio.stop_music()  # turn off background music
+                self.audio.stop_alarm()
                 for m in self.foot_sounds['footsteps']:
                     m.stop()
                 for m in self.effect_sounds.values():
@@ -1050,8 +1051,8 @@ class Game:
                 self.menu.game_over_imposter(self.score_list, '')
                 return
             elif self.game_left:
-                pg.mixer.music.stop()  # turn off background music
-                pg.mixer.Channel(0).stop()
+                self.audio.stop_music()  # turn off background music
+                self.audio.stop_alarm()
                 for m in self.foot_sounds['footsteps']:
                     m.stop()
                 for m in self.effect_sounds.values():
@@ -1069,8 +1070,7 @@ class Game:
         # Game main loop - set self.playing = False to end the game
         # bg music
         global ge
-        mixer.music.play(-1)
-        mixer.music.set_volume(0.7)
+        self.audio.play_music(-1, volume=0.7)
 
         # remove bots
         for b in self.bots:
@@ -1269,7 +1269,7 @@ class Game:
 
                                     self.sabotagecooldown_start = self.sabotagecooldown
                                     self.sabotagecritical = False
-                                    pygame.mixer.Channel(0).stop()
+                                    self.audio.stop_alarm()
 
                             # Emergency Meeting called from server player
                             # connected to the server
@@ -1411,8 +1411,8 @@ class Game:
                     if p.tasks_completed < 8 and p.imposter == False:
                         break
                 else:
-                    pg.mixer.music.stop()  # turn off background music
-                    pg.mixer.Channel(0).stop()
+                    self.audio.stop_music()  # turn off background music
+                    self.audio.stop_alarm()
                     for m in self.foot_sounds['footsteps']:
                         m.stop()
                     for m in self.effect_sounds.values():
@@ -1429,8 +1429,8 @@ class Game:
                 # When imposter is ejecting
                 for p in self.Players.values():
                     if p.alive_status == False and p.imposter == True and self.emergency == False:
-                        pg.mixer.music.stop()  # turn off background music
-                        pg.mixer.Channel(0).stop()
+                        self.audio.stop_music()  # turn off background music
+                        self.audio.stop_alarm()
                         for m in self.foot_sounds['footsteps']:
                             m.stop()
                         for m in self.effect_sounds.values():
@@ -1453,8 +1453,8 @@ class Game:
                 else:
                     pass
                     if self.emergency == False and self.kill_victim_anim == False:
-                        pg.mixer.music.stop()  # turn off background music
-                        pg.mixer.Channel(0).stop()
+                        self.audio.stop_music()  # turn off background music
+                        self.audio.stop_alarm()
                         for m in self.foot_sounds['footsteps']:
                             m.stop()
                         for m in self.effect_sounds.values():
@@ -1471,8 +1471,8 @@ class Game:
                 # For imposter - Critical Sabotage
                 if self.sabotagecritical == True and (
                         self.sabotagecriticaltimer - self.sabotagecriticaltimer_start) > 20000:
-                    pg.mixer.music.stop()  # turn off background music
-                    pg.mixer.Channel(0).stop()
+                    self.audio.stop_music()  # turn off background music
+                    self.audio.stop_alarm()
                     for m in self.foot_sounds['footsteps']:
                         m.stop()
                     for m in self.effect_sounds.values():
@@ -2712,8 +2712,7 @@ class Game:
                         # If kill timer is off or kill timer equals = 0 then on key press K_Shift show reactor timer
                         # on screen and start reactor_timer_event that decrements per second
                         self.sabotage_timer_icon_status = False
-                        pygame.mixer.Channel(0).play(pygame.mixer.Sound(self.effect_sounds['crises_alarm']),
-                                                     loops=-1)
+                        self.audio.play_alarm(self.effect_sounds['crises_alarm'])
                         self.sabotagecriticaltimer_start = pygame.time.get_ticks()
 
                     # To Trigger Reactor meltdown Sabotage - Freeplay Mode
@@ -2742,7 +2741,7 @@ class Game:
                         self.sabotagecooldown_start = self.sabotagecooldown
                         self.night_reactor_sync += 1
                         self.sabotagecritical = False
-                        pygame.mixer.Channel(0).stop()
+                        self.audio.stop_alarm()
 
                     elif self.player.imposter == True:
                         self.effect_sounds['imposter_kill_cooldown_sound'].play()
@@ -0,0 +1,198 @@
+"""
+Current state of a game, kept up to date from its events at the bridge.
+
+A spectator joining mid-match gets one STATE_SNAPSHOT message built from
+this instead of a replay of the events so far:
+
+  {"type": "STATE_SNAPSHOT", "game_id": ..., "seq": <last event seq>,
+   "state": {"phase", "agents", "imposter", "winner", "meeting",
+             "markets", "hypeScore", "kills"}}
+
+followed by the live events after `seq`. The rules follow what the
+spectator app does with the same events (app/hooks/use-game-store.ts):
+the same phases, the same prediction markets opened and resolved by the
+same events. Market odds and predictions are per viewer and stay there.
+
+Among Us events come from GameEmitter (VOTE_CAST, AGENT_EJECTED); the
+app's own names for them (VOTE, EJECTION) are accepted too.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional
+
+# Events that change the snapshot; the bridge has to decode these
+SNAPSHOT_EVENTS = frozenset({
+    "GAME_START", "KILL", "MEETING_START", "VOTE_CAST", "VOTE", "AGENT_EJECTED",
+    "EJECTION", "GAME_END", "MOVE", "CHECKMATE", "STALEMATE",
+})
+
+HYPE_PER_EVENT = {"KILL": 15, "MEETING_START": 10}
+
+
+class GameSnapshot:
+    """The state of one game after the events applied so far."""
+
+    def __init__(self, game_id: str):
+        self.game_id = game_id
+        self.hype_score = 0             # carried over when the game restarts
+        self.markets_version = 0        # bumped whenever a market opens or resolves
+        self._state_json: Optional[str] = None    # cached until the next change
+        self._reset()
+
+    def _reset(self):
+        self.phase = "waiting"          # waiting | running | meeting | ended
+        self.agents: Dict[str, dict] = {}
+        self.imposter: Optional[str] = None
+        self.winner: Optional[str] = None
+        self.meeting: Optional[dict] = None
+        self.markets: List[dict] = []
+        self.markets_version += 1
+        self.kills = 0
+
+    def apply(self, event_type: str, event: Dict[str, Any]):
+        """Update from one decoded event; other event types are ignored."""
+        handler = _HANDLERS.get(event_type)
+        if handler is None:
+            return
+        handler(self, event)
+        if event_type in HYPE_PER_EVENT:
+            self.hype_score = min(100, self.hype_score + HYPE_PER_EVENT[event_type])
+        self._state_json = None
+
+    def state(self) -> dict:
+        return {
+            "phase": self.phase,
+            "agents": list(self.agents.values()),
+            "imposter": self.imposter,
+            "winner": self.winner,
+            "meeting": self.meeting,
+            "markets": self.markets,
+            "hypeScore": self.hype_score,
+            "kills": self.kills,
+        }
+
+    def markets_message(self) -> str:
+        """The markets alone, for /ws/topics "markets:<game>" subscribers."""
+        return json.dumps({"type": "MARKETS", "game_id": self.game_id,
+                           "version": self.markets_version, "markets": self.markets})
+
+    def message(self, seq: int) -> str:
+        """The STATE_SNAPSHOT message as of event `seq`."""
+        if self._state_json is None:
+            self._state_json = json.dumps(self.state())
+        return (f'{{"type":"STATE_SNAPSHOT","game_id":{json.dumps(self.game_id)},'
+                f'"seq":{seq},"state":{self._state_json}}}')
+
+    # ------------------------------------------------------------------
+    # Event handlers
+    # ------------------------------------------------------------------
+
+    def _game_start(self, event: dict):
+        names = event.get("agents") or event.get("players") or []
+        chess = event.get("game_type") == "chess"
+        self._reset()
+        self.phase = "running"
+        self.agents = {name: {"name": name, "alive": True} for name in names}
+        if not chess:
+            self.imposter = event.get("imposter")
+            self._open_market("crew_win", "Will the Crew win?")
+
+    def _kill(self, event: dict):
+        killer, victim = event.get("killer"), event.get("victim")
+        first_kill = all(agent["alive"] for agent in self.agents.values())
+        if victim in self.agents:
+            self.agents[victim]["alive"] = False
+        self.phase = "running"
+        self.kills += 1
+        self._resolve(lambda m: m["kind"] == "killer_kill_again" and m["relatedAgent"] == killer,
+                      lambda m: "YES")
+        self._resolve(lambda m: m["kind"] == "agent_survive_round" and m["relatedAgent"] == victim,
+                      lambda m: "NO")
+        if first_kill:
+            self._open_market("identify_impostor", f"Is {killer} the Impostor?", killer)
+            survivor = next((name for name, agent in self.agents.items()
+                             if agent["alive"] and name != killer), None)
+            if survivor:
+                self._open_market("agent_survive_round",
+                                  f"Will {survivor} survive this round?", survivor)
+        else:
+            self._open_market("killer_kill_again", f"Will {killer} kill again?", killer)
+
+    def _meeting_start(self, event: dict):
+        self.phase = "meeting"
+        self.meeting = {"caller": event.get("caller"), "votes": {}}
+        self._open_market("meeting_ejects", "Will this meeting eject an agent?")
+
+    def _vote(self, event: dict):
+        voter = event.get("voter", event.get("agent"))
+        if self.meeting is not None and voter:
+            self.meeting["votes"][voter] = event.get("target")
+
+    def _ejection(self, event: dict):
+        ejected = event.get("ejected")
+        if ejected in self.agents:
+            self.agents[ejected].update(alive=False, ejected=True)
+        self.phase = "running"
+        self.meeting = None
+        self._resolve(lambda m: m["kind"] == "meeting_ejects", lambda m: "YES")
+        self._resolve(lambda m: m["kind"] == "agent_survive_round" and m["relatedAgent"],
+                      lambda m: "YES" if self._alive(m["relatedAgent"]) else "NO")
+        self._resolve(lambda m: m["kind"] == "identify_impostor" and m["relatedAgent"] == ejected,
+                      lambda m: "YES" if self.imposter == ejected else "NO")
+
+    def _game_end(self, event: dict):
+        winner = event.get("winner")
+        self.phase = "ended"
+        self.meeting = None
+        self.winner = winner
+        self.imposter = event.get("imposter")
+
+        def outcome(market: dict) -> str:
+            if market["kind"] == "crew_win":
+                return "YES" if winner == "crew" else "NO"
+            if market["kind"] == "identify_impostor":
+                return "YES" if market["relatedAgent"] == self.imposter else "NO"
+            if market["kind"] == "agent_survive_round":
+                return "YES" if self._alive(market["relatedAgent"]) else "NO"
+            return "NO"
+        self._resolve(lambda m: True, outcome)
+
+    def _move(self, event: dict):
+        if self.phase == "waiting":
+            self.phase = "running"
+
+    def _chess_end(self, event: dict):
+        self.phase = "ended"
+
+    # ------------------------------------------------------------------
+
+    def _alive(self, name: Optional[str]) -> bool:
+        agent = self.agents.get(name) if name else None
+        return bool(agent and agent["alive"])
+
+    def _open_market(self, kind: str, question: str, related: Optional[str] = None):
+        self.markets.append({"kind": kind, "question": question, "relatedAgent": related,
+                             "status": "OPEN", "resolved": None})
+        self.markets_version += 1
+
+    def _resolve(self, should_resolve, outcome):
+        for market in self.markets:
+            if market["status"] != "RESOLVED" and should_resolve(market):
+                market.update(status="RESOLVED", resolved=outcome(market))
+                self.markets_version += 1
+
+
+_HANDLERS = {
+    "GAME_START": GameSnapshot._game_start,
+    "KILL": GameSnapshot._kill,
+    "MEETING_START": GameSnapshot._meeting_start,
+    "VOTE_CAST": GameSnapshot._vote,
+    "VOTE": GameSnapshot._vote,
+    "AGENT_EJECTED": GameSnapshot._ejection,
+    "EJECTION": GameSnapshot._ejection,
+    "GAME_END": GameSnapshot._game_end,
+    "MOVE": GameSnapshot._move,
+    "CHECKMATE": GameSnapshot._chess_end,
+    "STALEMATE": GameSnapshot._chess_end,
+}
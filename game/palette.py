@@ -0,0 +1,216 @@
+"""
+Palette-swapped agent sprites.
+
+The Red player frames ship as a mask rig rather than a finished colour:
+the red channel marks the suit, blue marks the suit shadow and green
+marks the visor. Every agent colour is generated from that one base set
+at load time by multiplying each channel stencil with the colour it
+stands for, so only a single walk cycle is ever decoded from disk.
+
+Generated sprites are cached per colour and shared by every consumer
+(settings' legacy per-colour names, Bot, AutonomousGame), which keeps a
+large lobby cheap in both startup time and resident memory.
+
+Usage:
+    from palette import agent_sprites
+    sprites = agent_sprites("Blue")          # named colour
+    sprites = agent_sprites((40, 200, 180))  # any RGB suit colour
+    sprites["left"][0], sprites["dead"], sprites["ghost_right"]
+"""
+from __future__ import annotations
+
+import colorsys
+import zlib
+from typing import Dict, List, Tuple, Union
+
+import pygame as pg
+
+Colour = Tuple[int, int, int]
+
+# ---------------------------------------------------------------------------
+# Base rig
+# ---------------------------------------------------------------------------
+
+PLAYER_SPRITE_SIZE = (64, 86)
+
+# direction → (frame directory, frame count)
+BASE_WALK_FRAMES = {
+    "left":  ("Assets/Images/Player/Red/red_left_walk", 17),
+    "right": ("Assets/Images/Player/Red/red_right_walk", 17),
+    "down":  ("Assets/Images/Player/Red/red_down_walk", 18),
+    "up":    ("Assets/Images/Player/Red/red_up_walk", 17),
+}
+BASE_GHOST_FRAMES = {
+    "ghost_left":  "Assets/Images/Player/Red/red_ghost/step1_left.png",
+    "ghost_right": "Assets/Images/Player/Red/red_ghost/step1_right.png",
+}
+BASE_DEAD_FRAME = "Assets/Images/Player/Dead/Deadred.png"
+
+# ---------------------------------------------------------------------------
+# Colours
+# ---------------------------------------------------------------------------
+
+VISOR_COLOUR = (148, 201, 219)
+SHADOW_FACTOR = 0.62   # suit shadow = suit colour darkened by this factor
+
+SUIT_COLOURS: Dict[str, Colour] = {
+    "Red":    (197, 17, 17),
+    "Blue":   (19, 46, 209),
+    "Green":  (17, 127, 45),
+    "Orange": (239, 125, 13),
+    "Yellow": (245, 245, 87),
+    "Black":  (63, 71, 78),
+    "Brown":  (113, 73, 30),
+    "Pink":   (237, 84, 186),
+    "Purple": (107, 47, 187),
+    "White":  (214, 224, 240),
+    "Cyan":   (56, 254, 219),
+    "Lime":   (80, 239, 57),
+    "Maroon": (95, 29, 46),
+    "Rose":   (236, 192, 211),
+    "Banana": (240, 231, 168),
+    "Gray":   (117, 133, 147),
+    "Tan":    (145, 136, 119),
+    "Coral":  (215, 100, 100),
+}
+
+
+def suit_colour(colour: Union[str, Colour]) -> Colour:
+    """
+    Resolve an agent colour to its suit RGB.
+
+    Accepts a named colour, a '#rrggbb' string or an RGB tuple. Any other
+    name gets a stable, saturated colour derived from the name itself, so
+    agents beyond the named set still look distinct from run to run.
+    """
+    if isinstance(colour, tuple):
+        return (int(colour[0]), int(colour[1]), int(colour[2]))
+    if colour in SUIT_COLOURS:
+        return SUIT_COLOURS[colour]
+    if colour.startswith("#") and len(colour) == 7:
+        return (int(colour[1:3], 16), int(colour[3:5], 16), int(colour[5:7], 16))
+    hue = (zlib.crc32(colour.encode()) % 360) / 360.0
+    r, g, b = colorsys.hsv_to_rgb(hue, 0.75, 0.9)
+    return (int(r * 255), int(g * 255), int(b * 255))
+
+
+# ---------------------------------------------------------------------------
+# Channel stencils
+# ---------------------------------------------------------------------------
+
+class _RigFrame:
+    """One base frame split into suit / shadow / visor / neutral stencils."""
+
+    __slots__ = ("suit", "shadow", "visor", "neutral")
+
+    def __init__(self, frame: pg.Surface):
+        size = frame.get_size()
+        raw = pg.image.tobytes(frame, "RGBA")
+        alpha = raw[3::4]
+
+        def stencil(channel: bytes) -> pg.Surface:
+            buf = bytearray(len(raw))
+            buf[0::4] = channel
+            buf[1::4] = channel
+            buf[2::4] = channel
+            buf[3::4] = alpha
+            # Grey stencils read the same in any channel order; "BGRA" just
+            # matches the native SRCALPHA layout so blends skip conversion.
+            return pg.image.frombytes(bytes(buf), size, "BGRA")
+
+        suit = stencil(raw[0::4])
+        visor = stencil(raw[1::4])
+        shadow = stencil(raw[2::4])
+
+        # Grey pixels (outline highlights, floor shadow) have equal channels;
+        # peel that common part off so it is kept as-is instead of tinted.
+        neutral = suit.copy()
+        neutral.blit(visor, (0, 0), special_flags=pg.BLEND_RGB_MIN)
+        neutral.blit(shadow, (0, 0), special_flags=pg.BLEND_RGB_MIN)
+        for s in (suit, visor, shadow):
+            s.blit(neutral, (0, 0), special_flags=pg.BLEND_RGB_SUB)
+
+        self.suit = suit
+        self.shadow = shadow
+        self.visor = visor
+        self.neutral = neutral
+
+    def render(self, suit: pg.Surface, shadow: pg.Surface, visor: pg.Surface) -> pg.Surface:
+        """Tint each stencil with its solid-colour surface and sum them."""
+        out = self.suit.copy()
+        out.blit(suit, (0, 0), special_flags=pg.BLEND_RGB_MULT)
+        for stencil, tint in ((self.shadow, shadow), (self.visor, visor)):
+            layer = stencil.copy()
+            layer.blit(tint, (0, 0), special_flags=pg.BLEND_RGB_MULT)
+            out.blit(layer, (0, 0), special_flags=pg.BLEND_RGB_ADD)
+        out.blit(self.neutral, (0, 0), special_flags=pg.BLEND_RGB_ADD)
+        return out
+
+
+_base_rig: Dict[str, Union[List[_RigFrame], _RigFrame]] | None = None
+
+
+def _load_frame(filename: str, scale: bool = True) -> _RigFrame:
+    img = pg.image.load(filename)
+    if scale:
+        img = pg.transform.smoothscale(img, PLAYER_SPRITE_SIZE)
+    return _RigFrame(img)
+
+
+def _base() -> Dict[str, Union[List[_RigFrame], _RigFrame]]:
+    """Decode and split the base rig once per process."""
+    global _base_rig
+    if _base_rig is None:
+        rig: Dict[str, Union[List[_RigFrame], _RigFrame]] = {}
+        for direction, (folder, count) in BASE_WALK_FRAMES.items():
+            rig[direction] = [
+                _load_frame(f"{folder}/step{i}.png") for i in range(1, count + 1)
+            ]
+        for key, filename in BASE_GHOST_FRAMES.items():
+            rig[key] = _load_frame(filename)
+        rig["dead"] = _load_frame(BASE_DEAD_FRAME, scale=False)
+        _base_rig = rig
+    return _base_rig
+
+
+def _solid(colour: Colour) -> pg.Surface:
+    # Large enough to cover every base frame (walk frames and the dead body)
+    surf = pg.Surface((96, 96), pg.SRCALPHA)
+    surf.fill((*colour, 255))
+    return surf
+
+
+# ---------------------------------------------------------------------------
+# Per-colour cache
+# ---------------------------------------------------------------------------
+
+_cache: Dict[Colour, dict] = {}
+
+
+def agent_sprites(colour: Union[str, Colour]) -> dict:
+    """
+    Return the sprite set for an agent colour, generating it on first use.
+
+    Keys: "left", "right", "up", "down" (lists of walk frames), "dead",
+    "ghost_left", "ghost_right". The returned lists and surfaces are shared
+    between all callers asking for the same colour — do not mutate them.
+    """
+    rgb = suit_colour(colour)
+    sprites = _cache.get(rgb)
+    if sprites is None:
+        shadow = tuple(int(c * SHADOW_FACTOR) for c in rgb)
+        # A blit from a solid surface is far cheaper than fill(BLEND_RGB_MULT)
+        tints = [_solid(rgb), _solid(shadow), _solid(VISOR_COLOUR)]
+        sprites = {}
+        for key, frames in _base().items():
+            if isinstance(frames, list):
+                sprites[key] = [f.render(*tints) for f in frames]
+            else:
+                sprites[key] = frames.render(*tints)
+        _cache[rgb] = sprites
+    return sprites
+
+
+def clear_cache():
+    """Drop every generated colour (the base rig stays loaded)."""
+    _cache.clear()
@@ -0,0 +1,299 @@
+"""
+Pub/sub between bridge workers — how an ingested event reaches every viewer.
+
+Ingest publishes each event once. The backend gives it the game's next
+seq and delivers it, in seq order, to every bridge process, each of which
+keeps its own copy of the history, snapshot and active_games and fans
+the event out to its own subscribers. So engines can ingest to any worker
+and viewers can connect to any worker.
+
+Backends (SUS_PUBSUB):
+
+  memory         one process (the default); delivery is a direct call
+  unix:<path>    several processes, relayed by a broker on a Unix socket:
+
+                   python pubsub.py /tmp/sus-bridge.sock
+                   SUS_PUBSUB=unix:/tmp/sus-bridge.sock \\
+                       uvicorn bridge_server:app --workers 4
+
+                 (python bridge_server.py does both for SUS_BRIDGE_WORKERS > 1)
+
+The broker is the single place events are numbered, so all workers agree
+on seq. Broker messages are
+
+  header length u32 | data length u32 | header (JSON) | data (the event)
+
+with header {"g": game_id, "t": type, "ts": timestamp, "base": seq the
+publisher last saw, "w": publishing worker, "m": [emitter, emit_seq] for
+GameEmitter events}, plus "seq" on the way out.
+Only the header is decoded; the event is relayed as it is.
+
+Video is relayed too, unnumbered and never stored (relay()): header
+{"r": kind, "g": game_id, "f": feed, "w": publishing worker}, data the
+frame or JSON as the bridge has it. The broker passes relays to every
+worker but the one that sent them, and both ends let relays give way to
+events: past RELAY_BUFFERED unsent bytes a relay is dropped (a video frame
+lost this way shows up as a seq gap, see bridge_server).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import struct
+import sys
+import uuid
+from typing import Callable, Dict, NamedTuple, Optional, Set, Tuple
+
+_FRAME = struct.Struct("<II")   # header length, data length
+RECONNECT_SECONDS = 1.0
+CONNECT_TIMEOUT = 5.0
+MAX_BUFFERED = 64 * 1024 * 1024     # a worker further behind than this is dropped, and a
+                                    # worker refuses events once this much is unsent
+RELAY_BUFFERED = 8 * 1024 * 1024    # relays are dropped once this much is unsent
+
+
+class PubSubUnavailable(Exception):
+    """The broker can't be reached; the event was not published."""
+
+
+class Published(NamedTuple):
+    game_id: str
+    seq: int            # 0 for FRAME events, which are not numbered
+    type: str
+    timestamp: float
+    data: str           # the event without "seq"
+    origin: bool        # published by this process
+    mark: Optional[Tuple[str, int]] = None  # (emitter, emit_seq) of a GameEmitter event
+
+
+class Relayed(NamedTuple):
+    kind: str           # what the bridge relays: VIDEO, VIDEO_STATE, VIDEO_END, ...
+    game_id: str
+    feed: str
+    worker: str         # the worker that relayed it
+    data: bytes
+
+
+# deliver(message, decoded event if the publisher had it at hand)
+Deliver = Callable[[Published, Optional[dict]], None]
+# receive(relay from another worker)
+Receive = Callable[[Relayed], None]
+
+
+def pubsub_from_env():
+    """The backend SUS_PUBSUB asks for."""
+    value = os.environ.get("SUS_PUBSUB", "memory").strip()
+    if value.startswith("unix:"):
+        return UnixPubSub(value[len("unix:"):])
+    if value not in ("", "memory"):
+        raise ValueError(f"SUS_PUBSUB: unknown backend {value!r}")
+    return MemoryPubSub()
+
+
+def _next_seq(counters: Dict[str, int], game_id: str, base: int) -> int:
+    seq = counters[game_id] = max(counters.get(game_id, 0), base) + 1
+    return seq
+
+
+class MemoryPubSub:
+    """Single process: publish() numbers the event and delivers it at once."""
+
+    name = "memory"
+
+    def __init__(self):
+        self.worker = "local"
+        self._deliver: Optional[Deliver] = None
+        self._seq: Dict[str, int] = {}
+
+    async def start(self, deliver: Deliver, receive: Optional[Receive] = None):
+        self._deliver = deliver
+
+    async def stop(self):
+        pass
+
+    def publish(self, game_id: str, etype: str, timestamp: float, data: str, base: int,
+                event: Optional[dict] = None, mark: Optional[Tuple[str, int]] = None):
+        seq = 0 if etype == "FRAME" else _next_seq(self._seq, game_id, base)
+        self._deliver(Published(game_id, seq, etype, timestamp, data, True, mark), event)
+
+    def relay(self, kind: str, game_id: str, feed: str, data: bytes) -> bool:
+        """One process: there is no other worker to relay to."""
+        return True
+
+    def stats(self) -> dict:
+        return {"backend": self.name}
+
+
+# ---------------------------------------------------------------------------
+# Unix socket broker
+# ---------------------------------------------------------------------------
+
+def encode(header: dict, data: bytes) -> bytes:
+    head = json.dumps(header, separators=(",", ":")).encode()
+    return _FRAME.pack(len(head), len(data)) + head + data
+
+
+async def read_message(reader: asyncio.StreamReader) -> Tuple[dict, bytes]:
+    head_len, data_len = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    body = await reader.readexactly(head_len + data_len)
+    return json.loads(body[:head_len]), body[head_len:]
+
+
+class UnixPubSub:
+    """A worker's connection to the broker; reconnects when it goes away."""
+
+    name = "unix"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.worker = uuid.uuid4().hex[:8]
+        self.published = 0
+        self.delivered = 0
+        self.reconnects = 0
+        self.refused = 0
+        self.relayed = 0
+        self.relays_received = 0
+        self.relays_dropped = 0
+        self._deliver: Optional[Deliver] = None
+        self._receive: Optional[Receive] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._connected = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Deliver, receive: Optional[Receive] = None):
+        self._deliver = deliver
+        self._receive = receive
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._connected.wait(), CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"[PUBSUB] No broker at {self.path} yet; events are refused until there is")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def publish(self, game_id: str, etype: str, timestamp: float, data: str, base: int,
+                event: Optional[dict] = None, mark: Optional[Tuple[str, int]] = None):
+        """Send to the broker; delivery here comes back through it, in order."""
+        if self._writer is None:
+            raise PubSubUnavailable(self.path)
+        if self._writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+            self.refused += 1
+            raise PubSubUnavailable(f"{self.path}: broker not reading")
+        header = {"g": game_id, "t": etype, "ts": timestamp, "base": base, "w": self.worker}
+        if mark is not None:
+            header["m"] = mark
+        self._writer.write(encode(header, data.encode()))
+        self.published += 1
+
+    def relay(self, kind: str, game_id: str, feed: str, data: bytes) -> bool:
+        """Pass video on to the other workers; False when it was dropped instead."""
+        writer = self._writer
+        if writer is None or writer.transport.get_write_buffer_size() > RELAY_BUFFERED:
+            self.relays_dropped += 1
+            return False
+        writer.write(encode({"r": kind, "g": game_id, "f": feed, "w": self.worker}, data))
+        self.relayed += 1
+        return True
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "path": self.path, "worker": self.worker,
+                "connected": self._writer is not None, "published": self.published,
+                "delivered": self.delivered, "reconnects": self.reconnects,
+                "refused": self.refused, "relayed": self.relayed,
+                "relays_received": self.relays_received, "relays_dropped": self.relays_dropped}
+
+    async def _run(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            except OSError:
+                await asyncio.sleep(RECONNECT_SECONDS)
+                continue
+            self._writer = writer
+            self._connected.set()
+            try:
+                while True:
+                    header, data = await read_message(reader)
+                    if "r" in header:
+                        self._received(header, data)
+                        continue
+                    self.delivered += 1
+                    mark = header.get("m")
+                    message = Published(header["g"], header.get("seq", 0), header["t"],
+                                        header["ts"], data.decode(), header.get("w") == self.worker,
+                                        tuple(mark) if mark else None)
+                    try:
+                        self._deliver(message, None)
+                    except Exception as e:
+                        print(f"[PUBSUB] Could not deliver {message.type} for {message.game_id}: {e}")
+            except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+                print(f"[PUBSUB] Lost the broker at {self.path}; reconnecting")
+            finally:
+                self._writer = None
+                writer.close()
+            self.reconnects += 1
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    def _received(self, header: dict, data: bytes):
+        self.relays_received += 1
+        if self._receive is None:
+            return
+        relayed = Relayed(header["r"], header["g"], header.get("f", ""), header.get("w", ""), data)
+        try:
+            self._receive(relayed)
+        except Exception as e:
+            print(f"[PUBSUB] Could not take in {relayed.kind} for {relayed.game_id}: {e}")
+
+
+class Broker:
+    """Numbers what workers publish and relays it to all of them."""
+
+    def __init__(self):
+        self.workers: Set[asyncio.StreamWriter] = set()
+        self._seq: Dict[str, int] = {}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.workers.add(writer)
+        try:
+            while True:
+                header, data = await read_message(reader)
+                relay = "r" in header
+                if not relay and header.get("t") != "FRAME":
+                    header["seq"] = _next_seq(self._seq, header["g"], int(header.get("base", 0)))
+                message = encode(header, data)
+                for worker in list(self.workers):
+                    buffered = worker.transport.get_write_buffer_size()
+                    if relay and (worker is writer or buffered > RELAY_BUFFERED):
+                        continue    # the sender has it; events go first to a slow worker
+                    if buffered > MAX_BUFFERED:
+                        print("[PUBSUB] Dropping a worker that stopped reading")
+                        self.workers.discard(worker)
+                        worker.close()
+                    else:
+                        worker.write(message)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.workers.discard(writer)
+            writer.close()
+
+    async def serve(self, path: str):
+        if os.path.exists(path):
+            os.unlink(path)     # left behind by a broker that was killed
+        server = await asyncio.start_unix_server(self.handle, path)
+        print(f"[PUBSUB] Broker listening on {path}")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python pubsub.py <socket path>")
+    try:
+        asyncio.run(Broker().serve(sys.argv[1]))
+    except KeyboardInterrupt:
+        pass
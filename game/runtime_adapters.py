@@ -17,6 +17,8 @@ import pygame as pg
 from agent_controller import SimpleAgent
 from bnb.blockchain import MonadSusChainIntegration
 from frame_streamer import FrameStreamer
+from shared_frame_streamer import SharedMemoryFrameStreamer, stream_encoder_mode
+from camera_feeds import MAIN_FEED
 from ws_emitter import GameEmitter
 
 
@@ -99,7 +101,9 @@ class EventRuntime(Protocol):
     def on_game_end(self, winner: str, imposter: str, alive_agents: list[str]) -> None: ...
     def on_pre_game_trading_start(self) -> None: ...
     def on_game_actually_start(self) -> None: ...
-    def stream_frame(self, surface: pg.Surface) -> None: ...
+    def set_tick(self, tick: int) -> None: ...
+    def stream_wanted(self, feed: str = MAIN_FEED) -> bool: ...
+    def stream_frame(self, surface: pg.Surface, feed: str = MAIN_FEED) -> None: ...
     def close(self) -> None: ...
 
 
@@ -133,7 +137,13 @@ class NullEventRuntime:
     def on_game_actually_start(self) -> None:
         return
 
-    def stream_frame(self, surface: pg.Surface) -> None:
+    def set_tick(self, tick: int) -> None:
+        return
+
+    def stream_wanted(self, feed: str = MAIN_FEED) -> bool:
+        return False
+
+    def stream_frame(self, surface: pg.Surface, feed: str = MAIN_FEED) -> None:
         return
 
     def close(self) -> None:
@@ -153,7 +163,15 @@ class LegacyEventRuntime:
         bridge_game_id = os.environ.get("BRIDGE_GAME_ID", "game-001")
         self.chain = MonadSusChainIntegration(live_mode=live_mode)
         self.emitter = GameEmitter(bridge_game_id)
-        self.frame_streamer = FrameStreamer(game_id=bridge_game_id)
+        self.bridge_game_id = bridge_game_id
+        # SUS_STREAM_ENCODER=process moves JPEG encoding into its own process
+        self.frame_streamer_cls = (
+            SharedMemoryFrameStreamer if stream_encoder_mode() == "process" else FrameStreamer
+        )
+        self.tick = 0
+        self.frame_streamer = self.frame_streamer_cls(game_id=bridge_game_id)
+        # Extra camera feeds get their own stream, opened on first frame
+        self.feed_streamers: dict[str, FrameStreamer] = {}
 
     def on_game_start(self, agents: list[str], imposter: str) -> None:
         self.chain.on_game_start(agents, imposter)
@@ -224,14 +242,32 @@ class LegacyEventRuntime:
     def on_game_actually_start(self) -> None:
         self.chain.on_game_actually_start()
 
-    def stream_frame(self, surface: pg.Surface) -> None:
-        self.frame_streamer.submit(surface)
+    def set_tick(self, tick: int) -> None:
+        self.tick = tick
+        self.emitter.tick = tick
+
+    def _streamer(self, feed: str) -> FrameStreamer:
+        if feed == MAIN_FEED:
+            return self.frame_streamer
+        streamer = self.feed_streamers.get(feed)
+        if streamer is None:
+            streamer = self.frame_streamer_cls(game_id=self.bridge_game_id, feed=feed)
+            self.feed_streamers[feed] = streamer
+        return streamer
+
+    def stream_wanted(self, feed: str = MAIN_FEED) -> bool:
+        # Opens the feed's stream on first ask, so the bridge can list it
+        return self._streamer(feed).wants_frame()
+
+    def stream_frame(self, surface: pg.Surface, feed: str = MAIN_FEED) -> None:
+        self._streamer(feed).submit(surface, tick=self.tick)
 
     def close(self) -> None:
-        try:
-            self.frame_streamer.close()
-        except Exception:
-            pass
+        for streamer in [self.frame_streamer, *self.feed_streamers.values()]:
+            try:
+                streamer.close()
+            except Exception:
+                pass
         try:
             self.emitter.close()
         except Exception:
@@ -1,5 +1,7 @@
 import pygame
 
+from palette import agent_sprites
+
 # define some colors (R, G, B)
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -201,371 +203,66 @@ RIGHT_MOUSE_BUTTON = 3
 
 
 # PLAYER SPRITES MOVEMENTS ----------------------------
-# Red Player Movements
-# Player left movement
-red_player_imgs_left = []
-# loops 1 to N-1
-for i in range(1, 18):
-    red_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Red/red_left_walk/'+'step'+str(i)+'.png'))
-# loops 1 to N-1
-for i in range(0, 17):
-    red_player_imgs_left[i] = pygame.transform.smoothscale(red_player_imgs_left[i], (64, 86))
-
-# Player right movement
-red_player_imgs_right = []
-# loops 1 to 17
-for i in range(1, 18):
-    red_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Red/red_right_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    red_player_imgs_right[i] = pygame.transform.smoothscale(red_player_imgs_right[i], (64, 86))
-
-
-# Player down movement
-red_player_imgs_down = []
-for i in range(1, 19):
-    red_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Red/red_down_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 18):
-    red_player_imgs_down[i] = pygame.transform.smoothscale(red_player_imgs_down[i], (64, 86))
-
-# Player Up movement
-red_player_imgs_up = []
-# loops 1 to 16
-for i in range(1, 18):
-    red_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Red/red_up_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    red_player_imgs_up[i] = pygame.transform.smoothscale(red_player_imgs_up[i], (64, 86))
-
-red_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadred.png')
-
-red_player_imgs_ghost_left = pygame.image.load('Assets/Images/Player/Red/red_ghost/step1_left.png')
-red_player_imgs_ghost_left = pygame.transform.smoothscale(red_player_imgs_ghost_left, (64, 86))
-
-red_player_imgs_ghost_right = pygame.image.load('Assets/Images/Player/Red/red_ghost/step1_right.png')
-red_player_imgs_ghost_right = pygame.transform.smoothscale(red_player_imgs_ghost_right, (64, 86))
+# Every colour is palette-swapped from the single Red mask rig (see palette.py),
+# so the walk cycle is decoded once no matter how many colours are in play.
+# The names below are kept for Player and the eval-based sync strings in game.py;
+# other colours are generated on demand through agent_sprites().
+_red_sprites = agent_sprites("Red")
+red_player_imgs_left = _red_sprites["left"]
+red_player_imgs_right = _red_sprites["right"]
+red_player_imgs_down = _red_sprites["down"]
+red_player_imgs_up = _red_sprites["up"]
+red_player_imgs_dead = _red_sprites["dead"]
+red_player_imgs_ghost_left = _red_sprites["ghost_left"]
+red_player_imgs_ghost_right = _red_sprites["ghost_right"]
+
+_blue_sprites = agent_sprites("Blue")
+blue_player_imgs_left = _blue_sprites["left"]
+blue_player_imgs_right = _blue_sprites["right"]
+blue_player_imgs_down = _blue_sprites["down"]
+blue_player_imgs_up = _blue_sprites["up"]
+blue_player_imgs_dead = _blue_sprites["dead"]
+blue_player_imgs_ghost_left = _blue_sprites["ghost_left"]
+blue_player_imgs_ghost_right = _blue_sprites["ghost_right"]
+
+_green_sprites = agent_sprites("Green")
+green_player_imgs_left = _green_sprites["left"]
+green_player_imgs_right = _green_sprites["right"]
+green_player_imgs_down = _green_sprites["down"]
+green_player_imgs_up = _green_sprites["up"]
+green_player_imgs_dead = _green_sprites["dead"]
+green_player_imgs_ghost_left = _green_sprites["ghost_left"]
+green_player_imgs_ghost_right = _green_sprites["ghost_right"]
+
+_orange_sprites = agent_sprites("Orange")
+orange_player_imgs_left = _orange_sprites["left"]
+orange_player_imgs_right = _orange_sprites["right"]
+orange_player_imgs_down = _orange_sprites["down"]
+orange_player_imgs_up = _orange_sprites["up"]
+orange_player_imgs_dead = _orange_sprites["dead"]
+orange_player_imgs_ghost_left = _orange_sprites["ghost_left"]
+orange_player_imgs_ghost_right = _orange_sprites["ghost_right"]
+
+_yellow_sprites = agent_sprites("Yellow")
+yellow_player_imgs_left = _yellow_sprites["left"]
+yellow_player_imgs_right = _yellow_sprites["right"]
+yellow_player_imgs_down = _yellow_sprites["down"]
+yellow_player_imgs_up = _yellow_sprites["up"]
+yellow_player_imgs_dead = _yellow_sprites["dead"]
+yellow_player_imgs_ghost_left = _yellow_sprites["ghost_left"]
+yellow_player_imgs_ghost_right = _yellow_sprites["ghost_right"]
 
 red_player_emergency_meeting = pygame.image.load('Assets/Images/Alerts/emergency_meeting_red.png')
-red_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_red.png')
-
-# Blue Player Movements-----------------
-# Player left movement
-blue_player_imgs_left = []
-# loops 1 to N-1
-for i in range(1, 18):
-    blue_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Blue/blue_left_walk/'+'step'+str(i)+'.png'))
-# loops 1 to N-1
-for i in range(0, 17):
-    blue_player_imgs_left[i] = pygame.transform.smoothscale(blue_player_imgs_left[i], (64, 86))
-
-
-# Player right movement
-blue_player_imgs_right = []
-# loops 1 to 17
-for i in range(1, 18):
-    blue_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Blue/blue_right_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    blue_player_imgs_right[i] = pygame.transform.smoothscale(blue_player_imgs_right[i], (64, 86))
-
-
-# Player down movement
-blue_player_imgs_down = []
-for i in range(1, 19):
-    blue_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Blue/blue_down_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 18):
-    blue_player_imgs_down[i] = pygame.transform.smoothscale(blue_player_imgs_down[i], (64, 86))
-
-# Player Up movement
-blue_player_imgs_up = []
-# loops 1 to 16
-for i in range(1, 18):
-    blue_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Blue/blue_up_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    blue_player_imgs_up[i] = pygame.transform.smoothscale(blue_player_imgs_up[i], (64, 86))
-
-blue_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadblue.png')
-
-blue_player_imgs_ghost_left = pygame.image.load('Assets/Images/Player/Blue/blue_ghost/step1_left.png')
-blue_player_imgs_ghost_left = pygame.transform.smoothscale(blue_player_imgs_ghost_left, (64, 86))
-
-blue_player_imgs_ghost_right = pygame.image.load('Assets/Images/Player/Blue/blue_ghost/step1_right.png')
-blue_player_imgs_ghost_right = pygame.transform.smoothscale(blue_player_imgs_ghost_right, (64, 86))
+red_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_red.PNG')
 
 blue_player_emergency_meeting = pygame.image.load('Assets/Images/Alerts/emergency_meeting_blue.png')
-blue_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_blue.png')
-
-# Green Player Movements-----------------
-# Player left movement
-green_player_imgs_left = []
-# loops 1 to N-1
-for i in range(1, 18):
-    green_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Green/green_left_walk/'+'step'+str(i)+'.png'))
-# loops 1 to N-1
-for i in range(0, 17):
-    green_player_imgs_left[i] = pygame.transform.smoothscale(green_player_imgs_left[i], (64, 86))
-
-
-# Player right movement
-green_player_imgs_right = []
-# loops 1 to 17
-for i in range(1, 18):
-    green_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Green/green_right_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    green_player_imgs_right[i] = pygame.transform.smoothscale(green_player_imgs_right[i], (64, 86))
-
-
-# Player down movement
-green_player_imgs_down = []
-for i in range(1, 19):
-    green_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Green/green_down_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 18):
-    green_player_imgs_down[i] = pygame.transform.smoothscale(green_player_imgs_down[i], (64, 86))
-
-# Player Up movement
-green_player_imgs_up = []
-# loops 1 to 16
-for i in range(1, 18):
-    green_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Green/green_up_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    green_player_imgs_up[i] = pygame.transform.smoothscale(green_player_imgs_up[i], (64, 86))
-
-green_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadgreen.png')
-
-green_player_imgs_ghost_left = pygame.image.load('Assets/Images/Player/Green/green_ghost/step1_left.png')
-green_player_imgs_ghost_left = pygame.transform.smoothscale(green_player_imgs_ghost_left, (64, 86))
-
-green_player_imgs_ghost_right = pygame.image.load('Assets/Images/Player/Green/green_ghost/step1_right.png')
-green_player_imgs_ghost_right = pygame.transform.smoothscale(green_player_imgs_ghost_right, (64, 86))
+blue_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_blue.PNG')
 
 green_player_emergency_meeting = pygame.image.load('Assets/Images/Alerts/emergency_meeting_green.png')
 green_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_green.png')
 
-# Orange Player Movements-----------------
-# Player left movement
-orange_player_imgs_left = []
-# loops 1 to N-1
-for i in range(1, 18):
-    orange_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Orange/orange_left_walk/'+'step'+str(i)+'.png'))
-# loops 1 to N-1
-for i in range(0, 17):
-    orange_player_imgs_left[i] = pygame.transform.smoothscale(orange_player_imgs_left[i], (64, 86))
-
-
-# Player right movement
-orange_player_imgs_right = []
-# loops 1 to 17
-for i in range(1, 18):
-    orange_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Orange/orange_right_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    orange_player_imgs_right[i] = pygame.transform.smoothscale(orange_player_imgs_right[i], (64, 86))
-
-
-# Player down movement
-orange_player_imgs_down = []
-for i in range(1, 19):
-    orange_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Orange/orange_down_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 18):
-    orange_player_imgs_down[i] = pygame.transform.smoothscale(orange_player_imgs_down[i], (64, 86))
-
-# Player Up movement
-orange_player_imgs_up = []
-# loops 1 to 16
-for i in range(1, 18):
-    orange_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Orange/orange_up_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    orange_player_imgs_up[i] = pygame.transform.smoothscale(orange_player_imgs_up[i], (64, 86))
-
-orange_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadorange.png')
-
-orange_player_imgs_ghost_left = pygame.image.load('Assets/Images/Player/Orange/orange_ghost/step1_left.png')
-orange_player_imgs_ghost_left = pygame.transform.smoothscale(orange_player_imgs_ghost_left, (64, 86))
-
-orange_player_imgs_ghost_right = pygame.image.load('Assets/Images/Player/Orange/orange_ghost/step1_right.png')
-orange_player_imgs_ghost_right = pygame.transform.smoothscale(orange_player_imgs_ghost_right, (64, 86))
-
 orange_player_emergency_meeting = pygame.image.load('Assets/Images/Alerts/emergency_meeting_orange.png')
 orange_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_orange.png')
 
-# Yellow Player Movements-----------------
-# Player left movement
-yellow_player_imgs_left = []
-# loops 1 to N-1
-for i in range(1, 18):
-    yellow_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Yellow/yellow_left_walk/'+'step'+str(i)+'.png'))
-# loops 1 to N-1
-for i in range(0, 17):
-    yellow_player_imgs_left[i] = pygame.transform.smoothscale(yellow_player_imgs_left[i], (64, 86))
-
-
-# Player right movement
-yellow_player_imgs_right = []
-# loops 1 to 17
-for i in range(1, 18):
-    yellow_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Yellow/yellow_right_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    yellow_player_imgs_right[i] = pygame.transform.smoothscale(yellow_player_imgs_right[i], (64, 86))
-
-
-# Player down movement
-yellow_player_imgs_down = []
-for i in range(1, 19):
-    yellow_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Yellow/yellow_down_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 18):
-    yellow_player_imgs_down[i] = pygame.transform.smoothscale(yellow_player_imgs_down[i], (64, 86))
-
-# Player Up movement
-yellow_player_imgs_up = []
-# loops 1 to 16
-for i in range(1, 18):
-    yellow_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Yellow/yellow_up_walk/'+'step'+str(i)+'.png'))
-# loops 1 to 16
-for i in range(0, 17):
-    yellow_player_imgs_up[i] = pygame.transform.smoothscale(yellow_player_imgs_up[i], (64, 86))
-    
-yellow_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadyellow.png')
-
-yellow_player_imgs_ghost_left = pygame.image.load('Assets/Images/Player/Yellow/yellow_ghost/step1_left.png')
-yellow_player_imgs_ghost_left = pygame.transform.smoothscale(yellow_player_imgs_ghost_left, (64, 86))
-
-yellow_player_imgs_ghost_right = pygame.image.load('Assets/Images/Player/Yellow/yellow_ghost/step1_right.png')
-yellow_player_imgs_ghost_right = pygame.transform.smoothscale(yellow_player_imgs_ghost_right, (64, 86))
-
 yellow_player_emergency_meeting = pygame.image.load('Assets/Images/Alerts/emergency_meeting_yellow.png')
 yellow_player_emergency_meeting_report = pygame.image.load('Assets/Images/Alerts/report_dead_body_yellow.png')
-
-
-# Black Player Movements-----------------
-# Player left movement
-black_player_imgs_left = []
-black_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Black/black_left_walk/step1.png'))
-black_player_imgs_left[0] = pygame.transform.smoothscale(black_player_imgs_left[0], (64, 86))
-
-
-# Player right movement
-black_player_imgs_right = []
-black_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Black/black_right_walk/step1.png'))
-black_player_imgs_right[0] = pygame.transform.smoothscale(black_player_imgs_right[0], (64, 86))
-
-# Player down movement
-black_player_imgs_down = []
-black_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Black/black_down_walk/step1.png'))
-black_player_imgs_down[0] = pygame.transform.smoothscale(black_player_imgs_down[0], (64, 86))
-
-# Player Up movement
-black_player_imgs_up = []
-black_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Black/black_up_walk/step1.png'))
-black_player_imgs_up[0] = pygame.transform.smoothscale(black_player_imgs_up[0], (64, 86))
-    
-black_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadblack.png')
-
-
-# Brown Player Movements-----------------
-# Player left movement
-brown_player_imgs_left = []
-brown_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Brown/brown_left_walk/step1.png'))
-brown_player_imgs_left[0] = pygame.transform.smoothscale(brown_player_imgs_left[0], (64, 86))
-
-
-# Player right movement
-brown_player_imgs_right = []
-brown_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Brown/brown_right_walk/step1.png'))
-brown_player_imgs_right[0] = pygame.transform.smoothscale(brown_player_imgs_right[0], (64, 86))
-
-# Player down movement
-brown_player_imgs_down = []
-brown_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Brown/brown_down_walk/step1.png'))
-brown_player_imgs_down[0] = pygame.transform.smoothscale(brown_player_imgs_down[0], (64, 86))
-
-# Player Up movement
-brown_player_imgs_up = []
-brown_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Brown/brown_up_walk/step1.png'))
-brown_player_imgs_up[0] = pygame.transform.smoothscale(brown_player_imgs_up[0], (64, 86))
-    
-brown_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadbrown.png')
-
-
-# Pink Player Movements-----------------
-# Player left movement
-pink_player_imgs_left = []
-pink_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Pink/pink_left_walk/step1.png'))
-pink_player_imgs_left[0] = pygame.transform.smoothscale(pink_player_imgs_left[0], (64, 86))
-
-
-# Player right movement
-pink_player_imgs_right = []
-pink_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Pink/pink_right_walk/step1.png'))
-pink_player_imgs_right[0] = pygame.transform.smoothscale(pink_player_imgs_right[0], (64, 86))
-
-# Player down movement
-pink_player_imgs_down = []
-pink_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Pink/pink_down_walk/step1.png'))
-pink_player_imgs_down[0] = pygame.transform.smoothscale(pink_player_imgs_down[0], (64, 86))
-
-# Player Up movement
-pink_player_imgs_up = []
-pink_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Pink/pink_up_walk/step1.png'))
-pink_player_imgs_up[0] = pygame.transform.smoothscale(pink_player_imgs_up[0], (64, 86))
-    
-pink_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/Deadpink.png')
-
-
-# Purple Player Movements-----------------
-# Player left movement
-purple_player_imgs_left = []
-purple_player_imgs_left.append(pygame.image.load('Assets/Images/Player/Purple/Purple_left_walk/step1.png'))
-purple_player_imgs_left[0] = pygame.transform.smoothscale(purple_player_imgs_left[0], (64, 86))
-
-
-# Player right movement
-purple_player_imgs_right = []
-purple_player_imgs_right.append(pygame.image.load('Assets/Images/Player/Purple/Purple_right_walk/step1.png'))
-purple_player_imgs_right[0] = pygame.transform.smoothscale(purple_player_imgs_right[0], (64, 86))
-
-# Player down movement
-purple_player_imgs_down = []
-purple_player_imgs_down.append(pygame.image.load('Assets/Images/Player/Purple/Purple_down_walk/step1.png'))
-purple_player_imgs_down[0] = pygame.transform.smoothscale(purple_player_imgs_down[0], (64, 86))
-
-# Player Up movement
-purple_player_imgs_up = []
-purple_player_imgs_up.append(pygame.image.load('Assets/Images/Player/Purple/Purple_up_walk/step1.png'))
-purple_player_imgs_up[0] = pygame.transform.smoothscale(purple_player_imgs_up[0], (64, 86))
-    
-purple_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/DeadPurple.png')
-
-
-# White Player Movements-----------------
-# Player left movement
-white_player_imgs_left = []
-white_player_imgs_left.append(pygame.image.load('Assets/Images/Player/White/White_left_walk/step1.png'))
-white_player_imgs_left[0] = pygame.transform.smoothscale(white_player_imgs_left[0], (64, 86))
-
-
-# Player right movement
-white_player_imgs_right = []
-white_player_imgs_right.append(pygame.image.load('Assets/Images/Player/White/White_right_walk/step1.png'))
-white_player_imgs_right[0] = pygame.transform.smoothscale(white_player_imgs_right[0], (64, 86))
-
-# Player down movement
-white_player_imgs_down = []
-white_player_imgs_down.append(pygame.image.load('Assets/Images/Player/White/White_down_walk/step1.png'))
-white_player_imgs_down[0] = pygame.transform.smoothscale(white_player_imgs_down[0], (64, 86))
-
-# Player Up movement
-white_player_imgs_up = []
-white_player_imgs_up.append(pygame.image.load('Assets/Images/Player/White/White_up_walk/step1.png'))
-white_player_imgs_up[0] = pygame.transform.smoothscale(white_player_imgs_up[0], (64, 86))
-    
-white_player_imgs_dead = pygame.image.load('Assets/Images/Player/Dead/DeadWhite.png')
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+Shared-memory frame streaming — JPEG encoding and sending in another process.
+
+FrameStreamer encodes and sends on threads of the game process, where the
+websockets client and the Python side of Pillow still compete with the game
+loop for the interpreter. SharedMemoryFrameStreamer keeps only the pixel
+copy in the game process:
+
+  game process   writes the frame into a slot of a shared-memory ring
+  encoder process  picks up the newest complete slot, encodes and sends it
+                   (an ordinary FrameStreamer living in that process, so
+                   its adaptive operating point applies here too)
+
+Ring layout (multiprocessing.shared_memory):
+
+  header  latest_seq, latest_slot, reading_slot, closed,
+          capture_interval_us                                (u64 each)
+  slot i  seq, width, height, stride, rawmode, tick (u64 each),
+          captured_at (f64)                          + pixel bytes
+
+capture_interval_us is written by the encoder process from its streamer's
+frame rate and viewer demand, so the game process copies frames only as
+often as they will actually be encoded (rarely while nobody watches).
+
+Hand-off is lock-free and latest-frame-wins. The writer never reuses the
+slot it last published or the one the reader announced it is copying; each
+slot's seq works as a seqlock (0 while being written), so a reader that
+still races a rewrite sees the seq change and simply drops that frame.
+
+Enable with SUS_STREAM_ENCODER=process (default: thread).
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import pygame
+
+from frame_streamer import (
+    FRAME_INTERVAL,
+    PIL_AVAILABLE,
+    FrameStreamer,
+    _RAW_MODES,
+    _put_latest,
+    capture_size,
+)
+
+RING_SLOTS = 3
+POLL_INTERVAL = 0.004   # encoder poll period while no new frame is published
+
+_HEADER = struct.Struct("<5Q")          # latest_seq, latest_slot, reading_slot, closed, interval
+_SLOT_HEADER = struct.Struct("<6Qd")    # seq, width, height, stride, rawmode, tick, captured_at
+_HEADER_SIZE = 64
+_SLOT_HEADER_SIZE = 64
+_NO_SLOT = 2 ** 64 - 1
+
+# Slot rawmode codes; 0 means tightly packed RGB
+_RAWMODE_CODES = {"RGB": 0, "BGRX": 1, "RGBX": 2}
+_RAWMODE_NAMES = {code: name for name, code in _RAWMODE_CODES.items()}
+
+
+def stream_encoder_mode(default: str = "thread") -> str:
+    """Read SUS_STREAM_ENCODER ("thread" or "process")."""
+    value = os.environ.get("SUS_STREAM_ENCODER", "").strip().lower()
+    return value if value in {"thread", "process"} else default
+
+
+class FrameRing:
+    """Fixed-size ring of frame slots in one shared-memory block."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, slot_bytes: int):
+        self.shm = shm
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._buf = shm.buf
+
+    @classmethod
+    def create(cls, slots: int = RING_SLOTS, slot_bytes: Optional[int] = None) -> "FrameRing":
+        if slot_bytes is None:
+            width, height = capture_size()
+            slot_bytes = width * height * 4
+        size = _HEADER_SIZE + slots * (_SLOT_HEADER_SIZE + slot_bytes)
+        ring = cls(shared_memory.SharedMemory(create=True, size=size), slots, slot_bytes)
+        _HEADER.pack_into(ring._buf, 0, 0, _NO_SLOT, _NO_SLOT, 0, int(FRAME_INTERVAL * 1e6))
+        for i in range(slots):
+            _SLOT_HEADER.pack_into(ring._buf, ring._slot_offset(i), 0, 0, 0, 0, 0, 0, 0.0)
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, slots: int, slot_bytes: int) -> "FrameRing":
+        return cls(shared_memory.SharedMemory(name=name), slots, slot_bytes)
+
+    def _slot_offset(self, index: int) -> int:
+        return _HEADER_SIZE + index * (_SLOT_HEADER_SIZE + self.slot_bytes)
+
+    def _header(self) -> Tuple[int, int, int, int, int]:
+        return _HEADER.unpack_from(self._buf, 0)
+
+    # ------------------------------------------------------------------
+    # Writer (game process)
+    # ------------------------------------------------------------------
+
+    def write(self, seq: int, pixels, size: Tuple[int, int], stride: int, rawmode: str,
+              tick: int = 0, captured_at: float = 0.0) -> bool:
+        """Copy one frame into a free slot and publish it as the latest."""
+        pixels = memoryview(pixels).cast("B")
+        nbytes = pixels.nbytes
+        if nbytes > self.slot_bytes:
+            return False
+        _, latest_slot, reading_slot, _, _ = self._header()
+        index = next(i for i in range(self.slots) if i not in (latest_slot, reading_slot))
+
+        offset = self._slot_offset(index)
+        data = offset + _SLOT_HEADER_SIZE
+        _SLOT_HEADER.pack_into(self._buf, offset, 0, 0, 0, 0, 0, 0, 0.0)   # mark torn
+        self._buf[data:data + nbytes] = pixels
+        _SLOT_HEADER.pack_into(self._buf, offset, seq, size[0], size[1], stride,
+                               _RAWMODE_CODES[rawmode], tick, captured_at)
+        struct.pack_into("<2Q", self._buf, 0, seq, index)
+        return True
+
+    def close_stream(self):
+        struct.pack_into("<Q", self._buf, 24, 1)
+
+    @property
+    def capture_interval(self) -> float:
+        return self._header()[4] / 1e6
+
+    # ------------------------------------------------------------------
+    # Reader (encoder process)
+    # ------------------------------------------------------------------
+
+    @property
+    def closed(self) -> bool:
+        return bool(self._header()[3])
+
+    def read_latest(self, after_seq: int) -> Optional[tuple]:
+        """
+        Copy out the newest published frame newer than `after_seq`.
+
+        Returns (seq, ((data, size, rawmode, stride), tick, captured_at)) —
+        the frame as FrameStreamer queues it — or None when there is nothing
+        new or the slot was rewritten while being copied.
+        """
+        seq, index, _, _, _ = self._header()
+        if seq <= after_seq or index == _NO_SLOT:
+            return None
+        struct.pack_into("<Q", self._buf, 16, index)   # announce reading slot
+        offset = self._slot_offset(index)
+        slot_seq, width, height, stride, code, tick, captured_at = \
+            _SLOT_HEADER.unpack_from(self._buf, offset)
+        if slot_seq != seq:
+            return None
+        rawmode = _RAWMODE_NAMES[code]
+        nbytes = (stride or width * 3) * height
+        data = offset + _SLOT_HEADER_SIZE
+        pixels = bytes(self._buf[data:data + nbytes])
+        if _SLOT_HEADER.unpack_from(self._buf, offset)[0] != seq:
+            return None                                 # torn by the writer
+        return seq, ((pixels, (width, height), rawmode, stride), tick, captured_at)
+
+    def set_capture_interval(self, seconds: float):
+        struct.pack_into("<Q", self._buf, 32, int(seconds * 1e6))
+
+    def close(self):
+        self._buf = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def _encoder_main(shm_name: str, slots: int, slot_bytes: int, game_id: str, feed: str):
+    """Encoder process: poll the ring and feed a FrameStreamer living here."""
+    ring = FrameRing.attach(shm_name, slots, slot_bytes)
+    streamer = FrameStreamer(game_id=game_id, feed=feed)
+    parent = mp.parent_process()
+    last_seq = 0
+    try:
+        while not ring.closed and (parent is None or parent.is_alive()):
+            ring.set_capture_interval(streamer.capture_interval())
+            got = ring.read_latest(last_seq)
+            if got is None:
+                time.sleep(POLL_INTERVAL)
+                continue
+            last_seq, frame = got
+            # The child's controller sets the frame rate actually encoded
+            if streamer.frame_due() and _put_latest(streamer._raw_q, frame):
+                streamer.controller.record_drop()
+    finally:
+        streamer.close()
+        ring.close()
+
+
+class SharedMemoryFrameStreamer:
+    """
+    Drop-in FrameStreamer replacement that encodes in a separate process.
+
+    submit() does the frame copy into shared memory and nothing else.
+    """
+
+    def __init__(self, game_id: str = "game-001", feed: str = "main"):
+        self.game_id = game_id
+        self.feed = feed
+        self._size = capture_size()
+        self._ring = FrameRing.create(slot_bytes=self._size[0] * self._size[1] * 4)
+        self._seq = 0
+        self._last_capture = 0.0
+        ctx = mp.get_context("spawn")
+        self._process = ctx.Process(
+            target=_encoder_main,
+            args=(self._ring.shm.name, self._ring.slots, self._ring.slot_bytes, game_id, feed),
+            daemon=True,
+            name=f"FrameEncoder-{feed}",
+        )
+        self._process.start()
+
+    def wants_frame(self) -> bool:
+        return time.monotonic() - self._last_capture >= self._ring.capture_interval
+
+    def submit(self, surface: pygame.Surface, tick: int = 0):
+        """Call from the game draw loop each frame. Rate-limited by the encoder process."""
+        now = time.monotonic()
+        if now - self._last_capture < self._ring.capture_interval:
+            return
+        self._last_capture = now
+
+        try:
+            if surface.get_size() != self._size:
+                surface = pygame.transform.smoothscale(surface, self._size)
+            rawmode = None
+            if PIL_AVAILABLE and surface.get_bitsize() == 32:
+                rawmode = _RAW_MODES.get(surface.get_shifts()[:3])
+            self._seq += 1
+            if rawmode is not None:
+                # Straight from the surface buffer into shared memory
+                self._ring.write(self._seq, surface.get_buffer(), surface.get_size(),
+                                 surface.get_pitch(), rawmode, tick, time.time())
+            else:
+                self._ring.write(self._seq, pygame.image.tobytes(surface, "RGB"),
+                                 surface.get_size(), 0, "RGB", tick, time.time())
+        except Exception:
+            return
+
+    def close(self):
+        self._ring.close_stream()
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._ring.close()
+        try:
+            self._ring.unlink()
+        except FileNotFoundError:
+            pass
@@ -3,6 +3,7 @@ import pygame as pg
 from os import path
 import sys
 from settings import *
+from palette import agent_sprites
 vec = pg.math.Vector2
 from os import path
 import random
@@ -309,130 +310,10 @@ class Bot(pg.sprite.Sprite):
         self.bot_direction = bot_direction
         self.bot_colour = bot_colour
         
-        if bot_direction == "Left":
-            if bot_colour == "Red":
-                self.image = red_player_imgs_left[0]
-                self.dead_player_img = red_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Blue":
-                self.image = blue_player_imgs_left[0]
-                self.dead_player_img = blue_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Orange":
-                self.image = orange_player_imgs_left[0]
-                self.dead_player_img = orange_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Yellow":
-                self.image = yellow_player_imgs_left[0]
-                self.dead_player_img = yellow_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Green":
-                self.image = green_player_imgs_left[0]
-                self.dead_player_img = green_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Black":
-                self.image = black_player_imgs_left[0]
-                self.dead_player_img = black_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Brown":
-                self.image = brown_player_imgs_left[0]
-                self.dead_player_img = brown_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Pink":
-                self.image = pink_player_imgs_left[0]
-                self.dead_player_img = pink_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Purple":
-                self.image = purple_player_imgs_left[0]
-                self.dead_player_img = purple_player_imgs_dead.convert_alpha()
-            elif bot_colour == "White":
-                self.image = white_player_imgs_left[0]
-                self.dead_player_img = white_player_imgs_dead.convert_alpha()
-        elif bot_direction == "Right":
-            if bot_colour == "Red":
-                self.image = red_player_imgs_right[0]
-                self.dead_player_img = red_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Blue":
-                self.image = blue_player_imgs_right[0]
-                self.dead_player_img = blue_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Orange":
-                self.image = orange_player_imgs_right[0]
-                self.dead_player_img = orange_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Yellow":
-                self.image = yellow_player_imgs_right[0]
-                self.dead_player_img = yellow_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Green":
-                self.image = green_player_imgs_right[0]
-                self.dead_player_img = green_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Black":
-                self.image = black_player_imgs_right[0]
-                self.dead_player_img = black_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Brown":
-                self.image = brown_player_imgs_right[0]
-                self.dead_player_img = brown_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Pink":
-                self.image = pink_player_imgs_right[0]
-                self.dead_player_img = pink_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Purple":
-                self.image = purple_player_imgs_right[0]
-                self.dead_player_img = purple_player_imgs_dead.convert_alpha()
-            elif bot_colour == "White":
-                self.image = white_player_imgs_right[0]
-                self.dead_player_img = white_player_imgs_dead.convert_alpha()
-        elif bot_direction == "Up":
-            if bot_colour == "Red":
-                self.image = red_player_imgs_up[0]
-                self.dead_player_img = red_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Blue":
-                self.image = blue_player_imgs_up[0]
-                self.dead_player_img = blue_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Orange":
-                self.image = orange_player_imgs_up[0]
-                self.dead_player_img = orange_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Yellow":
-                self.image = yellow_player_imgs_up[0]
-                self.dead_player_img = yellow_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Green":
-                self.image = green_player_imgs_up[0]
-                self.dead_player_img = green_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Black":
-                self.image = black_player_imgs_up[0]
-                self.dead_player_img = black_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Brown":
-                self.image = brown_player_imgs_up[0]
-                self.dead_player_img = brown_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Pink":
-                self.image = pink_player_imgs_up[0]
-                self.dead_player_img = pink_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Purple":
-                self.image = purple_player_imgs_up[0]
-                self.dead_player_img = purple_player_imgs_dead.convert_alpha()
-            elif bot_colour == "White":
-                self.image = white_player_imgs_up[0]
-                self.dead_player_img = white_player_imgs_dead.convert_alpha()
-        elif bot_direction == "Down":
-            if bot_colour == "Red":
-                self.image = red_player_imgs_down[0]
-                self.dead_player_img = red_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Blue":
-                self.image = blue_player_imgs_down[0]
-                self.dead_player_img = blue_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Orange":
-                self.image = orange_player_imgs_down[0]
-                self.dead_player_img = orange_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Yellow":
-                self.image = yellow_player_imgs_down[0]
-                self.dead_player_img = yellow_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Green":
-                self.image = green_player_imgs_down[0]
-                self.dead_player_img = green_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Black":
-                self.image = black_player_imgs_down[0]
-                self.dead_player_img = black_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Brown":
-                self.image = brown_player_imgs_down[0]
-                self.dead_player_img = brown_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Pink":
-                self.image = pink_player_imgs_down[0]
-                self.dead_player_img = pink_player_imgs_dead.convert_alpha()
-            elif bot_colour == "Purple":
-                self.image = purple_player_imgs_down[0]
-                self.dead_player_img = purple_player_imgs_dead.convert_alpha()
-            elif bot_colour == "White":
-                self.image = white_player_imgs_down[0]
-                self.dead_player_img = white_player_imgs_dead.convert_alpha()
+        # Sprites are palette-swapped per colour, so any bot colour works
+        sprites = agent_sprites(bot_colour)
+        self.image = sprites[bot_direction.lower()][0]
+        self.dead_player_img = sprites["dead"].convert_alpha()
         
         self.rect = self.image.get_rect()
         self.hit_rect = self.rect
@@ -0,0 +1,148 @@
+"""
+Video stream wire format shared by FrameStreamer and the bridge.
+
+Every binary message on /ws/stream and /ws/video is one of:
+
+  keyframe  a complete JPEG (or PNG without Pillow), exactly as before
+  delta     changed tiles of the previous frame:
+
+              "SUSD" | width u16 | height u16 | tile count u16
+              per tile: x u16 | y u16 | w u16 | h u16 | length u32 | JPEG
+
+All integers are little-endian. A delta only makes sense on top of the
+keyframe (and deltas) before it at the same size, so a viewer has to start
+from a keyframe; the bridge holds deltas back from new subscribers until
+the next one arrives.
+
+Both are preceded by a frame header that the bridge passes through:
+
+  "SUSF" | seq u32 | tick u32 | captured_at f64 | encode_us u32
+
+seq counts the messages of one rendition (a gap is a dropped frame), tick
+is the game tick the frame shows, captured_at the wall-clock time
+(time.time()) it was captured and encode_us how long encoding took.
+
+The game engine encodes several renditions of each frame (RENDITIONS,
+best first) and tags each message on /ws/stream with its rendition:
+
+  "SUSR" | name length u8 | name | frame header | keyframe or delta
+
+The bridge strips the tag and forwards each viewer one rendition, so
+/ws/video carries frame header + keyframe or delta. Untagged messages
+belong to DEFAULT_RENDITION; messages without a frame header are still
+accepted.
+
+On the multiplexed /ws/topics socket, video of several feeds shares one
+connection, so each binary message names its topic ("video:<game>/<feed>"):
+
+  "SUST" | topic length u8 | topic (UTF-8) | frame header | keyframe or delta
+"""
+from __future__ import annotations
+
+import struct
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+RENDITIONS = ("high", "medium", "low")
+DEFAULT_RENDITION = "medium"
+
+DELTA_MAGIC = b"SUSD"
+RENDITION_MAGIC = b"SUSR"
+TOPIC_MAGIC = b"SUST"
+FRAME_MAGIC = b"SUSF"
+_FRAME_HEADER = struct.Struct("<4sIIdI")  # magic, seq, tick, captured_at, encode_us
+_DELTA_HEADER = struct.Struct("<4sHHH")   # magic, width, height, tile count
+_TILE_HEADER = struct.Struct("<HHHHI")    # x, y, w, h, JPEG length
+
+Tile = Tuple[int, int, int, int, bytes]   # x, y, w, h, JPEG
+
+
+class FrameHeader(NamedTuple):
+    seq: int
+    tick: int
+    captured_at: float
+    encode_us: int
+
+
+def is_delta(data: bytes) -> bool:
+    return data[:4] == DELTA_MAGIC
+
+
+def is_keyframe(data: bytes) -> bool:
+    return not is_delta(data)
+
+
+def pack_delta(size: Tuple[int, int], tiles: Iterable[Tile]) -> bytes:
+    tiles = list(tiles)
+    parts = [_DELTA_HEADER.pack(DELTA_MAGIC, size[0], size[1], len(tiles))]
+    for x, y, w, h, jpeg in tiles:
+        parts.append(_TILE_HEADER.pack(x, y, w, h, len(jpeg)))
+        parts.append(jpeg)
+    return b"".join(parts)
+
+
+def unpack_delta(data: bytes) -> Tuple[Tuple[int, int], List[Tile]]:
+    magic, width, height, count = _DELTA_HEADER.unpack_from(data, 0)
+    if magic != DELTA_MAGIC:
+        raise ValueError("not a delta frame")
+    offset = _DELTA_HEADER.size
+    tiles: List[Tile] = []
+    for _ in range(count):
+        x, y, w, h, length = _TILE_HEADER.unpack_from(data, offset)
+        offset += _TILE_HEADER.size
+        tiles.append((x, y, w, h, bytes(data[offset:offset + length])))
+        offset += length
+    return (width, height), tiles
+
+
+def merge_deltas(older: bytes, newer: bytes) -> bytes:
+    """
+    One delta with the effect of `older` followed by `newer` (tiles are
+    painted in order, so the later ones win where they overlap).
+    """
+    size, tiles = unpack_delta(older)
+    newer_size, newer_tiles = unpack_delta(newer)
+    if newer_size != size or len(tiles) + len(newer_tiles) > 0xFFFF:
+        raise ValueError("deltas cannot be merged")
+    return pack_delta(size, tiles + newer_tiles)
+
+
+def pack_frame_header(seq: int, tick: int, captured_at: float, encode_us: int) -> bytes:
+    return _FRAME_HEADER.pack(FRAME_MAGIC, seq & 0xFFFFFFFF, tick & 0xFFFFFFFF,
+                              captured_at, min(encode_us, 0xFFFFFFFF))
+
+
+def unpack_frame(data: bytes) -> Tuple[Optional[FrameHeader], bytes]:
+    """Split a frame into (header or None, keyframe or delta)."""
+    if data[:4] != FRAME_MAGIC:
+        return None, data
+    _, seq, tick, captured_at, encode_us = _FRAME_HEADER.unpack_from(data, 0)
+    return FrameHeader(seq, tick, captured_at, encode_us), data[_FRAME_HEADER.size:]
+
+
+def pack_rendition(rendition: str, *parts: bytes) -> bytes:
+    name = rendition.encode("ascii")
+    return b"".join((RENDITION_MAGIC, bytes((len(name),)), name, *parts))
+
+
+def unpack_rendition(data: bytes) -> Tuple[str, bytes]:
+    """Split a /ws/stream message into (rendition, keyframe or delta)."""
+    if data[:4] != RENDITION_MAGIC:
+        return DEFAULT_RENDITION, data
+    end = 5 + data[4]
+    return data[5:end].decode("ascii"), data[end:]
+
+
+def topic_tag(topic: str) -> bytes:
+    """What goes in front of a video message on /ws/topics."""
+    name = topic.encode()
+    if len(name) > 255:
+        raise ValueError(f"topic too long: {topic!r}")
+    return TOPIC_MAGIC + bytes((len(name),)) + name
+
+
+def unpack_topic(data: bytes) -> Tuple[Optional[str], bytes]:
+    """Split a /ws/topics binary message into (topic, frame); None if untagged."""
+    if data[:4] != TOPIC_MAGIC:
+        return None, data
+    end = 5 + data[4]
+    return data[5:end].decode(), data[end:]
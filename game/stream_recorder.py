@@ -0,0 +1,349 @@
+"""
+Stream recording — encoded video frames appended to disk as they go out.
+
+The bridge hands every frame of the recorded rendition to a StreamRecorder
+(one per game feed). Frames are stored exactly as viewers get them
+(frame header + keyframe or delta, see stream_format.py), so replays and
+clips come out of the recording without decoding or re-encoding anything.
+
+Layout, per feed:
+
+  {SUS_RECORDING_DIR}/{game_id}/{feed}/
+    seg-000000.sus   records: length u32 | frame     (up to SEGMENT_BYTES)
+    index.bin        one entry per keyframe:
+                     segment u32 | offset u32 | tick u32 | captured_at f64
+    meta.json        rendition, finished segment lengths, ended flag
+
+A recording starts at a keyframe; seeking goes through index.bin, since a
+segment may begin with deltas continuing the one before it.
+
+Segments are preallocated and memory-mapped, so an append is a copy into
+the page cache. Appends go through a queue to a writer thread and the live
+fan-out only pays for a put_nowait; if the writer falls behind, frames are
+dropped up to the next keyframe rather than recording a broken picture.
+
+Enable with SUS_RECORDING_DIR (default "recordings", empty/"off" disables).
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import queue
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from stream_format import DEFAULT_RENDITION, unpack_frame
+
+SEGMENT_BYTES = 64 * 1024 * 1024
+QUEUE_FRAMES = 256
+
+_RECORD_HEADER = struct.Struct("<I")        # frame length
+_INDEX_ENTRY = struct.Struct("<IIId")       # segment, offset, tick, captured_at
+_NAME = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]*")
+
+
+def recording_dir_from_env() -> Optional[Path]:
+    """Read SUS_RECORDING_DIR; None when recording is off."""
+    value = os.environ.get("SUS_RECORDING_DIR", "recordings").strip()
+    if not value or value.lower() in {"off", "0", "false", "no"}:
+        return None
+    return Path(value)
+
+
+def recording_rendition_from_env() -> str:
+    """Read SUS_RECORDING_RENDITION (default: the default rendition)."""
+    value = os.environ.get("SUS_RECORDING_RENDITION", "").strip().lower()
+    return value or DEFAULT_RENDITION
+
+
+def valid_name(name: str) -> bool:
+    """Game ids and feeds become directory names; keep them to plain ones."""
+    return bool(_NAME.fullmatch(name))
+
+
+def segment_name(number: int) -> str:
+    return f"seg-{number:06d}.sus"
+
+
+class IndexEntry(NamedTuple):
+    segment: int
+    offset: int
+    tick: int
+    captured_at: float
+
+
+class _Segment:
+    """One preallocated, memory-mapped segment file being written."""
+
+    def __init__(self, path: Path, size: int):
+        self.path = path
+        self.length = 0
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.posix_fallocate(self._fd, 0, size)   # real blocks, no page faults on sparse holes
+        except (AttributeError, OSError):
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._map)
+
+    def append(self, frame: bytes) -> int:
+        offset = self.length
+        start = offset + _RECORD_HEADER.size
+        self._map[start:start + len(frame)] = frame
+        _RECORD_HEADER.pack_into(self._map, offset, len(frame))
+        self.length = start + len(frame)
+        return offset
+
+    def close(self):
+        """Flush and cut the file down to what was written."""
+        self._map.flush()
+        self._map.close()
+        os.ftruncate(self._fd, self.length)
+        os.close(self._fd)
+
+
+class StreamRecorder:
+    """Appends one feed's frames to segmented files with a keyframe index."""
+
+    def __init__(self, root: Path, game_id: str, feed: str,
+                 rendition: str = DEFAULT_RENDITION, segment_bytes: int = SEGMENT_BYTES):
+        self.game_id = game_id
+        self.feed = feed
+        self.rendition = rendition
+        self.path = Path(root) / game_id / feed
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self.frames = 0
+        self.dropped = 0
+        self.needs_keyframe = True      # nothing decodable recorded since the last gap
+
+        meta = read_meta(self.path) or {}
+        self._lengths: List[int] = list(meta.get("segments", []))
+        self._segment: Optional[_Segment] = None
+        self._lock = threading.Lock()   # _lengths/_segment, read by the bridge
+        self._recover()
+        self._index = open(self.path / "index.bin", "ab")
+        self._q: queue.Queue = queue.Queue(maxsize=QUEUE_FRAMES)
+        self._write_meta(ended=False)
+        self._writer = threading.Thread(target=self._run, daemon=True,
+                                        name=f"StreamRecorder-{game_id}-{feed}")
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Live side (bridge event loop)
+    # ------------------------------------------------------------------
+
+    def append(self, frame: bytes, keyframe: bool):
+        """Queue one frame (header + keyframe or delta); never blocks."""
+        if self.needs_keyframe and not keyframe:
+            return
+        try:
+            self._q.put_nowait((frame, keyframe))
+            self.needs_keyframe = False
+        except queue.Full:
+            # Deltas after a gap would decode wrong; wait for a keyframe
+            self.dropped += 1
+            self.needs_keyframe = True
+
+    def switch_rendition(self, rendition: str):
+        """Record another rendition from its next keyframe on."""
+        if rendition != self.rendition:
+            self.rendition = rendition
+            self.needs_keyframe = True
+
+    def close(self):
+        """Flush everything queued and finish the recording (blocks)."""
+        self._q.put((None, False))
+        self._writer.join(timeout=5)
+
+    def segment_lengths(self) -> Dict[int, int]:
+        """Readable bytes per segment, the one being written included."""
+        with self._lock:
+            lengths = dict(enumerate(self._lengths))
+            if self._segment is not None:
+                lengths[len(lengths)] = self._segment.length
+        return lengths
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        try:
+            while True:
+                frame, keyframe = self._q.get()
+                if frame is None:
+                    break
+                self._write(frame, keyframe)
+        finally:
+            self._roll()
+            self._index.close()
+            self._write_meta(ended=True)
+
+    def _write(self, frame: bytes, keyframe: bool):
+        needed = _RECORD_HEADER.size + len(frame)
+        segment = self._segment
+        if segment is not None and segment.length + needed > segment.capacity:
+            self._roll()
+            segment = None
+        if segment is None:
+            segment = _Segment(self.path / segment_name(len(self._lengths)),
+                               max(self.segment_bytes, needed))
+            with self._lock:
+                self._segment = segment
+        offset = segment.append(frame)
+        self.frames += 1
+        if keyframe:
+            header, _ = unpack_frame(frame)
+            tick, captured_at = (header.tick, header.captured_at) if header else (0, time.time())
+            self._index.write(_INDEX_ENTRY.pack(len(self._lengths), offset, tick, captured_at))
+            self._index.flush()
+
+    def _roll(self):
+        """Finish the current segment, if any."""
+        if self._segment is None:
+            return
+        self._segment.close()
+        with self._lock:
+            self._lengths.append(self._segment.length)
+            self._segment = None
+        self._write_meta(ended=False)
+
+    def _recover(self):
+        """Finish a segment a previous bridge left preallocated (it crashed)."""
+        path = self.path / segment_name(len(self._lengths))
+        if not path.exists():
+            return
+        length = written_length(path)
+        os.truncate(path, length)
+        self._lengths.append(length)
+
+    def _write_meta(self, ended: bool):
+        meta = {"game_id": self.game_id, "feed": self.feed, "rendition": self.rendition,
+                "segments": list(self._lengths), "ended": ended, "updated_at": time.time()}
+        tmp = self.path / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        tmp.replace(self.path / "meta.json")
+
+
+# ---------------------------------------------------------------------------
+# Reading a recording
+# ---------------------------------------------------------------------------
+
+def read_meta(path: Path) -> Optional[dict]:
+    try:
+        return json.loads((Path(path) / "meta.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def read_index(path: Path) -> List[IndexEntry]:
+    try:
+        data = (Path(path) / "index.bin").read_bytes()
+    except OSError:
+        return []
+    usable = len(data) - len(data) % _INDEX_ENTRY.size   # a torn last entry
+    return [IndexEntry(*entry) for entry in _INDEX_ENTRY.iter_unpack(data[:usable])]
+
+
+def iter_records(data: bytes) -> Iterator[bytes]:
+    """Frames in segment bytes, up to the first incomplete record."""
+    view = memoryview(data)
+    offset = 0
+    while offset + _RECORD_HEADER.size <= len(view):
+        (length,) = _RECORD_HEADER.unpack_from(view, offset)
+        start = offset + _RECORD_HEADER.size
+        if length == 0 or start + length > len(view):
+            return
+        yield bytes(view[start:start + length])
+        offset = start + length
+
+
+def written_length(path: Path) -> int:
+    """Bytes of whole records at the start of a segment file (it may be preallocated)."""
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return 0
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _RECORD_HEADER.size:
+            return 0
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as data:
+            offset = 0
+            while offset + _RECORD_HEADER.size <= size:
+                (length,) = _RECORD_HEADER.unpack_from(data, offset)
+                end = offset + _RECORD_HEADER.size + length
+                if length == 0 or end > size:
+                    break
+                offset = end
+    return offset
+
+
+def segment_lengths(path: Path, live: Optional[StreamRecorder] = None) -> Dict[int, int]:
+    """
+    Readable bytes per segment, the one being recorded included. Without
+    the live recorder (another bridge worker records the feed) the segment
+    being written is read up to its last whole record: a record's length
+    is stored after its frame.
+    """
+    if live is not None:
+        return live.segment_lengths()
+    meta = read_meta(path) or {}
+    lengths = dict(enumerate(meta.get("segments", [])))
+    if meta and not meta.get("ended"):
+        current = Path(path) / segment_name(len(lengths))
+        if current.exists():
+            lengths[len(lengths)] = written_length(current)
+    return lengths
+
+
+def recording_summary(path: Path, live: Optional[StreamRecorder] = None) -> Optional[dict]:
+    """meta.json with segment sizes and the keyframe index, for seeking."""
+    meta = read_meta(path)
+    if meta is None:
+        return None
+    lengths = segment_lengths(path, live)
+    return {
+        **meta,
+        "segments": [{"segment": n, "bytes": size} for n, size in sorted(lengths.items())],
+        "keyframes": [entry._asdict() for entry in read_index(path)
+                      if entry.offset < lengths.get(entry.segment, 0)],
+    }
+
+
+def read_clip(path: Path, start: float, end: float,
+              live: Optional[StreamRecorder] = None) -> Iterator[bytes]:
+    """
+    Frames captured between `start` and `end` (Unix time), from the last
+    keyframe at or before `start` so the clip decodes on its own.
+    """
+    path = Path(path)
+    lengths = segment_lengths(path, live)
+    entries = [e for e in read_index(path) if e.offset < lengths.get(e.segment, 0)]
+    if not entries:
+        return
+    first = entries[0]
+    for entry in entries:
+        if entry.captured_at > start:
+            break
+        first = entry
+    offset = first.offset
+    for number in range(first.segment, len(lengths)):
+        with open(path / segment_name(number), "rb") as f:
+            f.seek(offset)
+            data = f.read(lengths[number] - offset)
+        offset = 0
+        for frame in iter_records(data):
+            header, _ = unpack_frame(frame)
+            if header is not None and header.captured_at > end:
+                return
+            yield frame
@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+import pygame as pg
+
+import audio
+
+
+class AudioTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        with wave.open(os.path.join(cls._tmp.name, "beep.wav"), "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(22050)
+            w.writeframes(b"\x00\x10" * 2205)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+        pg.mixer.quit()
+
+    def test_disabled_audio_never_initialises_mixer(self):
+        pg.mixer.quit()
+        a = audio.Audio(self._tmp.name, enabled=False)
+
+        effects = a.effects({"beep": "beep.wav"})
+        effects["beep"].play()
+        a.load_music("beep.wav")
+        a.play_music(-1, volume=0.5)
+        a.stop_music()
+        a.play_alarm(effects["beep"])
+        a.stop_alarm()
+
+        self.assertFalse(pg.mixer.get_init())
+        self.assertIs(effects["beep"], audio.NULL_SOUND)
+
+    def test_effects_decode_on_first_play_only(self):
+        a = audio.Audio(self._tmp.name, enabled=True)
+        snd = a.effect("beep.wav")
+
+        snd.stop()
+        snd.fadeout(100)
+        self.assertFalse(snd.loaded)
+
+        snd.play()
+        self.assertTrue(snd.loaded)
+
+    def test_ambient_releases_samples_after_fadeout(self):
+        a = audio.Audio(self._tmp.name, enabled=True)
+        amb = a.ambient("beep.wav")
+
+        amb.play(-1)
+        self.assertTrue(amb.loaded)
+        amb.fadeout(10)
+        self.assertFalse(amb.loaded)
+
+    def test_env_switch(self):
+        old = os.environ.get("SUS_AUDIO")
+        try:
+            os.environ["SUS_AUDIO"] = "off"
+            self.assertFalse(audio.audio_enabled())
+            os.environ["SUS_AUDIO"] = "on"
+            self.assertTrue(audio.audio_enabled(default=False))
+        finally:
+            if old is None:
+                os.environ.pop("SUS_AUDIO", None)
+            else:
+                os.environ["SUS_AUDIO"] = old
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import os
 import sys
 import unittest
+from unittest import mock
 import importlib.util
 from pathlib import Path
 
@@ -26,6 +27,9 @@ else:
     del sys.modules["game"]
 os.chdir(_orig_cwd)
 
+from stream_format import RENDITIONS
+from tilemap import Camera, ViewportCamera
+
 
 class FakeAgentRuntime:
     def __init__(self, roles):
@@ -85,5 +89,40 @@ class AutonomousGameOutcomeTests(unittest.TestCase):
         self.assertIn(("IMPOSTER", "Red", ("Red", "Blue")), game.event_runtime.calls)
 
 
+class MainFeedCameraTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        ag.pg.font.init()
+
+    def setUp(self):
+        # pygame's default font; the HUD font file doesn't matter here
+        patcher = mock.patch.object(ag, "FONT", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _make_game(self):
+        game = ag.AutonomousGame.__new__(ag.AutonomousGame)
+        game.game = type("FakeGame", (), {})()
+        game.game.camera = Camera(4000, 3000)
+        game.game.map = type("FakeMap", (), {"width": 4000, "height": 3000})()
+        return game
+
+    def test_headless_main_feed_gets_a_viewport_at_the_default_renditions(self):
+        game = self._make_game()
+        surface = ag.pg.Surface(ag.capture_size(RENDITIONS))
+
+        feed = game._make_feed(ag.MAIN_FEED, surface)
+
+        self.assertIsInstance(feed.camera, ViewportCamera)
+        self.assertEqual((feed.camera.view_width, feed.camera.view_height),
+                         surface.get_size())
+
+    def test_window_sized_main_feed_reuses_the_game_camera(self):
+        game = self._make_game()
+        surface = ag.pg.Surface((ag.WIDTH, ag.HEIGHT))
+
+        self.assertIs(game._make_feed(ag.MAIN_FEED, surface).camera, game.game.camera)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,897 @@
+import asyncio
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+try:
+    import uvicorn
+    from websockets.sync.client import connect
+    import bridge_server as bs
+    import stream_format
+    import stream_recorder
+    import ws_emitter
+except ImportError:  # bridge dependencies are optional for the game itself
+    bs = None
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@unittest.skipIf(bs is None, "bridge dependencies not installed")
+class BridgeTestCase(unittest.TestCase):
+    """Runs the real bridge app on a local uvicorn server."""
+
+    recording_dir = None
+    event_store_path = None
+
+    @classmethod
+    def setUpClass(cls):
+        bs.RECORDING_DIR = cls.recording_dir
+        bs.EVENT_STORE_PATH = cls.event_store_path
+        bs.event_store = None
+        cls.start_server()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stop_server()
+
+    @classmethod
+    def start_server(cls):
+        port = _free_port()
+        cls.http = f"http://127.0.0.1:{port}"
+        cls.ws = f"ws://127.0.0.1:{port}"
+        cls.server = uvicorn.Server(uvicorn.Config(bs.app, host="127.0.0.1", port=port,
+                                                   log_level="warning"))
+        cls.thread = threading.Thread(target=cls.server.run, daemon=True)
+        cls.thread.start()
+        deadline = time.monotonic() + 10
+        while not cls.server.started and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+    @classmethod
+    def stop_server(cls):
+        cls.server.should_exit = True
+        cls.thread.join(timeout=5)
+        if bs.event_store is not None:
+            bs.event_store.close()
+            bs.event_store = None
+
+    def get(self, path):
+        with urllib.request.urlopen(self.http + path, timeout=5) as resp:
+            return json.loads(resp.read())
+
+    def post(self, path, body):
+        request = urllib.request.Request(self.http + path, data=json.dumps(body).encode(),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=5) as resp:
+            return json.loads(resp.read())
+
+    def post_batch(self, game_id, lines, headers=None):
+        request = urllib.request.Request(
+            f"{self.http}/game/ingest/{game_id}/batch", data="\n".join(lines).encode(),
+            headers={"Content-Type": "application/x-ndjson", **(headers or {})})
+        with urllib.request.urlopen(request, timeout=5) as resp:
+            return json.loads(resp.read())
+
+    def get_bytes(self, path, headers=None):
+        request = urllib.request.Request(self.http + path, headers=headers or {})
+        with urllib.request.urlopen(request, timeout=5) as resp:
+            return resp.status, resp.headers, resp.read()
+
+    def connect(self, path):
+        return connect(self.ws + path, open_timeout=5)
+
+    def wait_for(self, predicate, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+
+
+class VideoStreamTests(BridgeTestCase):
+    def test_camera_feeds_are_fanned_out_separately(self):
+        with self.connect("/ws/video/g-feeds/director") as viewer, \
+                self.connect("/ws/stream/g-feeds") as main, \
+                self.connect("/ws/stream/g-feeds/director") as director:
+            self.assertTrue(self.wait_for(lambda: len(bs.live_feeds["g-feeds"]) == 2))
+            main.send(b"main-frame")
+            director.send(b"director-frame")
+
+            self.assertEqual(viewer.recv(timeout=2), b"director-frame")
+            feeds = self.get("/game/g-feeds/feeds")["feeds"]
+            self.assertEqual(feeds, ["main", "director"])
+
+        self.assertTrue(self.wait_for(lambda: not bs.live_feeds["g-feeds"]))
+
+    def test_stream_state_is_reported_per_feed(self):
+        with self.connect("/ws/video/g-state") as viewer, \
+                self.connect("/ws/stream/g-state") as stream:
+            stream.send(json.dumps({"type": "STREAM_STATE", "feed": "main",
+                                    "level": 2, "fps": 20, "quality": 58}))
+            stream.send(b"frame")
+            # Frames still flow after a text message on the same socket
+            self.assertEqual(viewer.recv(timeout=2), b"frame")
+
+            state = self.get("/game/g-state/feeds")["stream"]["main"]
+            self.assertEqual((state["level"], state["fps"], state["quality"]), (2, 20, 58))
+
+    def test_new_viewer_waits_for_a_keyframe(self):
+        delta = stream_format.pack_delta((800, 450), [(0, 0, 50, 50, b"tile")])
+        with self.connect("/ws/video/g-key") as viewer, \
+                self.connect("/ws/stream/g-key") as stream:
+            self.assertTrue(self.wait_for(lambda: "main" in bs.live_feeds["g-key"]))
+            stream.send(delta)
+            stream.send(b"keyframe")
+            stream.send(delta)
+
+            self.assertEqual(viewer.recv(timeout=2), b"keyframe")
+            self.assertEqual(viewer.recv(timeout=2), delta)
+
+    def test_viewer_gets_the_rendition_it_asked_for(self):
+        low = stream_format.pack_rendition("low", b"low-key")
+        high = stream_format.pack_rendition("high", b"high-key")
+        with self.connect("/ws/video/g-rend?rendition=low") as viewer, \
+                self.connect("/ws/stream/g-rend") as stream:
+            stream.send(json.dumps({"type": "STREAM_STATE", "renditions": ["high", "medium", "low"]}))
+            stream.send(high)
+            stream.send(low)
+
+            self.assertEqual(viewer.recv(timeout=2), b"low-key")
+            counts = self.get("/game/g-rend/feeds")["viewers"]["main"]
+            self.assertEqual(counts, {"low": 1})
+
+    def test_streamer_is_told_about_viewer_demand(self):
+        with self.connect("/ws/stream/g-demand") as stream:
+            idle = json.loads(stream.recv(timeout=2))
+            self.assertEqual((idle["type"], idle["viewers"]), ("DEMAND", 0))
+
+            with self.connect("/ws/video/g-demand?rendition=low"):
+                wanted = json.loads(stream.recv(timeout=2))
+                self.assertEqual(wanted["viewers"], 1)
+                self.assertEqual(wanted["renditions"], ["low"])
+                self.assertEqual(wanted["keyframe"], ["low"])
+
+            self.assertEqual(json.loads(stream.recv(timeout=2))["viewers"], 0)
+
+    def test_frame_headers_feed_latency_metrics(self):
+        def framed(seq):
+            return stream_format.pack_frame_header(seq, seq * 2, time.time() - 0.05, 4000) + b"jpeg"
+
+        with self.connect("/ws/video/g-lag") as viewer, \
+                self.connect("/ws/stream/g-lag") as stream:
+            self.assertTrue(self.wait_for(lambda: len(bs.video_subscribers[("g-lag", "main")]) == 1))
+            stream.send(framed(1))
+            header, payload = stream_format.unpack_frame(viewer.recv(timeout=2))
+            self.assertEqual((header.seq, header.tick, payload), (1, 2, b"jpeg"))
+            stream.send(framed(3))      # seq 2 never arrived
+            viewer.recv(timeout=2)
+            viewer.send(json.dumps({"type": "VIDEO_STATS", "lag_ms": 80}))
+
+            def reported():
+                feed = self.get("/game/g-lag/stream/metrics")["feeds"]["main"]
+                return feed if feed["viewers"][0]["client_lag_ms"] == 80 else None
+            self.assertTrue(self.wait_for(reported))
+            feed = reported()
+            medium = feed["renditions"]["medium"]
+            self.assertEqual((medium["frames"], medium["dropped"], medium["last_tick"]), (2, 1, 6))
+            self.assertGreaterEqual(medium["ingest_lag"]["avg_ms"], 50)
+            self.assertEqual(medium["encode"]["avg_ms"], 4.0)
+            self.assertEqual(feed["viewers"][0]["frames_sent"], 2)
+
+    def test_new_viewer_starts_from_the_latest_keyframe(self):
+        delta = stream_format.pack_delta((800, 450), [(0, 0, 50, 50, b"tile")])
+        with self.connect("/ws/stream/g-latest") as stream:
+            stream.send(stream_format.pack_rendition("low", b"\xff\xd8low-key"))
+            stream.send(b"\xff\xd8key")
+            stream.send(delta)
+            latest = bs.latest_frames[("g-latest", "main")]
+            self.assertTrue(self.wait_for(
+                lambda: "medium" in latest and len(latest["medium"].frames) == 2))
+
+            with self.connect("/ws/video/g-latest") as viewer:
+                self.assertEqual(viewer.recv(timeout=2), b"\xff\xd8key")
+                self.assertEqual(viewer.recv(timeout=2), delta)
+                self.assertTrue(self.wait_for(
+                    lambda: len(bs.video_subscribers[("g-latest", "main")]) == 1))
+                stream.send(delta)      # live deltas follow straight on
+                self.assertEqual(viewer.recv(timeout=2), delta)
+
+            status, headers, image = self.get_bytes("/game/g-latest/thumbnail")
+            self.assertEqual((status, headers["Content-Type"]), (200, "image/jpeg"))
+            self.assertEqual(image, b"\xff\xd8low-key")   # the smallest rendition
+
+    def test_deltas_after_a_seq_gap_wait_for_the_next_keyframe(self):
+        delta = stream_format.pack_delta((800, 450), [(0, 0, 50, 50, b"tile")])
+        frames = [stream_format.pack_frame_header(seq, seq, time.time(), 0) + payload
+                  for seq, payload in ((1, b"key-1"), (3, delta), (4, delta), (5, b"key-2"))]
+
+        with self.connect("/ws/video/g-gap") as viewer, \
+                self.connect("/ws/stream/g-gap") as stream:
+            self.assertTrue(self.wait_for(lambda: len(bs.video_subscribers[("g-gap", "main")]) == 1))
+            stream.send(frames[0])
+            self.assertEqual(viewer.recv(timeout=2), frames[0])
+            for frame in frames[1:]:    # seq 2 was lost on the way
+                stream.send(frame)
+
+            self.assertEqual(viewer.recv(timeout=2), frames[3])
+            latest = bs.latest_frames[("g-gap", "main")]["medium"]
+            self.assertEqual(latest.frames, [frames[3]])
+
+    def test_closed_viewer_is_unsubscribed_promptly(self):
+        with self.connect("/ws/video/g-close"):
+            self.assertTrue(self.wait_for(lambda: len(bs.video_subscribers[("g-close", "main")]) == 1))
+        self.assertTrue(self.wait_for(lambda: not bs.video_subscribers[("g-close", "main")]))
+
+
+class RecordingTests(BridgeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.recording_dir = Path(cls._tmp.name)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        bs.RECORDING_DIR = None
+        cls._tmp.cleanup()
+
+    @staticmethod
+    def framed(seq, payload, captured_at):
+        header = stream_format.pack_frame_header(seq, seq, captured_at, 1000)
+        return stream_format.pack_rendition("medium", header, payload)
+
+    def test_unwatched_feed_is_recorded_and_served_by_range(self):
+        delta = stream_format.pack_delta((800, 450), [(0, 0, 50, 50, b"tile")])
+        with self.connect("/ws/stream/g-vod") as stream:
+            demand = json.loads(stream.recv(timeout=2))
+            # The recorder counts as a viewer that needs a keyframe
+            self.assertEqual((demand["viewers"], demand["keyframe"]), (1, ["medium"]))
+            stream.send(self.framed(1, delta, 100.0))        # before any keyframe: skipped
+            stream.send(self.framed(2, b"key-a", 101.0))
+            stream.send(self.framed(3, delta, 102.0))
+            stream.send(self.framed(4, b"key-b", 103.0))
+
+            def recorded():
+                index = self.get("/vod/g-vod/main/index")
+                return index if len(index["keyframes"]) == 2 else None
+            self.assertTrue(self.wait_for(recorded))
+            index = recorded()
+            self.assertEqual(index["rendition"], "medium")
+            self.assertFalse(index["ended"])
+
+        self.assertTrue(self.wait_for(lambda: self.get("/vod/g-vod/main/index")["ended"]))
+        index = self.get("/vod/g-vod/main/index")
+        second = index["keyframes"][1]
+        self.assertEqual((second["tick"], second["captured_at"]), (4, 103.0))
+
+        status, headers, body = self.get_bytes(
+            f"/vod/g-vod/main/segment/{second['segment']}",
+            {"Range": f"bytes={second['offset']}-"})
+        self.assertEqual(status, 206)
+        size = index["segments"][0]["bytes"]
+        self.assertEqual(headers["Content-Range"], f"bytes {second['offset']}-{size - 1}/{size}")
+        header, payload = stream_format.unpack_frame(body[4:])
+        self.assertEqual((header.seq, payload), (4, b"key-b"))
+
+        status, _, clip = self.get_bytes("/vod/g-vod/main/clip?start=102.5&end=102.9")
+        self.assertEqual(status, 200)
+        # From the keyframe before start, up to end
+        frames = [stream_format.unpack_frame(f)[0].seq
+                  for f in stream_recorder.iter_records(clip)]
+        self.assertEqual(frames, [2, 3])
+        self.assertEqual(self.get("/vod/g-vod")["feeds"], ["main"])
+
+
+class ReplayTests(BridgeTestCase):
+    def test_viewer_replays_the_latest_kill_then_resumes_at_a_keyframe(self):
+        delta = stream_format.pack_delta((800, 450), [(0, 0, 50, 50, b"tile")])
+        now = time.time()
+
+        def framed(seq, payload, captured_at):
+            return stream_format.pack_frame_header(seq, seq, captured_at, 0) + payload
+
+        with self.connect("/ws/video/g-replay") as viewer, \
+                self.connect("/ws/stream/g-replay") as stream:
+            self.assertTrue(self.wait_for(lambda: "main" in bs.live_feeds["g-replay"]))
+            sent = [framed(1, b"key-1", now - 0.3), framed(2, delta, now - 0.2),
+                    framed(3, b"key-2", now - 0.1), framed(4, delta, now)]
+            for frame in sent:
+                stream.send(frame)
+                self.assertEqual(viewer.recv(timeout=2), frame)
+            self.post("/game/ingest/g-replay", {"type": "KILL", "killer": "Red",
+                                                "victim": "Blue", "timestamp": now - 0.15})
+
+            viewer.send(json.dumps({"type": "REPLAY", "before": 0.05, "after": 0.05, "speed": 4}))
+            start = json.loads(viewer.recv(timeout=2))
+            self.assertEqual((start["type"], start["frames"]), ("REPLAY_START", 2))
+            # From the keyframe before the kill
+            self.assertEqual([viewer.recv(timeout=2) for _ in range(2)], sent[:2])
+            self.assertEqual(json.loads(viewer.recv(timeout=2))["type"], "REPLAY_END")
+
+            stream.send(framed(5, delta, time.time()))      # live again from a keyframe only
+            stream.send(framed(6, b"key-3", time.time()))
+            self.assertEqual(stream_format.unpack_frame(viewer.recv(timeout=2))[1], b"key-3")
+
+            status, headers, clip = self.get_bytes(f"/game/g-replay/replay?at={now - 0.05}"
+                                                   "&before=0.01&after=0.02")
+            self.assertEqual(status, 200)
+            self.assertEqual([f[:24] for f in stream_recorder.iter_records(clip)],
+                             [f[:24] for f in sent[2:3]])
+
+    def test_old_socket_closing_after_a_reconnect_keeps_the_new_feed(self):
+        key = ("g-rejoin", "main")
+        frame = stream_format.pack_frame_header(1, 1, time.time(), 0) + b"key"
+        with self.connect("/ws/stream/g-rejoin") as old:
+            old.recv(timeout=2)     # DEMAND
+            with self.connect("/ws/stream/g-rejoin") as new:
+                new.recv(timeout=2)     # the new socket owns the feed from here
+                new.send(frame)
+                self.assertTrue(self.wait_for(lambda: "medium" in bs.replay_rings.get(key, {})))
+                old.close()
+                time.sleep(0.2)     # let the old socket's cleanup run
+
+                self.assertEqual(self.get("/game/g-rejoin/feeds")["feeds"], ["main"])
+                self.assertIn("medium", bs.replay_rings.get(key, {}))
+                self.assertIn("medium", self.get("/game/g-rejoin/stream/metrics")
+                              ["feeds"]["main"]["renditions"])
+
+
+class EventFanoutTests(BridgeTestCase):
+    def test_late_joiner_gets_a_snapshot_then_live_events_in_order(self):
+        self.post("/game/ingest/g-events", {"type": "GAME_START", "agents": ["Red", "Blue"]})
+        self.post("/game/ingest/g-events", {"type": "AGENT_SPOKE", "agent": "Red", "message": "hi"})
+        with self.connect("/ws/game/g-events") as client:
+            snapshot = json.loads(client.recv(timeout=2))
+            self.assertEqual((snapshot["type"], snapshot["seq"]), ("STATE_SNAPSHOT", 2))
+            self.assertEqual([a["name"] for a in snapshot["state"]["agents"]], ["Red", "Blue"])
+            self.assertTrue(self.wait_for(lambda: len(bs.game_subscribers["g-events"]) == 1))
+            self.post("/game/ingest/g-events", {"type": "KILL", "killer": "Red", "victim": "Blue"})
+            self.assertEqual(json.loads(client.recv(timeout=2))["type"], "KILL")
+
+        state = self.get("/game/g-events/state")
+        self.assertEqual(state["seq"], 3)
+        self.assertEqual(state["state"]["agents"][1], {"name": "Blue", "alive": False})
+        self.assertEqual(bs.active_games["g-events"]["hypeScore"], 15)
+
+        self.assertTrue(self.wait_for(lambda: not bs.game_subscribers["g-events"]))
+        self.assertIn("event_fanout", self.get("/health"))
+
+    def test_stamped_events_are_forwarded_byte_for_byte(self):
+        body = b'{"type": "VOTE_CAST", "game_id": "g-raw", "timestamp": 12.5,  "voter": "Red"}'
+        kill = json.dumps({"type": "KILL", "game_id": "g-raw", "timestamp": 13.0,
+                           "killer": "Red", "victim": "Blue"}).encode()
+        with self.connect("/ws/game/g-raw") as client:
+            self.assertTrue(self.wait_for(lambda: len(bs.game_subscribers["g-raw"]) == 1))
+            for data, etype, ts in ((body, "VOTE_CAST", "12.5"), (kill, "KILL", "13.0")):
+                request = urllib.request.Request(
+                    self.http + "/game/ingest/g-raw", data=data,
+                    headers={"Content-Type": "application/json", "X-Event-Type": etype,
+                             "X-Event-Timestamp": ts})
+                urllib.request.urlopen(request, timeout=5).close()
+
+            # Untouched but for the sequence number in front
+            self.assertEqual(client.recv(timeout=2), '{"seq":1,' + body.decode()[1:])
+            self.assertEqual(client.recv(timeout=2), '{"seq":2,' + kill.decode()[1:])
+
+        # State events are still read
+        self.assertEqual(bs.active_games["g-raw"]["hypeScore"], 15)
+        self.assertEqual([e.type for e in bs.event_history["g-raw"]], ["VOTE_CAST", "KILL"])
+        self.assertEqual(bs._replay_moment("g-raw", {}), 13.0)
+
+    def test_a_batch_is_published_in_order(self):
+        post_batch = lambda lines: self.post_batch("g-batch", lines)
+        vote = '{"type": "VOTE_CAST", "game_id": "g-batch", "timestamp": 2.0,  "voter": "Red"}'
+        with self.connect("/ws/game/g-batch") as client:
+            self.assertTrue(self.wait_for(lambda: len(bs.game_subscribers["g-batch"]) == 1))
+            with self.assertRaises(urllib.error.HTTPError) as rejected:
+                post_batch(['{"type": "KILL"}', "not json"])
+            self.assertEqual(rejected.exception.code, 400)
+
+            self.assertEqual(post_batch(['{"type": "GAME_START", "agents": ["Red", "Blue"]}',
+                                         vote, "", '{"type": "KILL", "killer": "Red",'
+                                                   ' "victim": "Blue"}']),
+                             {"ok": True, "events": 3, "duplicates": 0})
+            events = [client.recv(timeout=2) for _ in range(3)]
+
+        self.assertEqual([json.loads(e)["seq"] for e in events], [1, 2, 3])
+        self.assertEqual(events[1], '{"seq":2,' + vote[1:])
+        self.assertEqual(json.loads(events[2])["game_id"], "g-batch")
+        self.assertEqual(self.get("/game/g-batch/state")["state"]["agents"][1],
+                         {"name": "Blue", "alive": False})
+
+    def test_stamped_batch_lines_are_forwarded_byte_for_byte(self):
+        def line(seq, etype, **fields):
+            return ws_emitter.stamped_line({"type": etype, "game_id": "g-stamp",
+                                            "timestamp": float(seq), **fields,
+                                            "emitter": "em-1", "emit_seq": seq}).decode()
+
+        sent = [line(1, "GAME_START", agents=["Red", "Blue"]),
+                line(2, "AGENT_SPOKE", agent="Red", message="where?"),
+                line(3, "KILL", killer="Red", victim="Blue")]
+        with self.connect("/ws/game/g-stamp") as client:
+            self.assertTrue(self.wait_for(lambda: len(bs.game_subscribers["g-stamp"]) == 1))
+            self.assertEqual(self.post_batch("g-stamp", sent)["events"], 3)
+            events = [client.recv(timeout=2) for _ in range(3)]
+        self.assertEqual(self.post_batch("g-stamp", sent[1:])["duplicates"], 2)
+
+        self.assertEqual(events, [f'{{"seq":{n},' + text.split(" ", 4)[4][1:]
+                                  for n, text in enumerate(sent, 1)])
+        self.assertEqual(self.get("/game/g-stamp/state")["state"]["agents"][1],
+                         {"name": "Blue", "alive": False})
+
+    def test_redelivered_events_are_dropped(self):
+        def lines(*seqs, emitter="em-1"):
+            return [json.dumps({"type": "VOTE_CAST", "game_id": "g-dup", "timestamp": time.time(),
+                                "emitter": emitter, "emit_seq": seq}) for seq in seqs]
+
+        self.assertEqual(self.post_batch("g-dup", lines(1, 2))["events"], 2)
+        # The response to that got lost, so the emitter sends it again with what came next
+        again = self.post_batch("g-dup", lines(1, 2, 3), headers={"X-Emitter-Backlog": "40"})
+        self.assertEqual((again["events"], again["duplicates"]), (1, 2))
+        self.assertEqual(self.post_batch("g-dup", lines(1, emitter="em-2"))["events"], 1)
+
+        self.assertEqual([json.loads(e.data)["emit_seq"] for e in bs.event_history["g-dup"]],
+                         [1, 2, 3, 1])
+        ingest = self.get("/health")["ingest"]
+        self.assertGreaterEqual(ingest["duplicates"], 2)
+        self.assertEqual(ingest["emitter_backlog"]["g-dup"], 40)
+        self.assertIsNotNone(ingest["lag"]["avg_ms"])
+
+
+    def test_reconnecting_client_gets_exactly_what_it_missed(self):
+        for i in range(5):
+            self.post("/game/ingest/g-seq", {"type": "VOTE_CAST", "n": i})
+        with self.connect("/ws/game/g-seq?since=3") as client:
+            missed = [json.loads(client.recv(timeout=2)) for _ in range(2)]
+            self.assertEqual([(e["seq"], e["n"]) for e in missed], [(4, 3), (5, 4)])
+            self.assertTrue(self.wait_for(lambda: "g-seq" in bs.game_subscribers))
+            self.post("/game/ingest/g-seq", {"type": "VOTE_CAST", "n": 5})
+            self.assertEqual(json.loads(client.recv(timeout=2))["seq"], 6)
+
+        with self.connect("/ws/game/g-seq?since=6") as client:
+            self.assertTrue(self.wait_for(lambda: "g-seq" in bs.game_subscribers))
+            self.post("/game/ingest/g-seq", {"type": "GAME_END", "winner": "crew"})
+            self.assertEqual(json.loads(client.recv(timeout=2))["seq"], 7)    # no replay
+
+    def test_a_gap_the_history_cannot_fill_gets_a_snapshot(self):
+        limit, bs.HISTORY_LIMIT = bs.HISTORY_LIMIT, 4
+        try:
+            for i in range(6):
+                self.post("/game/ingest/g-gap", {"type": "VOTE_CAST", "n": i})
+        finally:
+            bs.HISTORY_LIMIT = limit
+
+        seqs = lambda since: [json.loads(data)["seq"] for data in bs._events_since("g-gap", since)]
+        self.assertEqual(seqs(2), [3, 4, 5, 6])
+        self.assertEqual(seqs(6), [])
+        for since in (1, 99, None):     # pushed out, from before a restart, new client
+            (data,) = bs._events_since("g-gap", since)
+            self.assertEqual(json.loads(data)["type"], "STATE_SNAPSHOT")
+        self.assertEqual(bs._events_since("g-nothing", None), [])
+
+    def test_seq_is_spliced_into_any_object(self):
+        self.assertEqual(bs._with_seq(' { "a": 1}', 3), '{"seq":3,"a": 1}')
+        self.assertEqual(bs._with_seq("{}", 1), '{"seq":1}')
+
+
+class TopicTests(BridgeTestCase):
+    def recv_json(self, client):
+        return json.loads(client.recv(timeout=2))
+
+    def subscribe(self, client, topic, **params):
+        client.send(json.dumps({"op": "subscribe", "topic": topic, **params}))
+        self.assertEqual(self.recv_json(client), {"type": "SUBSCRIBED", "topic": topic})
+
+    def test_one_socket_follows_several_games_markets_and_the_lobby(self):
+        self.post("/game/ingest/g-topic-a", {"type": "GAME_START", "agents": ["Red", "Blue"]})
+        with self.connect("/ws/topics") as client:
+            self.subscribe(client, "game:g-topic-a", since=1)
+            self.subscribe(client, "game:g-topic-b")
+            self.subscribe(client, "markets:g-topic-a")
+            self.assertEqual(self.recv_json(client)["markets"][0]["kind"], "crew_win")
+            self.subscribe(client, "lobby")
+            lobby = self.recv_json(client)
+            self.assertEqual(lobby["type"], "LOBBY")
+            self.assertIn("g-topic-a", [g["id"] for g in lobby["games"]])
+
+            self.post("/game/ingest/g-topic-b", {"type": "AGENT_SPOKE", "agent": "Red"})
+            self.post("/game/ingest/g-topic-c", {"type": "AGENT_SPOKE", "agent": "Red"})  # not asked for
+            self.post("/game/ingest/g-topic-a", {"type": "KILL", "killer": "Red", "victim": "Blue"})
+            received = [self.recv_json(client) for _ in range(4)]
+            by_type = {(m["type"], m.get("game_id")) for m in received}
+            self.assertEqual(by_type, {("AGENT_SPOKE", "g-topic-b"), ("KILL", "g-topic-a"),
+                                       ("MARKETS", "g-topic-a"), ("LOBBY", None)})
+
+            client.send(json.dumps({"op": "unsubscribe", "topic": "game:g-topic-b"}))
+            self.assertEqual(self.recv_json(client)["type"], "UNSUBSCRIBED")
+            client.send(json.dumps({"op": "subscribe", "topic": "weather"}))
+            self.assertEqual(self.recv_json(client)["type"], "ERROR")
+
+        self.assertTrue(self.wait_for(lambda: not bs.lobby_subscribers))
+        self.assertTrue(self.wait_for(lambda: "g-topic-a" not in bs.market_subscribers))
+
+    def test_a_topic_too_far_behind_is_dropped_without_the_others(self):
+        self.post("/game/ingest/g-slow", {"type": "AGENT_SPOKE", "agent": "Red"})
+        with self.connect("/ws/topics") as client:
+            self.subscribe(client, "game:g-slow", since=1)
+            self.subscribe(client, "game:g-fast", since=0)
+            slow = next(iter(bs.game_subscribers["g-slow"].values()))
+            slow.MAX_PENDING = 0    # the next event overflows it
+
+            self.post("/game/ingest/g-slow", {"type": "AGENT_SPOKE", "agent": "Blue"})
+            self.assertEqual(self.recv_json(client), {"type": "UNSUBSCRIBED",
+                                                      "topic": "game:g-slow",
+                                                      "reason": "overflow"})
+            self.post("/game/ingest/g-fast", {"type": "KILL", "killer": "Red", "victim": "Blue"})
+            self.assertEqual(self.recv_json(client)["game_id"], "g-fast")
+
+            self.subscribe(client, "game:g-slow", since=1)
+            self.assertEqual(self.recv_json(client)["seq"], 2)
+
+    def test_video_frames_are_tagged_with_their_topic(self):
+        with self.connect("/ws/topics") as client, \
+                self.connect("/ws/stream/g-topic-v") as main, \
+                self.connect("/ws/stream/g-topic-v/director") as director:
+            self.assertTrue(self.wait_for(lambda: len(bs.live_feeds["g-topic-v"]) == 2))
+            self.subscribe(client, "video:g-topic-v")
+            self.subscribe(client, "video:g-topic-v/director")
+            self.assertTrue(self.wait_for(
+                lambda: all(bs.video_subscribers.get(("g-topic-v", f)) for f in ("main", "director"))))
+            main.send(b"main-frame")
+            director.send(b"director-frame")
+
+            frames = {stream_format.unpack_topic(client.recv(timeout=2)) for _ in range(2)}
+            self.assertEqual(frames, {("video:g-topic-v", b"main-frame"),
+                                      ("video:g-topic-v/director", b"director-frame")})
+
+
+class EventStoreTests(BridgeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.event_store_path = Path(cls._tmp.name) / "events.db"
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._tmp.cleanup()
+
+    def ingest(self, game_id, count, **fields):
+        for i in range(count):
+            self.post(f"/game/ingest/{game_id}", {"type": "VOTE_CAST", "n": i, **fields})
+        store = bs.event_store
+        self.assertTrue(self.wait_for(lambda: store.pending == 0 and store.written >= count))
+
+    def test_history_is_paged_filtered_and_exported(self):
+        self.ingest("g-store", 5)
+        self.post("/game/ingest/g-store", {"type": "KILL", "killer": "Red", "victim": "Blue"})
+        self.assertTrue(self.wait_for(lambda: bs.event_store.written >= 6))
+
+        page = self.get("/game/g-store/events?limit=4")
+        self.assertEqual([e["seq"] for e in page["events"]], [1, 2, 3, 4])
+        page = self.get(f"/game/g-store/events?limit=4&after={page['next_after']}")
+        self.assertEqual(([e["seq"] for e in page["events"]], page["next_after"]), ([5, 6], None))
+        kills = self.get("/game/g-store/events?type=KILL")["events"]
+        self.assertEqual([(e["seq"], e["victim"]) for e in kills], [(6, "Blue")])
+
+        status, headers, body = self.get_bytes("/game/g-store/events/export")
+        self.assertEqual(headers["content-type"], "application/x-ndjson")
+        self.assertEqual([json.loads(line)["seq"] for line in body.splitlines()], list(range(1, 7)))
+        self.assertIn("g-store", [g["game_id"] for g in self.get("/events/games")])
+
+    def restart(self, *game_ids):
+        """Stop the bridge and start it again, remembering only what is stored."""
+        self.stop_server()
+        for game_id in game_ids:
+            bs._evict_game(game_id)
+        bs.pubsub = bs.MemoryPubSub()
+        self.start_server()
+
+    def test_numbering_carries_on_after_a_restart(self):
+        self.ingest("g-reboot", 3)
+        self.restart("g-reboot")
+
+        with self.connect("/ws/game/g-reboot?since=1") as client:
+            self.assertEqual([json.loads(client.recv(timeout=2))["seq"] for _ in range(2)], [2, 3])
+        self.post("/game/ingest/g-reboot", {"type": "VOTE_CAST", "n": 3})
+        store = bs.event_store
+        self.assertTrue(self.wait_for(lambda: store.pending == 0))
+        self.assertEqual([e.seq for e in store.query("g-reboot", 0, 10)], [1, 2, 3, 4])
+
+    def test_redelivery_is_recognized_after_a_restart(self):
+        sent = [json.dumps({"type": "KILL", "game_id": "g-restart", "timestamp": 1.0,
+                            "emitter": "em-1", "emit_seq": seq}) for seq in (1, 2)]
+        self.post_batch("g-restart", sent)
+        self.post("/game/ingest/g-restart", {"type": "MEETING_START", "caller": "Red"})
+        # As a new bridge process would start, with the writer maybe still behind
+        del bs.ingest_marks["g-restart"]
+        bs.marks_loaded.discard("g-restart")
+
+        self.assertEqual(self.post_batch("g-restart", sent)["duplicates"], 2)
+
+    def test_a_batch_cut_short_is_marked_as_far_as_it_got(self):
+        sent = [json.dumps({"type": "VOTE_CAST", "game_id": "g-cut", "timestamp": 1.0,
+                            "emitter": "em-1", "emit_seq": seq}) for seq in (1, 2, 3)]
+        publish = bs.pubsub.publish
+
+        def fail_third(game_id, etype, timestamp, data, base, event=None, mark=None):
+            if mark == ("em-1", 3):
+                raise bs.PubSubUnavailable("test")
+            publish(game_id, etype, timestamp, data, base, event, mark)
+
+        bs.pubsub.publish = fail_third
+        try:
+            with self.assertRaises(urllib.error.HTTPError) as refused:
+                self.post_batch("g-cut", sent)
+        finally:
+            bs.pubsub.publish = publish
+        self.assertEqual(refused.exception.code, 503)
+
+        self.assertEqual(self.post_batch("g-cut", sent), {"ok": True, "events": 1,
+                                                          "duplicates": 2})
+        self.assertEqual([e.seq for e in bs.event_history["g-cut"]], [1, 2, 3])
+
+    def test_a_forgotten_game_gets_its_state_back_from_the_store(self):
+        self.post("/game/ingest/g-restore", {"type": "GAME_START", "agents": ["Red", "Blue"]})
+        self.post("/game/ingest/g-restore", {"type": "KILL", "killer": "Red", "victim": "Blue"})
+        # Evicted at once, maybe before the writer committed those
+        bs.evict_finished_games(time.time() + bs.GAME_IDLE_TTL + 1, force=True)
+        self.post("/game/ingest/g-restore", {"type": "MEETING_START", "caller": "Red"})
+
+        state = self.get("/game/g-restore/state")
+        self.assertEqual(state["seq"], 3)
+        self.assertEqual(state["state"]["agents"], [{"name": "Red", "alive": True},
+                                                    {"name": "Blue", "alive": False}])
+        self.assertEqual(bs.active_games["g-restore"]["hypeScore"], 25)
+
+    def test_numbering_and_catch_up_survive_the_game_leaving_memory(self):
+        self.ingest("g-gone", 3)
+        bs.evict_finished_games(time.time() + bs.GAME_IDLE_TTL + 1, force=True)
+        self.assertNotIn("g-gone", bs.event_history)
+
+        with self.connect("/ws/game/g-gone?since=1") as client:
+            self.assertEqual([json.loads(client.recv(timeout=2))["seq"] for _ in range(2)], [2, 3])
+        self.post("/game/ingest/g-gone", {"type": "VOTE_CAST", "n": 3})
+        self.assertEqual(bs.event_history["g-gone"][0].seq, 4)    # numbering carried on
+
+
+class EvictionTests(BridgeTestCase):
+    def test_history_is_a_bounded_ring(self):
+        limit, bs.HISTORY_LIMIT = bs.HISTORY_LIMIT, 60     # read when the game's ring is made
+        try:
+            for i in range(70):
+                self.post("/game/ingest/g-ring", {"type": "VOTE_CAST", "n": i})
+        finally:
+            bs.HISTORY_LIMIT = limit
+
+        history = bs.event_history["g-ring"]
+        self.assertEqual(len(history), 60)
+        self.assertEqual(json.loads(history[0].data)["n"], 10)
+        with self.connect("/ws/game/g-ring?since=40") as client:
+            replayed = [json.loads(client.recv(timeout=2))["n"] for _ in range(30)]
+        self.assertEqual(replayed, list(range(40, 70)))
+        self.assertTrue(self.wait_for(lambda: "g-ring" not in bs.game_subscribers))
+
+    def test_a_malformed_ttl_falls_back_to_the_default(self):
+        for value, seconds in (("90", 90.0), ("10m", 600.0), ("nan", 600.0)):
+            with mock.patch.dict(os.environ, {"SUS_GAME_TTL": value}):
+                self.assertEqual(bs.seconds_from_env("SUS_GAME_TTL", 600.0), seconds)
+
+    def test_finished_games_are_forgotten_after_the_ttl(self):
+        self.post("/game/ingest/g-done", {"type": "GAME_START", "agents": ["Red"]})
+        self.post("/game/ingest/g-done", {"type": "GAME_END", "winner": "crewmates"})
+        self.post("/game/ingest/g-live", {"type": "GAME_START", "agents": ["Red"]})
+        bs.latest_frames[("g-done", "main")]["high"] = bs.LatestFrames()
+        ended_at = bs.active_games["g-done"]["ended_at"]
+
+        memory = self.get("/health")["memory"]["games"]
+        self.assertEqual(memory["g-done"]["history_events"], 2)
+
+        self.assertNotIn("g-done", bs.evict_finished_games(ended_at + 1, force=True))
+        evicted = bs.evict_finished_games(ended_at + bs.GAME_TTL + 1, force=True)
+        self.assertIn("g-done", evicted)
+        self.assertNotIn("g-live", evicted)     # still running, not idle yet
+        for table in (bs.active_games, bs.event_history, bs.last_activity):
+            self.assertNotIn("g-done", table)
+        self.assertNotIn(("g-done", "main"), bs.latest_frames)
+        self.assertIn("g-live", bs.active_games)
+
+    def test_a_zero_ttl_never_evicts(self):
+        self.post("/game/ingest/g-keep", {"type": "GAME_START", "agents": ["Red"]})
+        self.post("/game/ingest/g-keep", {"type": "GAME_END", "winner": "crewmates"})
+        with mock.patch.object(bs, "GAME_TTL", 0.0), mock.patch.object(bs, "GAME_IDLE_TTL", 0.0):
+            self.assertNotIn("g-keep", bs.evict_finished_games(force=True))
+            far = time.time() + 10 ** 6
+            self.assertNotIn("g-keep", bs.evict_finished_games(far, force=True))
+        self.assertIn("g-keep", bs.event_history)
+
+    def test_a_game_with_a_live_feed_is_kept(self):
+        self.post("/game/ingest/g-feed", {"type": "GAME_START", "agents": ["Red"]})
+        bs.live_feeds["g-feed"].add("main")
+        try:
+            far = time.time() + bs.GAME_IDLE_TTL + 1
+            self.assertNotIn("g-feed", bs.evict_finished_games(far, force=True))
+        finally:
+            bs.live_feeds.pop("g-feed", None)
+        self.assertIn("g-feed", bs.evict_finished_games(far, force=True))
+
+
+class EvictionTaskTests(BridgeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._saved = (bs.EVICT_INTERVAL, bs.GAME_TTL)
+        bs.EVICT_INTERVAL, bs.GAME_TTL = 0.05, 0.1
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        bs.EVICT_INTERVAL, bs.GAME_TTL = cls._saved
+
+    def test_a_finished_game_is_evicted_with_no_further_ingest(self):
+        self.post("/game/ingest/g-quiet", {"type": "GAME_START", "agents": ["Red"]})
+        self.post("/game/ingest/g-quiet", {"type": "GAME_END", "winner": "crewmates"})
+        self.assertIn("g-quiet", bs.event_history)
+
+        self.assertTrue(self.wait_for(lambda: "g-quiet" not in bs.event_history))
+        self.assertNotIn("g-quiet", bs.active_games)
+
+
+class _FakeSocket:
+    def __init__(self):
+        self.sent = []
+        self.closed = None
+
+    async def send_text(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000):
+        self.closed = code
+
+
+@unittest.skipIf(bs is None, "bridge dependencies not installed")
+class EventSubscriberTests(unittest.TestCase):
+    def drain(self, subscriber):
+        async def run():
+            task = asyncio.ensure_future(subscriber.run())
+            await asyncio.sleep(0.01)
+            task.cancel()
+        asyncio.run(run())
+
+    def test_waiting_frames_are_coalesced(self):
+        socket = _FakeSocket()
+        subscriber = bs.EventSubscriber(socket)
+        subscriber.push('{"type":"FRAME","n":1}', frame=True)
+        subscriber.push('{"type":"KILL"}')
+        subscriber.push('{"type":"FRAME","n":2}', frame=True)
+
+        self.drain(subscriber)
+
+        self.assertEqual(socket.sent, ['{"type":"KILL"}', '{"type":"FRAME","n":2}'])
+        self.assertEqual(subscriber.coalesced, 1)
+
+    def test_a_consumer_too_far_behind_is_disconnected(self):
+        socket = _FakeSocket()
+        subscriber = bs.EventSubscriber(socket)
+        for i in range(subscriber.MAX_PENDING + 1):
+            subscriber.push(json.dumps({"type": "VOTE", "n": i}))
+
+        self.drain(subscriber)
+
+        self.assertEqual((socket.sent, socket.closed), ([], 1013))
+
+
+@unittest.skipIf(bs is None, "bridge dependencies not installed")
+class ReplayRingTests(unittest.TestCase):
+    def test_old_frames_go_a_keyframe_group_at_a_time(self):
+        ring = bs.ReplayRing(seconds=2.0)
+        ring.add(0.0, b"delta", keyframe=False)     # nothing to apply it to
+        for t in range(8):
+            ring.add(float(t), b"k" if t % 3 == 0 else b"d", keyframe=t % 3 == 0)
+
+        # Window starts at 5.0: the group from 3.0 still covers it
+        self.assertEqual([t for t, _ in ring.clip(0.0, 10.0)], [3.0, 4.0, 5.0, 6.0, 7.0])
+        self.assertEqual(ring.snapshot()["frames"], 5)
+
+    def test_clip_starts_at_the_keyframe_before_it(self):
+        ring = bs.ReplayRing(seconds=60.0)
+        for t in range(8):
+            ring.add(float(t), b"k" if t % 3 == 0 else b"d", keyframe=t % 3 == 0)
+
+        self.assertEqual([t for t, _ in ring.clip(4.5, 6.0)], [3.0, 4.0, 5.0, 6.0])
+
+    def test_a_malformed_replay_length_falls_back_to_the_default(self):
+        for value, seconds in (("7.5", 7.5), ("", 0.0), ("twenty", 20.0), ("inf", 20.0)):
+            with mock.patch.dict(os.environ, {"SUS_REPLAY_SECONDS": value}):
+                self.assertEqual(bs.replay_seconds_from_env(), seconds)
+
+
+@unittest.skipIf(bs is None, "bridge dependencies not installed")
+class VideoViewerTests(unittest.TestCase):
+    def test_slow_sends_step_an_auto_viewer_down_at_the_next_keyframe(self):
+        now = time.monotonic()
+        viewer = bs.VideoViewer(now=now)
+        self.assertTrue(viewer.accepts("medium", keyframe=True))
+        viewer.offer(b"key", None, keyframe=True)
+        viewer.sent(True, 10_000, 0.5, now=now + viewer.WINDOW)
+
+        self.assertEqual(viewer.pending, "low")
+        self.assertTrue(viewer.accepts("medium", keyframe=False))   # until low's keyframe
+        self.assertFalse(viewer.accepts("low", keyframe=False))
+        self.assertTrue(viewer.accepts("low", keyframe=True))
+        self.assertFalse(viewer.accepts("medium", keyframe=False))
+        self.assertEqual(viewer.rendition, "low")
+        viewer.offer(b"low-key", None, keyframe=True)
+        self.assertEqual(viewer.take(), [(b"low-key", None, True, "low")])
+
+    def test_unsent_frames_are_overwritten_or_merged(self):
+        def delta(x):
+            return stream_format.pack_delta((800, 450), [(x, 0, 8, 8, b"tile")])
+
+        viewer = bs.VideoViewer()
+        viewer.offer(b"key-1", None, keyframe=True)
+        viewer.offer(delta(0), None, keyframe=False)
+        viewer.offer(delta(8), None, keyframe=False)        # merged into the pending delta
+        pending = viewer.take()
+        self.assertEqual([frame for frame, *_ in pending],
+                         [b"key-1", stream_format.merge_deltas(delta(0), delta(8))])
+
+        viewer.offer(delta(16), None, keyframe=False)
+        viewer.offer(b"key-2", None, keyframe=True)          # replaces everything pending
+        self.assertEqual([frame for frame, *_ in viewer.take()], [b"key-2"])
+        self.assertEqual(viewer.skipped, 2)
+
+    def test_a_viewer_too_far_behind_waits_for_a_keyframe(self):
+        viewer = bs.VideoViewer()
+        viewer.MAX_MERGED_BYTES = 100
+        big = stream_format.pack_delta((800, 450), [(0, 0, 8, 8, b"t" * 60)])
+        viewer.offer(b"key", None, keyframe=True)
+        viewer.take()
+        self.assertFalse(viewer.offer(big, None, keyframe=False))
+
+        self.assertTrue(viewer.offer(big, None, keyframe=False))     # lost sync
+        self.assertEqual((viewer.take(), viewer.synced, viewer.resyncs), ([], False, 1))
+        self.assertFalse(viewer.accepts("medium", keyframe=False))
+
+    def test_sustained_fast_sends_step_back_up(self):
+        now = time.monotonic()
+        viewer = bs.VideoViewer(now=now)
+        viewer.rendition = "low"
+        for i in range(1, int(viewer.UPGRADE_AFTER / viewer.WINDOW) + 1):
+            viewer.sent(False, 1_000, 0.001, now=now + i * viewer.WINDOW)
+
+        self.assertEqual(viewer.pending, "medium")
+
+    def test_fixed_rendition_falls_back_when_not_streamed(self):
+        viewer = bs.VideoViewer("high")
+        self.assertEqual(viewer.rendition, "high")
+
+        viewer.set_available(("medium", "low"))
+
+        self.assertEqual(viewer.pending, "medium")
+        viewer.sent(True, 1_000, 10.0, now=time.monotonic() + 10)
+        self.assertEqual(viewer.pending, "medium")      # fixed viewers never auto-switch
+
+
+if __name__ == "__main__":
+    unittest.main()
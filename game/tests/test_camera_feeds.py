@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+import pygame as pg
+
+import camera_feeds as cf
+
+
+class FeedIdTests(unittest.TestCase):
+    COLOURS = ["Red", "Blue", "Green"]
+
+    def test_parses_fixed_and_pov_feeds_in_order(self):
+        feeds = cf.feed_ids_from_env(self.COLOURS, "director, imposter,pov-blue")
+        self.assertEqual(feeds, ["director", "imposter", "pov-blue"])
+
+    def test_pov_all_expands_and_drops_duplicates(self):
+        feeds = cf.feed_ids_from_env(self.COLOURS, "pov-red,pov-all")
+        self.assertEqual(feeds, ["pov-red", "pov-blue", "pov-green"])
+
+    def test_unknown_and_main_feeds_are_ignored(self):
+        feeds = cf.feed_ids_from_env(self.COLOURS, "main,pov-pink,bogus,")
+        self.assertEqual(feeds, [])
+
+
+class ScaledAssetsTests(unittest.TestCase):
+    def test_scaled_images_are_cached_per_scale(self):
+        assets = cf.ScaledAssets(pg.Surface((400, 200)))
+        sprite = pg.Surface((64, 86), pg.SRCALPHA)
+
+        self.assertIs(assets.image(sprite, 1.0), sprite)
+        half = assets.image(sprite, 0.5)
+        self.assertEqual(half.get_size(), (32, 43))
+        self.assertIs(assets.image(sprite, 0.5), half)
+        self.assertEqual(assets.map_image(0.5).get_size(), (200, 100))
+        self.assertIs(assets.map_image(0.5), assets.map_image(0.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
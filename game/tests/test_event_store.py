@@ -0,0 +1,59 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+from event_store import EventStore, StoredEvent
+
+
+def event(game_id, seq, etype="VOTE_CAST"):
+    return StoredEvent(game_id, seq, etype, float(seq), f'{{"seq":{seq},"type":"{etype}"}}')
+
+
+class EventStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "events.db"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_queued_events_are_committed_in_batches(self):
+        store = EventStore(self.path)
+        for seq in range(1, 51):
+            store.append(event("g", seq, "KILL" if seq % 10 == 0 else "VOTE_CAST"))
+        store.close()
+
+        self.assertEqual(store.written, 50)
+        self.assertEqual([e.seq for e in store.query("g", after=45)], [46, 47, 48, 49, 50])
+        self.assertEqual([e.seq for e in store.query("g", types=["KILL"])], [10, 20, 30, 40, 50])
+        self.assertEqual(store.query("g", limit=1)[0].data, '{"seq":1,"type":"VOTE_CAST"}')
+
+    def test_flush_waits_for_queued_events(self):
+        store = EventStore(self.path)
+        for seq in range(1, 21):
+            store.append(event("g", seq))
+        self.assertTrue(store.flush())
+        self.assertEqual(len(store.query("g", limit=100)), 20)
+        store.close()
+
+    def test_reopened_store_knows_where_each_game_left_off(self):
+        store = EventStore(self.path)
+        for seq in range(1, 4):
+            store.append(event("a", seq))
+        store.append(event("b", 1))
+        store.close()
+
+        reopened = EventStore(self.path)
+        self.assertEqual((reopened.last_seq("a"), reopened.last_seq("b"), reopened.last_seq("c")),
+                         (3, 1, 0))
+        self.assertEqual([g["game_id"] for g in reopened.games()], ["a", "b"])
+        reopened.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
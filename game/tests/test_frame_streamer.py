@@ -0,0 +1,327 @@
+import io
+import os
+import queue
+import sys
+import time
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+import pygame as pg
+
+import frame_streamer as fs
+import stream_format
+
+
+def _bare_streamer(level=0, renditions=(fs.DEFAULT_RENDITION,)):
+    # Encoding helpers only; no threads or sockets are started
+    streamer = fs.FrameStreamer.__new__(fs.FrameStreamer)
+    streamer.controller = fs.StreamController(level=level)
+    streamer.renditions = renditions
+    streamer._delta = {}
+    streamer._pool = None
+    streamer._demand = None
+    streamer._last_capture = 0.0
+    return streamer
+
+
+class FrameEncodingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pg.display.init()
+        pg.display.set_mode((1, 1))
+        cls.streamer = _bare_streamer()
+
+    def _frame(self, size):
+        surface = pg.Surface(size).convert()
+        surface.fill((200, 30, 60))
+        surface.fill((10, 220, 40), (0, 0, size[0] // 2, size[1]))
+        return surface
+
+    @unittest.skipUnless(fs.PIL_AVAILABLE, "Pillow not installed")
+    def test_stream_sized_frame_is_copied_in_native_layout(self):
+        data, size, rawmode, stride = self.streamer._capture(
+            self._frame((fs.STREAM_WIDTH, fs.STREAM_HEIGHT)))
+
+        self.assertIn(rawmode, fs._RAW_MODES.values())
+        self.assertEqual(size, (fs.STREAM_WIDTH, fs.STREAM_HEIGHT))
+        self.assertEqual(len(data), stride * fs.STREAM_HEIGHT)
+
+    @unittest.skipUnless(fs.PIL_AVAILABLE, "Pillow not installed")
+    def test_encoded_jpeg_keeps_colours_and_stream_size(self):
+        from PIL import Image
+
+        for size in ((fs.STREAM_WIDTH, fs.STREAM_HEIGHT), (1280, 640)):
+            [(_, jpeg)] = self.streamer._encode(*self.streamer._capture(self._frame(size)))
+            img = Image.open(io.BytesIO(jpeg))
+
+            self.assertEqual(img.size, (fs.STREAM_WIDTH, fs.STREAM_HEIGHT))
+            for (x, y), expected in (((100, 200), (10, 220, 40)), ((700, 200), (200, 30, 60))):
+                for got, want in zip(img.getpixel((x, y)), expected):
+                    self.assertAlmostEqual(got, want, delta=8)
+
+    @unittest.skipUnless(fs.PIL_AVAILABLE, "Pillow not installed")
+    def test_encoder_scales_to_the_current_operating_point(self):
+        from PIL import Image
+
+        streamer = _bare_streamer(level=len(fs.STREAM_LADDER) - 1)
+        frame = streamer._capture(self._frame((fs.STREAM_WIDTH, fs.STREAM_HEIGHT)))
+
+        [(_, jpeg)] = streamer._encode(*frame)
+        point = fs.STREAM_LADDER[-1]
+        self.assertEqual(Image.open(io.BytesIO(jpeg)).size, (point.width, point.height))
+
+    @unittest.skipUnless(fs.PIL_AVAILABLE, "Pillow not installed")
+    def test_renditions_are_encoded_in_parallel_without_upscaling(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from PIL import Image
+
+        streamer = _bare_streamer(renditions=fs.RENDITIONS)
+        streamer._pool = ThreadPoolExecutor(max_workers=len(fs.RENDITIONS))
+        self.addCleanup(streamer._pool.shutdown)
+        frame = streamer._capture(self._frame((fs.STREAM_WIDTH, fs.STREAM_HEIGHT)))
+
+        sizes = {r: Image.open(io.BytesIO(jpeg)).size for r, jpeg in streamer._encode(*frame)}
+
+        self.assertEqual(sizes, {"high": (800, 450), "medium": (800, 450), "low": (480, 270)})
+
+    @unittest.skipUnless(fs.PIL_AVAILABLE, "Pillow not installed")
+    def test_frames_are_captured_at_the_largest_rendition(self):
+        from PIL import Image
+
+        self.assertEqual(fs.capture_size(("medium", "low")), (fs.STREAM_WIDTH, fs.STREAM_HEIGHT))
+        size = fs.capture_size(fs.RENDITIONS)
+        self.assertEqual(size, (1280, 720))
+
+        streamer = _bare_streamer(renditions=fs.RENDITIONS)
+        frame = streamer._capture(self._frame(size))
+        sizes = {r: Image.open(io.BytesIO(jpeg)).size for r, jpeg in streamer._encode(*frame)}
+
+        self.assertEqual(sizes, {"high": (1280, 720), "medium": (800, 450), "low": (480, 270)})
+
+    @unittest.skipUnless(fs.PIL_AVAILABLE, "Pillow not installed")
+    def test_only_watched_renditions_are_encoded(self):
+        streamer = _bare_streamer(renditions=fs.RENDITIONS)
+        frame = streamer._capture(self._frame((fs.STREAM_WIDTH, fs.STREAM_HEIGHT)))
+
+        streamer.apply_demand(2, ["low", "high"])
+        self.assertEqual([r for r, _ in streamer._encode(*frame)], ["high", "low"])
+
+        streamer.apply_demand(0)
+        self.assertEqual([r for r, _ in streamer._encode(*frame)], ["low"])
+
+    def test_unwatched_streamer_idles_and_wakes_for_the_first_viewer(self):
+        streamer = _bare_streamer()
+        self.assertTrue(streamer.frame_due())
+        self.assertFalse(streamer.wants_frame())
+
+        streamer.apply_demand(0)
+        self.assertEqual(streamer.capture_interval(), fs.IDLE_FRAME_INTERVAL)
+
+        streamer.apply_demand(1, ["medium"], keyframe=["medium"])
+        self.assertEqual(streamer.capture_interval(), streamer.controller.interval)
+        self.assertTrue(streamer.wants_frame())     # next frame, not next slot
+
+    def test_demand_keyframe_restarts_the_delta_encoder(self):
+        streamer = _bare_streamer()
+        streamer._delta = {"medium": fs.TileDeltaEncoder()}
+        streamer._delta["medium"]._force_keyframe = False
+        streamer.apply_demand(1, ["medium"])
+        streamer._delta["medium"]._force_keyframe = False
+
+        streamer.apply_demand(1, ["medium"], keyframe=["medium"])
+
+        self.assertTrue(streamer._delta["medium"]._force_keyframe)
+
+    @unittest.skipUnless(fs.PIL_AVAILABLE, "Pillow not installed")
+    def test_encoded_frames_carry_a_header_per_rendition(self):
+        streamer = _bare_streamer(renditions=("medium", "low"))
+        streamer._seq = {}
+        streamer._raw_q = queue.Queue()
+        streamer._q = queue.Queue()
+        pixels = streamer._capture(self._frame((fs.STREAM_WIDTH, fs.STREAM_HEIGHT)))
+        streamer._raw_q.put((pixels, 42, 1000.5))
+        streamer._raw_q.put((pixels, 43, 1001.0))
+        streamer._raw_q.put(None)
+
+        streamer._encode_loop()
+
+        first, second = streamer._q.get_nowait(), streamer._q.get_nowait()
+        self.assertEqual([r for r, _, _ in first], ["medium", "low"])
+        header, payload = stream_format.unpack_frame(first[1][1] + first[1][2])
+        self.assertEqual((header.seq, header.tick, header.captured_at), (1, 42, 1000.5))
+        self.assertTrue(stream_format.is_keyframe(payload))
+        self.assertEqual(stream_format.unpack_frame(second[0][1])[0].seq, 2)
+
+    def test_dropping_a_frame_purges_the_deltas_built_on_it(self):
+        streamer = _bare_streamer()
+        streamer._q = queue.Queue(maxsize=3)
+        key, delta = b"\xff\xd8jpeg", stream_format.pack_delta((8, 8), [])
+        frame = lambda *payloads: [(r, b"", p) for r, p in payloads]
+        streamer._enqueue(frame(("medium", key), ("low", key)))
+        streamer._enqueue(frame(("medium", delta), ("low", delta)))
+        streamer._enqueue(frame(("medium", delta), ("low", key)))
+
+        self.assertTrue(streamer._enqueue(frame(("medium", key), ("low", delta))))
+
+        queued = [streamer._q.get_nowait() for _ in range(streamer._q.qsize())]
+        self.assertEqual(queued, [frame(("low", key)), frame(("medium", key), ("low", delta))])
+
+    def test_renditions_from_env_always_include_the_default(self):
+        self.assertEqual(fs.stream_renditions_from_env("low, bogus"), ("medium", "low"))
+        self.assertEqual(fs.stream_renditions_from_env(""), ("medium",))
+
+    def test_put_latest_drops_the_oldest_item(self):
+        q = queue.Queue(maxsize=1)
+
+        self.assertFalse(fs._put_latest(q, "old"))
+        self.assertTrue(fs._put_latest(q, "new"))
+
+        self.assertEqual(q.get_nowait(), "new")
+        self.assertTrue(q.empty())
+
+
+class StreamControllerTests(unittest.TestCase):
+    def _window(self, controller, now, encode=0.0, send=0.0, drops=0):
+        controller.record_encode(encode)
+        controller.record_send(send)
+        for _ in range(drops):
+            controller.record_drop()
+        return controller.evaluate(now + controller.WINDOW)
+
+    def test_drops_step_one_rung_down(self):
+        controller = fs.StreamController()
+        now = time.monotonic()
+
+        self.assertTrue(self._window(controller, now, drops=1))
+        self.assertEqual(controller.level, 1)
+        self.assertEqual(controller.snapshot()["drops"], 1)
+
+    def test_slow_sends_step_down_until_the_bottom_rung(self):
+        controller = fs.StreamController()
+        now = time.monotonic()
+        for i in range(len(fs.STREAM_LADDER) + 2):
+            self._window(controller, now + i * controller.WINDOW, send=controller.interval)
+
+        self.assertEqual(controller.level, len(fs.STREAM_LADDER) - 1)
+
+    def test_sustained_headroom_climbs_back_up(self):
+        controller = fs.StreamController(level=2)
+        now = time.monotonic()
+        steps = int(controller.UPGRADE_AFTER / controller.WINDOW)
+        for i in range(steps - 1):
+            self.assertFalse(self._window(controller, now + i * controller.WINDOW, encode=0.001))
+        self.assertTrue(self._window(controller, now + (steps - 1) * controller.WINDOW, encode=0.001))
+        self.assertEqual(controller.level, 1)
+
+    def test_report_on_change_or_interval(self):
+        controller = fs.StreamController()
+        now = time.monotonic()
+
+        self.assertEqual(controller.pop_report(now)["fps"], fs.TARGET_FPS)
+        self.assertIsNone(controller.pop_report(now + 1))
+        self.assertIsNotNone(controller.pop_report(now + 1, changed=True))
+        self.assertIsNotNone(controller.pop_report(now + 1 + controller.REPORT_INTERVAL))
+
+
+@unittest.skipUnless(fs.PIL_AVAILABLE, "Pillow not installed")
+class TileDeltaEncoderTests(unittest.TestCase):
+    def setUp(self):
+        from PIL import Image
+
+        self.Image = Image
+        self.encoder = fs.TileDeltaEncoder()
+        self.frame = Image.new("RGB", (fs.STREAM_WIDTH, fs.STREAM_HEIGHT), (20, 40, 60))
+        self.now = time.monotonic()
+
+    def _encode(self, img, after=0.1):
+        self.now += after
+        return self.encoder.encode(img, 70, now=self.now)
+
+    def test_first_frame_is_a_keyframe_and_repeats_send_nothing(self):
+        first = self._encode(self.frame)
+
+        self.assertTrue(stream_format.is_keyframe(first))
+        self.assertEqual(self.Image.open(io.BytesIO(first)).size, self.frame.size)
+        self.assertIsNone(self._encode(self.frame.copy()))
+
+    def test_small_change_sends_only_the_touched_tiles(self):
+        self._encode(self.frame)
+        changed = self.frame.copy()
+        changed.paste((250, 250, 0), (60, 60, 90, 90))   # inside tile (1, 1)
+
+        data = self._encode(changed)
+
+        self.assertTrue(stream_format.is_delta(data))
+        size, tiles = stream_format.unpack_delta(data)
+        self.assertEqual(size, self.frame.size)
+        self.assertEqual([t[:4] for t in tiles], [(50, 50, 50, 50)])
+        tile = self.Image.open(io.BytesIO(tiles[0][4]))
+        for got, want in zip(tile.getpixel((25, 25)), (250, 250, 0)):
+            self.assertAlmostEqual(got, want, delta=8)
+
+    def test_keyframe_after_large_change_interval_or_request(self):
+        self._encode(self.frame)
+        flipped = self.Image.new("RGB", self.frame.size, (200, 0, 0))
+        self.assertTrue(stream_format.is_keyframe(self._encode(flipped)))
+
+        moved = flipped.copy()
+        moved.paste((0, 0, 0), (0, 0, 10, 10))
+        self.assertTrue(stream_format.is_keyframe(
+            self._encode(moved, after=self.encoder.KEYFRAME_INTERVAL)))
+
+        self.encoder.request_keyframe()
+        self.assertTrue(stream_format.is_keyframe(self._encode(moved)))
+
+    def test_size_change_starts_from_a_keyframe(self):
+        self._encode(self.frame)
+        smaller = self.frame.resize((640, 360))
+
+        self.assertTrue(stream_format.is_keyframe(self._encode(smaller)))
+
+
+class StreamFormatTests(unittest.TestCase):
+    def test_delta_round_trip(self):
+        tiles = [(0, 0, 50, 50, b"jpeg-a"), (750, 400, 50, 50, b"jpeg-bb")]
+
+        data = stream_format.pack_delta((800, 450), tiles)
+
+        self.assertTrue(stream_format.is_delta(data))
+        self.assertEqual(stream_format.unpack_delta(data), ((800, 450), tiles))
+        self.assertTrue(stream_format.is_keyframe(b"\xff\xd8\xff\xe0"))
+
+    def test_merged_delta_paints_both_in_order(self):
+        first = stream_format.pack_delta((800, 450), [(0, 0, 50, 50, b"a")])
+        second = stream_format.pack_delta((800, 450), [(0, 0, 50, 50, b"b")])
+
+        merged = stream_format.merge_deltas(first, second)
+
+        self.assertEqual(stream_format.unpack_delta(merged),
+                         ((800, 450), [(0, 0, 50, 50, b"a"), (0, 0, 50, 50, b"b")]))
+        with self.assertRaises(ValueError):
+            stream_format.merge_deltas(first, stream_format.pack_delta((400, 225), []))
+
+    def test_frame_header_round_trip(self):
+        framed = stream_format.pack_frame_header(7, 1200, 1234.25, 3500) + b"jpeg"
+
+        header, payload = stream_format.unpack_frame(framed)
+
+        self.assertEqual(header, stream_format.FrameHeader(7, 1200, 1234.25, 3500))
+        self.assertEqual(payload, b"jpeg")
+        self.assertEqual(stream_format.unpack_frame(b"jpeg"), (None, b"jpeg"))
+
+    def test_rendition_tag_round_trip(self):
+        tagged = stream_format.pack_rendition("low", b"payload")
+
+        self.assertEqual(stream_format.unpack_rendition(tagged), ("low", b"payload"))
+        self.assertEqual(stream_format.unpack_rendition(b"payload"),
+                         (stream_format.DEFAULT_RENDITION, b"payload"))
+
+
+if __name__ == "__main__":
+    unittest.main()
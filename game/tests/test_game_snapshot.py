@@ -0,0 +1,63 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+from game_snapshot import GameSnapshot
+
+
+def play(*events):
+    snapshot = GameSnapshot("g")
+    for event in events:
+        snapshot.apply(event["type"], event)
+    return snapshot
+
+
+START = {"type": "GAME_START", "agents": ["Red", "Blue", "Green"], "imposter": "Red"}
+
+
+class GameSnapshotTests(unittest.TestCase):
+    def test_kills_and_meetings_update_agents_phase_and_votes(self):
+        snapshot = play(START,
+                        {"type": "KILL", "killer": "Red", "victim": "Blue"},
+                        {"type": "MEETING_START", "caller": "Green"},
+                        {"type": "VOTE_CAST", "voter": "Green", "target": "Red"})
+
+        self.assertEqual(snapshot.phase, "meeting")
+        self.assertEqual([a["alive"] for a in snapshot.agents.values()], [True, False, True])
+        self.assertEqual(snapshot.meeting, {"caller": "Green", "votes": {"Green": "Red"}})
+        self.assertEqual(snapshot.hype_score, 25)
+        self.assertEqual([(m["kind"], m["relatedAgent"]) for m in snapshot.markets],
+                         [("crew_win", None), ("identify_impostor", "Red"),
+                          ("agent_survive_round", "Green"), ("meeting_ejects", None)])
+
+    def test_ejection_and_game_end_resolve_markets(self):
+        snapshot = play(START,
+                        {"type": "KILL", "killer": "Red", "victim": "Blue"},
+                        {"type": "MEETING_START", "caller": "Green"},
+                        {"type": "AGENT_EJECTED", "ejected": "Red", "was_imposter": True})
+        self.assertEqual(snapshot.phase, "running")
+        self.assertIsNone(snapshot.meeting)
+        self.assertEqual([m["resolved"] for m in snapshot.markets], [None, "YES", "YES", "YES"])
+
+        snapshot.apply("GAME_END", {"type": "GAME_END", "winner": "crew", "imposter": "Red"})
+        self.assertEqual((snapshot.phase, snapshot.winner), ("ended", "crew"))
+        self.assertEqual(snapshot.markets[0]["resolved"], "YES")
+
+    def test_message_carries_the_seq_and_is_rebuilt_after_a_change(self):
+        snapshot = play(START)
+        first = json.loads(snapshot.message(1))
+        self.assertEqual((first["type"], first["seq"]), ("STATE_SNAPSHOT", 1))
+
+        snapshot.apply("AGENT_SPOKE", {"type": "AGENT_SPOKE"})    # no state in it
+        self.assertEqual(json.loads(snapshot.message(2))["state"], first["state"])
+        snapshot.apply("KILL", {"type": "KILL", "killer": "Red", "victim": "Green"})
+        self.assertEqual(json.loads(snapshot.message(3))["state"]["kills"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
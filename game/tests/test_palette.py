@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+import palette
+
+
+class PaletteTests(unittest.TestCase):
+    def setUp(self):
+        # Base rig paths are relative to the game directory.
+        self._cwd = os.getcwd()
+        os.chdir(str(GAME_DIR))
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+
+    def test_sprite_set_matches_base_walk_cycle(self):
+        sprites = palette.agent_sprites("Blue")
+
+        for direction, (_, count) in palette.BASE_WALK_FRAMES.items():
+            self.assertEqual(len(sprites[direction]), count)
+            self.assertEqual(sprites[direction][0].get_size(), palette.PLAYER_SPRITE_SIZE)
+        self.assertIn("dead", sprites)
+        self.assertIn("ghost_left", sprites)
+
+    def test_sprites_are_cached_per_colour(self):
+        self.assertIs(palette.agent_sprites("Green"), palette.agent_sprites("Green"))
+        self.assertIs(
+            palette.agent_sprites("Green"),
+            palette.agent_sprites(palette.SUIT_COLOURS["Green"]),
+        )
+        self.assertIsNot(palette.agent_sprites("Green"), palette.agent_sprites("Pink"))
+
+    def test_suit_pixels_take_the_requested_colour(self):
+        frame = palette.agent_sprites((0, 200, 0))["down"][0]
+        w, h = frame.get_size()
+        r, g, b, a = frame.get_at((w // 2, int(h * 0.45)))
+
+        self.assertGreater(a, 200)
+        self.assertGreater(g, r + 60)
+        self.assertGreater(g, b + 60)
+
+    def test_unknown_names_get_stable_distinct_colours(self):
+        first = palette.suit_colour("Agent-17")
+
+        self.assertEqual(first, palette.suit_colour("Agent-17"))
+        self.assertNotEqual(first, palette.suit_colour("Agent-18"))
+        self.assertEqual(palette.suit_colour("#102030"), (16, 32, 48))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+import urllib.request
+from pathlib import Path
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+import pubsub
+import stream_format
+
+try:
+    import uvicorn  # noqa: F401
+    from websockets.sync.client import connect
+except ImportError:  # bridge dependencies are optional for the game itself
+    connect = None
+
+
+class PubSubTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "bridge.sock")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_memory_backend_numbers_and_delivers_at_once(self):
+        delivered = []
+        backend = pubsub.MemoryPubSub()
+        asyncio.run(backend.start(lambda message, event: delivered.append((message, event))))
+        backend.publish("g", "KILL", 1.0, '{"type":"KILL"}', base=0, event={"type": "KILL"})
+        backend.publish("g", "FRAME", 2.0, '{"type":"FRAME"}', base=1)
+        backend.publish("g", "VOTE_CAST", 3.0, '{"type":"VOTE_CAST"}', base=7)
+
+        self.assertEqual([(m.seq, m.origin) for m, _ in delivered], [(1, True), (0, True), (8, True)])
+        self.assertEqual(delivered[0][1], {"type": "KILL"})
+
+    def test_broker_numbers_events_once_for_all_workers(self):
+        async def run():
+            broker = pubsub.Broker()
+            serving = asyncio.create_task(broker.serve(self.path))
+            await asyncio.sleep(0.05)
+            got = {"a": [], "b": []}
+            a, b = pubsub.UnixPubSub(self.path), pubsub.UnixPubSub(self.path)
+            await a.start(lambda message, _: got["a"].append(message))
+            await b.start(lambda message, _: got["b"].append(message))
+
+            a.publish("g", "KILL", 1.0, '{"type":"KILL"}', base=0, mark=("em-1", 7))
+            b.publish("g", "VOTE_CAST", 2.0, '{"type":"VOTE_CAST"}', base=0)
+            a.publish("other", "GAME_START", 3.0, '{"type":"GAME_START"}', base=4)
+            for _ in range(100):
+                if len(got["a"]) == len(got["b"]) == 3:
+                    break
+                await asyncio.sleep(0.01)
+            await a.stop()
+            await b.stop()
+            await asyncio.sleep(0.05)
+            serving.cancel()
+            return got
+
+        got = asyncio.run(run())
+        numbered = lambda messages: [(m.game_id, m.seq, m.type, m.origin) for m in messages]
+        # Both workers see the same order; the two publishers' events may interleave
+        self.assertEqual([m[:3] for m in numbered(got["a"])], [m[:3] for m in numbered(got["b"])])
+        self.assertEqual(sorted(numbered(got["a"])), [("g", 1, "KILL", True),
+                                                      ("g", 2, "VOTE_CAST", False),
+                                                      ("other", 5, "GAME_START", True)])
+        self.assertEqual(sorted(m.origin for m in got["b"]), [False, False, True])
+        # Every worker learns how far the emitter got, to drop its redeliveries
+        self.assertEqual({m.type: m.mark for m in got["b"]},
+                         {"KILL": ("em-1", 7), "VOTE_CAST": None, "GAME_START": None})
+
+    def test_relays_reach_the_other_workers_unnumbered(self):
+        async def run():
+            broker = pubsub.Broker()
+            serving = asyncio.create_task(broker.serve(self.path))
+            await asyncio.sleep(0.05)
+            events, relays = {"a": [], "b": []}, {"a": [], "b": []}
+            a, b = pubsub.UnixPubSub(self.path), pubsub.UnixPubSub(self.path)
+            await a.start(lambda m, _: events["a"].append(m), relays["a"].append)
+            await b.start(lambda m, _: events["b"].append(m), relays["b"].append)
+
+            self.assertTrue(a.relay("VIDEO", "g", "main", b"\xff\xd8frame"))
+            a.publish("g", "KILL", 1.0, '{"type":"KILL"}', base=0)
+            for _ in range(100):
+                if relays["b"] and events["a"]:
+                    break
+                await asyncio.sleep(0.01)
+            await a.stop()
+            await b.stop()
+            serving.cancel()
+            return events, relays, b.stats()
+
+        events, relays, stats = asyncio.run(run())
+        self.assertEqual(relays["a"], [])       # not back to the sender
+        self.assertEqual(relays["b"], [pubsub.Relayed("VIDEO", "g", "main", relays["b"][0].worker,
+                                                      b"\xff\xd8frame")])
+        # Relays take no seq from the game's events
+        self.assertEqual([m.seq for m in events["a"]], [1])
+        self.assertEqual(stats["relays_received"], 1)
+
+    def test_publishing_without_a_broker_is_refused(self):
+        async def run():
+            backend = pubsub.UnixPubSub(self.path)
+            pubsub.CONNECT_TIMEOUT, timeout = 0.05, pubsub.CONNECT_TIMEOUT
+            try:
+                await backend.start(lambda message, event: None)
+            finally:
+                pubsub.CONNECT_TIMEOUT = timeout
+            with self.assertRaises(pubsub.PubSubUnavailable):
+                backend.publish("g", "KILL", 1.0, "{}", base=0)
+            await backend.stop()
+
+        asyncio.run(run())
+
+    def test_publishing_to_a_broker_that_stopped_reading_is_refused(self):
+        async def run():
+            async def stalled(reader, writer):
+                await asyncio.sleep(3600)
+
+            server = await asyncio.start_unix_server(stalled, self.path)
+            backend = pubsub.UnixPubSub(self.path)
+            await backend.start(lambda message, event: None)
+            limit, pubsub.MAX_BUFFERED = pubsub.MAX_BUFFERED, 64 * 1024
+            try:
+                with self.assertRaises(pubsub.PubSubUnavailable):
+                    for _ in range(10000):
+                        backend.publish("g", "AGENT_SPOKE", 1.0, "x" * 1000, base=0)
+            finally:
+                pubsub.MAX_BUFFERED = limit
+            self.assertEqual(backend.stats()["refused"], 1)
+            await backend.stop()
+            server.close()
+
+        asyncio.run(run())
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@unittest.skipIf(connect is None, "bridge dependencies not installed")
+class MultiWorkerTests(unittest.TestCase):
+    """Two bridge processes and a broker, as SUS_BRIDGE_WORKERS runs them."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(cls._tmp.name, "bridge.sock")
+        env = {**os.environ, "SUS_PUBSUB": f"unix:{path}", "SUS_EVENT_STORE": "off",
+               "SUS_RECORDING_DIR": "off"}
+        cls.procs = [subprocess.Popen([sys.executable, "pubsub.py", path], cwd=GAME_DIR,
+                                      stdout=subprocess.DEVNULL)]
+        cls.ports = [_free_port(), _free_port()]
+        for port in cls.ports:
+            cls.procs.append(subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "bridge_server:app", "--port", str(port),
+                 "--log-level", "warning"], cwd=GAME_DIR, env=env, stdout=subprocess.DEVNULL))
+        deadline = time.monotonic() + 20
+        for port in cls.ports:
+            while time.monotonic() < deadline:
+                try:
+                    health = cls.get(port, "/health")
+                    if health["pubsub"]["connected"]:
+                        break
+                except OSError:
+                    pass
+                time.sleep(0.1)
+
+    @classmethod
+    def tearDownClass(cls):
+        for proc in cls.procs:
+            proc.terminate()
+            proc.wait(timeout=5)
+        cls._tmp.cleanup()
+
+    @staticmethod
+    def get(port, path):
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as resp:
+            return json.loads(resp.read())
+
+    def post(self, port, path, body):
+        request = urllib.request.Request(f"http://127.0.0.1:{port}{path}",
+                                         data=json.dumps(body).encode(),
+                                         headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(request, timeout=5).close()
+
+    def test_events_ingested_at_one_worker_reach_viewers_of_another(self):
+        ingest, view = self.ports
+        self.post(ingest, "/game/ingest/g-multi", {"type": "GAME_START", "agents": ["Red", "Blue"]})
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                snapshot = self.get(view, "/game/g-multi/state")
+                break
+            except OSError:
+                time.sleep(0.05)
+        self.assertEqual((snapshot["seq"], snapshot["state"]["phase"]), (1, "running"))
+
+        with connect(f"ws://127.0.0.1:{view}/ws/game/g-multi?since=1", open_timeout=5) as client:
+            time.sleep(0.2)     # subscribed
+            self.post(ingest, "/game/ingest/g-multi", {"type": "KILL", "killer": "Red",
+                                                      "victim": "Blue"})
+            self.post(view, "/game/ingest/g-multi", {"type": "MEETING_START", "caller": "Red"})
+            events = [json.loads(client.recv(timeout=5)) for _ in range(2)]
+        self.assertEqual([(e["seq"], e["type"]) for e in events], [(2, "KILL"), (3, "MEETING_START")])
+        self.assertEqual(self.get(ingest, "/game/g-multi")["hypeScore"], 25)
+
+    def test_a_feed_streaming_to_one_worker_is_watched_on_another(self):
+        stream_port, view = self.ports
+        delta = stream_format.pack_delta((800, 450), [(0, 0, 50, 50, b"tile")])
+        frames = [stream_format.pack_frame_header(seq, seq, time.time(), 0) + payload
+                  for seq, payload in ((1, b"\xff\xd8key"), (2, delta))]
+
+        with connect(f"ws://127.0.0.1:{stream_port}/ws/stream/g-mvid", open_timeout=5) as stream:
+            self.assertEqual(json.loads(stream.recv(timeout=5))["viewers"], 0)
+            with connect(f"ws://127.0.0.1:{view}/ws/video/g-mvid", open_timeout=5) as viewer:
+                # The other worker's viewer counts, and asks for a keyframe
+                demand = json.loads(stream.recv(timeout=5))
+                self.assertEqual((demand["viewers"], demand["keyframe"]), (1, ["medium"]))
+                for frame in frames:
+                    stream.send(frame)
+                self.assertEqual([viewer.recv(timeout=5) for _ in frames], frames)
+
+                self.assertEqual(self.get(view, "/game/g-mvid/feeds")["feeds"], ["main"])
+                with urllib.request.urlopen(f"http://127.0.0.1:{view}/game/g-mvid/thumbnail",
+                                            timeout=5) as resp:
+                    self.assertEqual(resp.read(), b"\xff\xd8key")
+
+        deadline = time.monotonic() + 5
+        while self.get(view, "/game/g-mvid/feeds")["feeds"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.get(view, "/game/g-mvid/feeds")["feeds"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -82,12 +82,18 @@ class DummyEmitter:
 
 
 class DummyFrameStreamer:
-    def __init__(self, game_id="game-001"):
+    def __init__(self, game_id="game-001", feed="main"):
         self.game_id = game_id
+        self.feed = feed
         self.calls = []
+        self.wanted = True
 
-    def submit(self, surface):
+    def wants_frame(self):
+        return self.wanted
+
+    def submit(self, surface, tick=0):
         self.calls.append(("submit", surface))
+        self.tick = tick
 
     def close(self):
         self.calls.append(("close",))
@@ -174,6 +180,40 @@ class RuntimeAdaptersTests(unittest.TestCase):
             self.assertIn(("submit", surface), runtime.frame_streamer.calls)
             self.assertIn(("close",), runtime.frame_streamer.calls)
 
+    def test_legacy_event_runtime_opens_one_stream_per_camera_feed(self):
+        with patch.object(ra, "MonadSusChainIntegration", DummyChain), patch.object(
+            ra, "GameEmitter", DummyEmitter
+        ), patch.object(ra, "FrameStreamer", DummyFrameStreamer):
+            runtime = ra.LegacyEventRuntime()
+            main, director = object(), object()
+
+            runtime.stream_frame(main)
+            runtime.stream_frame(director, "director")
+            runtime.stream_frame(director, "director")
+            runtime.close()
+
+            self.assertEqual(runtime.frame_streamer.calls[0], ("submit", main))
+            streamer = runtime.feed_streamers["director"]
+            self.assertEqual(streamer.feed, "director")
+            self.assertEqual(streamer.calls, [("submit", director), ("submit", director), ("close",)])
+
+    def test_stream_wanted_follows_the_feed_streamer(self):
+        with patch.object(ra, "MonadSusChainIntegration", DummyChain), patch.object(
+            ra, "GameEmitter", DummyEmitter
+        ), patch.object(ra, "FrameStreamer", DummyFrameStreamer):
+            runtime = ra.LegacyEventRuntime()
+            runtime.frame_streamer.wanted = False
+            runtime.set_tick(120)
+            runtime.stream_frame(object())
+            self.assertEqual(runtime.frame_streamer.tick, 120)
+            self.assertEqual(runtime.emitter.tick, 120)
+
+            self.assertFalse(runtime.stream_wanted())
+            # Asking about a feed opens its stream so the bridge can list it
+            self.assertTrue(runtime.stream_wanted("imposter"))
+            self.assertIn("imposter", runtime.feed_streamers)
+            self.assertFalse(ra.NullEventRuntime().stream_wanted())
+
 
 if __name__ == "__main__":
     unittest.main()
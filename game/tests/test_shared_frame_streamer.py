@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+import shared_frame_streamer as sfs
+
+
+class FrameRingTests(unittest.TestCase):
+    SIZE = (4, 2)
+    STRIDE = 16
+
+    def setUp(self):
+        self.ring = sfs.FrameRing.create(slots=3, slot_bytes=self.STRIDE * self.SIZE[1])
+        self.reader = sfs.FrameRing.attach(self.ring.shm.name, 3, self.ring.slot_bytes)
+
+    def tearDown(self):
+        self.reader.close()
+        self.ring.close()
+        self.ring.unlink()
+
+    def _write(self, seq, fill):
+        return self.ring.write(seq, bytes([fill]) * self.STRIDE * self.SIZE[1],
+                               self.SIZE, self.STRIDE, "BGRX", tick=seq * 10, captured_at=seq + 0.5)
+
+    def test_reader_gets_the_latest_frame_only_once(self):
+        self.assertIsNone(self.reader.read_latest(0))
+        self._write(1, 10)
+        self._write(2, 20)
+
+        seq, ((data, size, rawmode, stride), tick, captured_at) = self.reader.read_latest(0)
+        self.assertEqual(seq, 2)
+        self.assertEqual(data[:1], bytes([20]))
+        self.assertEqual((size, rawmode, stride), (self.SIZE, "BGRX", self.STRIDE))
+        self.assertEqual((tick, captured_at), (20, 2.5))
+        self.assertIsNone(self.reader.read_latest(seq))
+
+    def test_writer_skips_latest_and_reading_slots(self):
+        for seq in range(1, 10):
+            _, latest_slot, reading_slot, _, _ = self.ring._header()
+            self._write(seq, seq)
+            written = self.ring._header()[1]
+            self.assertNotIn(written, (latest_slot, reading_slot))
+            if seq % 2:
+                self.reader.read_latest(seq - 1)
+
+    def test_torn_slot_is_dropped(self):
+        self._write(1, 1)
+        # Writer started rewriting the published slot (seq cleared)
+        index = self.ring._header()[1]
+        sfs._SLOT_HEADER.pack_into(self.ring.shm.buf, self.ring._slot_offset(index),
+                                   0, 0, 0, 0, 0, 0, 0.0)
+
+        self.assertIsNone(self.reader.read_latest(0))
+
+    def test_oversized_frame_is_rejected(self):
+        self.assertFalse(self.ring.write(1, bytes(self.ring.slot_bytes + 1), self.SIZE, 0, "RGB"))
+
+    def test_close_stream_is_visible_to_reader(self):
+        self.assertFalse(self.reader.closed)
+        self.ring.close_stream()
+        self.assertTrue(self.reader.closed)
+
+    def test_capture_interval_is_set_by_the_encoder_side(self):
+        self.assertAlmostEqual(self.ring.capture_interval, sfs.FRAME_INTERVAL, places=5)
+        self.reader.set_capture_interval(5.0)
+        self.assertEqual(self.ring.capture_interval, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+import stream_format
+import stream_recorder as sr
+
+
+def framed(seq, payload, captured_at=None):
+    header = stream_format.pack_frame_header(seq, seq * 10, captured_at or float(seq), 0)
+    return header + payload
+
+
+DELTA = stream_format.pack_delta((800, 450), [(0, 0, 8, 8, b"tile")])
+
+
+class StreamRecorderTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def record(self, frames, segment_bytes=sr.SEGMENT_BYTES):
+        recorder = sr.StreamRecorder(self.root, "g", "main", segment_bytes=segment_bytes)
+        for frame, keyframe in frames:
+            recorder.append(frame, keyframe)
+        recorder.close()
+        return recorder
+
+    def test_recording_starts_at_a_keyframe_and_is_indexed(self):
+        recorder = self.record([(framed(1, DELTA), False), (framed(2, b"key"), True),
+                                (framed(3, DELTA), False)])
+
+        self.assertEqual(recorder.frames, 2)
+        meta = sr.read_meta(recorder.path)
+        self.assertTrue(meta["ended"])
+        data = (recorder.path / sr.segment_name(0)).read_bytes()
+        self.assertEqual(len(data), meta["segments"][0])    # preallocation trimmed
+        self.assertEqual([stream_format.unpack_frame(f)[0].seq for f in sr.iter_records(data)],
+                         [2, 3])
+        self.assertEqual(sr.read_index(recorder.path), [sr.IndexEntry(0, 0, 20, 2.0)])
+
+    def test_full_segments_roll_over(self):
+        frames = [(framed(seq, b"k" * 100), seq % 3 == 1) for seq in range(1, 10)]
+        recorder = self.record(frames, segment_bytes=300)
+
+        lengths = sr.read_meta(recorder.path)["segments"]
+        self.assertGreater(len(lengths), 1)
+        self.assertTrue(all(length <= 300 for length in lengths))
+        index = sr.read_index(recorder.path)
+        self.assertEqual([entry.tick for entry in index], [10, 40, 70])
+
+    def test_clip_starts_at_the_keyframe_before_it(self):
+        frames = [(framed(seq, b"k" * 100 if seq % 3 == 1 else DELTA), seq % 3 == 1)
+                  for seq in range(1, 10)]
+        recorder = self.record(frames, segment_bytes=300)
+
+        clip = list(sr.read_clip(recorder.path, start=5.5, end=8.0))
+        self.assertEqual([stream_format.unpack_frame(f)[0].seq for f in clip], [4, 5, 6, 7, 8])
+
+    def test_reconnect_continues_in_a_new_segment(self):
+        self.record([(framed(1, b"a"), True)])
+        recorder = self.record([(framed(2, b"b"), True)])
+
+        self.assertEqual(len(sr.read_meta(recorder.path)["segments"]), 2)
+        self.assertEqual([entry.segment for entry in sr.read_index(recorder.path)], [0, 1])
+
+    def test_crashed_segment_is_recovered(self):
+        path = self.root / "g" / "main"
+        path.mkdir(parents=True)
+        record = len(framed(1, b"a")).to_bytes(4, "little") + framed(1, b"a")
+        (path / sr.segment_name(0)).write_bytes(record + bytes(1000))   # preallocated tail
+
+        recorder = self.record([])
+
+        self.assertEqual(sr.read_meta(recorder.path)["segments"], [len(record)])
+
+    def test_live_recording_is_readable_without_the_recorder(self):
+        recorder = sr.StreamRecorder(self.root, "g", "main")
+        try:
+            recorder.append(framed(1, b"key"), True)
+            recorder.append(framed(2, DELTA), False)
+            deadline = time.monotonic() + 2
+            while recorder.frames < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            # As another bridge worker sees it: from disk only
+            self.assertEqual(sr.segment_lengths(recorder.path), recorder.segment_lengths())
+            clip = list(sr.read_clip(recorder.path, start=1.0, end=2.0))
+            self.assertEqual([stream_format.unpack_frame(f)[0].seq for f in clip], [1, 2])
+        finally:
+            recorder.close()
+
+    def test_names_that_would_leave_the_directory_are_rejected(self):
+        self.assertTrue(sr.valid_name("game-001"))
+        self.assertFalse(sr.valid_name(".."))
+        self.assertFalse(sr.valid_name("a/b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
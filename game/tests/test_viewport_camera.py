@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+import pygame as pg
+
+_orig_cwd = os.getcwd()
+os.chdir(str(GAME_DIR))
+# tilemap star-imports settings, which loads assets relative to GAME_DIR
+import tilemap
+os.chdir(_orig_cwd)
+
+
+class _Target:
+    def __init__(self, x, y):
+        self.rect = pg.Rect(x, y, 64, 86)
+
+
+class ViewportCameraTests(unittest.TestCase):
+    def test_scale_one_matches_window_camera(self):
+        window = tilemap.Camera(4000, 3000)
+        viewport = tilemap.ViewportCamera(4000, 3000, tilemap.WIDTH, tilemap.HEIGHT, 1.0)
+        target = _Target(1700, 1200)
+
+        window.update(target)
+        viewport.update(target)
+
+        self.assertEqual(viewport.apply(target), window.apply(target))
+
+    def test_target_is_centred_in_scaled_viewport(self):
+        cam = tilemap.ViewportCamera(4000, 3000, 800, 450, 0.625)
+        target = _Target(1600, 1200)
+
+        cam.update(target)
+        rect = cam.apply(target)
+
+        self.assertEqual(rect.topleft, (400, 225))
+        self.assertEqual(rect.size, (40, 53))
+
+    def test_scrolling_is_clamped_to_scaled_map(self):
+        cam = tilemap.ViewportCamera(4000, 3000, 800, 450, 0.625)
+
+        cam.update(_Target(3990, 2990))
+        map_rect = cam.apply_rect(pg.Rect(0, 0, 4000, 3000))
+
+        self.assertEqual(map_rect.bottomright, (800, 450))
+
+
+if __name__ == "__main__":
+    unittest.main()
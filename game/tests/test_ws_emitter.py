@@ -0,0 +1,191 @@
+import json
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+GAME_DIR = Path(__file__).resolve().parents[1]
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+import ws_emitter
+
+
+def _event(line):
+    """The event of a stamped line, checked against its stamp."""
+    etype, timestamp, emitter, emit_seq, data = line.decode().split(" ", 4)
+    event = json.loads(data)
+    assert [etype, float(timestamp), emitter, int(emit_seq)] == \
+        [event["type"], event["timestamp"], event["emitter"], event["emit_seq"]], line
+    return event
+
+
+class _Bridge(BaseHTTPRequestHandler):
+    """Records each ingest request and the connection it came on."""
+
+    protocol_version = "HTTP/1.1"   # keep-alive
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests.append((self.path, id(self.connection),
+                                     [_event(line) for line in body.splitlines()]))
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class GameEmitterTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.port = _free_port()
+        self.server = None
+        self._saved = (ws_emitter.BRIDGE_URL, ws_emitter.SPOOL_DIR, ws_emitter.RETRY_MIN,
+                       ws_emitter.MAX_QUEUED)
+        ws_emitter.BRIDGE_URL = f"http://127.0.0.1:{self.port}"
+        ws_emitter.SPOOL_DIR = Path(self._tmp.name)
+        ws_emitter.RETRY_MIN = 0.05
+
+    def tearDown(self):
+        (ws_emitter.BRIDGE_URL, ws_emitter.SPOOL_DIR, ws_emitter.RETRY_MIN,
+         ws_emitter.MAX_QUEUED) = self._saved
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        self._tmp.cleanup()
+
+    def start_bridge(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", self.port), _Bridge)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def received(self):
+        return [event for _, _, batch in self.server.requests for event in batch]
+
+    def wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_a_burst_of_events_goes_out_in_a_few_requests_on_one_connection(self):
+        self.start_bridge()
+        emitter = ws_emitter.GameEmitter("g 1")
+        emitter.tick = 7
+        for i in range(50):
+            emitter.vote_cast(f"agent-{i}", None)
+        emitter.close()
+
+        requests = self.server.requests
+        self.assertLess(len(requests), 10)
+        self.assertEqual({path for path, _, _ in requests}, {"/game/ingest/g%201/batch"})
+        self.assertEqual(len({conn for _, conn, _ in requests}), 1)
+        events = self.received()
+        self.assertEqual([e["voter"] for e in events], [f"agent-{i}" for i in range(50)])
+        self.assertEqual([e["emit_seq"] for e in events], list(range(1, 51)))
+        self.assertEqual((events[0]["game_id"], events[0]["tick"]), ("g 1", 7))
+        self.assertEqual((emitter.sent, emitter.batches, emitter.dropped), (50, len(requests), 0))
+
+    def test_events_are_spooled_while_the_bridge_is_down_and_delivered_in_order(self):
+        emitter = ws_emitter.GameEmitter("g-down")
+        emitter.kill("Red", "Blue")
+        emitter.meeting_start("Red")
+        self.assertTrue(self.wait_for(lambda: emitter.stats()["spooled"] == 2))
+        self.assertGreater(emitter.stats()["spool_bytes"], 0)
+
+        self.start_bridge()
+        emitter.game_end("crew", "Red")
+        emitter.close()
+
+        self.assertEqual([e["type"] for e in self.received()],
+                         ["KILL", "MEETING_START", "GAME_END"])
+        stats = emitter.stats()
+        self.assertEqual((stats["sent"], stats["spooled"], stats["dropped"]), (3, 0, 0))
+        self.assertGreaterEqual(stats["retries"], 1)
+        self.assertEqual(list(Path(self._tmp.name).iterdir()), [])
+
+    def test_a_full_queue_spills_to_the_spool_in_order(self):
+        ws_emitter.MAX_QUEUED = 2
+        emitter = ws_emitter.GameEmitter("g-full")
+        for i in range(30):
+            emitter.vote_cast(f"agent-{i}", None)
+        self.assertTrue(self.wait_for(lambda: emitter.stats()["spooled"] == 30))
+
+        self.start_bridge()
+        emitter.close()
+        self.assertEqual([e["emit_seq"] for e in self.received()], list(range(1, 31)))
+        self.assertEqual(emitter.dropped, 0)
+
+    def test_the_next_emitter_of_a_game_delivers_what_was_left_spooled(self):
+        first = ws_emitter.GameEmitter("g-left")
+        first.kill("Red", "Blue")
+        first.game_end("imposter", "Red")
+        first.close()
+        self.assertEqual(first.stats()["spooled"], 2)
+
+        self.start_bridge()
+        second = ws_emitter.GameEmitter("g-left")
+        second.game_start(["Red", "Blue"], "Red")
+        second.close()
+        self.assertEqual([(e["type"], e["emitter"]) for e in self.received()],
+                         [("KILL", first.emitter_id), ("GAME_END", first.emitter_id),
+                          ("GAME_START", second.emitter_id)])
+
+    def test_a_line_cut_short_is_dropped_from_the_spool(self):
+        spool = ws_emitter.Spool(Path(self._tmp.name), "g-torn")
+        spool.append([b'{"type": "KILL", "timestamp": 1.0}'])
+        with open(spool.path, "ab") as f:
+            f.write(b'{"type": "GAME_')
+
+        recovered = ws_emitter.Spool(Path(self._tmp.name), "g-torn")
+        self.assertEqual(recovered.depth, 1)
+        self.assertEqual(recovered.read(10)[0], [b'{"type": "KILL", "timestamp": 1.0}'])
+
+    def test_a_failed_batch_goes_before_what_was_spilled_meanwhile(self):
+        spool = ws_emitter.Spool(Path(self._tmp.name), "g-prepend")
+        spool.append([b'{"emit_seq": 1}', b'{"emit_seq": 4}', b'{"emit_seq": 5}'])
+        _, end = spool.read(1)
+        spool.commit(end, 1)      # delivered
+
+        spool.prepend([b'{"emit_seq": 2}', b'{"emit_seq": 3}'])
+
+        lines, _ = spool.read(10)
+        self.assertEqual([json.loads(line)["emit_seq"] for line in lines], [2, 3, 4, 5])
+        self.assertEqual(ws_emitter.Spool(Path(self._tmp.name), "g-prepend").depth, 4)
+
+    def test_lines_are_stamped_unless_the_type_has_whitespace(self):
+        event = {"type": "KILL", "game_id": "g", "timestamp": 1.5, "emitter": "em-1",
+                 "emit_seq": 3}
+        line = ws_emitter.stamped_line(event)
+        self.assertTrue(line.startswith(b"KILL 1.5 em-1 3 {"))
+        self.assertEqual(ws_emitter.line_timestamp(line), 1.5)
+
+        plain = ws_emitter.stamped_line({**event, "type": "BIG KILL"})
+        self.assertEqual(json.loads(plain)["type"], "BIG KILL")
+        self.assertEqual(ws_emitter.line_timestamp(plain), 1.5)
+
+    def test_without_a_spool_events_are_dropped_while_the_bridge_is_down(self):
+        ws_emitter.SPOOL_DIR = None
+        emitter = ws_emitter.GameEmitter("g-nospool")
+        emitter.kill("Red", "Blue")
+        emitter.close()
+        self.assertEqual((emitter.sent, emitter.dropped), (0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -70,3 +70,39 @@ class Camera:
 
         # Adjust camera rectangle
         self.camera = pg.Rect(x, y, self.width, self.height)
+
+
+class ViewportCamera(Camera):
+    """
+    Camera for an arbitrary-size viewport that draws the world scaled.
+
+    Used when rendering straight into an offscreen target (e.g. at stream
+    resolution): positions and sizes are multiplied by `scale`, and the
+    caller blits a map image pre-scaled by the same factor.
+    """
+    def __init__(self, width, height, view_width, view_height, scale=1.0):
+        super().__init__(width, height)
+        self.view_width = view_width
+        self.view_height = view_height
+        self.scale = scale
+
+    def apply(self, entity):
+        return self.apply_rect(entity.rect)
+
+    def apply_rect(self, rect):
+        s = self.scale
+        return pg.Rect(int(rect.x * s) + self.camera.x, int(rect.y * s) + self.camera.y,
+                       int(rect.width * s), int(rect.height * s))
+
+    def update(self, player_sprite):
+        s = self.scale
+        x = -int(player_sprite.rect.x * s) + int(self.view_width / 2)
+        y = -int(player_sprite.rect.y * s) + int(self.view_height / 2)
+
+        # Limit scrolling to the (scaled) map edges
+        x = min(0, x)
+        x = max(-(int(self.width * s) - self.view_width), x)
+        y = min(0, y)
+        y = max(-(int(self.height * s) - self.view_height), y)
+
+        self.camera = pg.Rect(x, y, self.width, self.height)
@@ -3,6 +3,29 @@ WebSocket Event Emitter for the game engine.
 
 Non-blocking: events are queued in a background thread and POSTed
 to the bridge server, so the game loop never stalls on network I/O.
+Events leave here complete (game_id, timestamp, tick), so the bridge can
+pass them on to spectators as they are.
+
+The worker sends whatever has queued up — up to BATCH_EVENTS, waiting at
+most BATCH_WAIT after the first — in one request to
+/game/ingest/{game_id}/batch, over one kept-alive connection. A meeting's
+burst of AGENT_SPOKE and VOTE_CAST events costs a request or two, not a
+TCP handshake each. Each line is the event's type, timestamp, "emitter"
+and "emit_seq", then the event itself (see stamped_line), so the bridge
+can pass it on without decoding it.
+
+Delivery survives the bridge going away. A batch the bridge doesn't take
+goes to an append-only spool file (SUS_EMIT_SPOOL, one per game), and so
+does everything after it until the spool has been delivered, oldest
+first, retrying with backoff. Each event carries "emitter" and "emit_seq"
+so the bridge can drop one it already has (a batch that arrived but whose
+response didn't). Memory holds at most MAX_QUEUED events; when the worker
+falls that far behind, emit() moves the queue to the spool. What is still
+spooled at close() is delivered by the next emitter for the game, or by
+
+    python ws_emitter.py
+
+stats() reports the queue, the spool and how far behind delivery is.
 
 Usage:
     from ws_emitter import GameEmitter
@@ -11,15 +34,154 @@ Usage:
     emitter.close()
 """
 
+import http.client
+import itertools
 import json
 import os
 import queue
 import threading
-import urllib.request
-import urllib.error
+import time
+import urllib.parse
+import uuid
+from pathlib import Path
 from typing import Any
 
 BRIDGE_URL = os.environ.get("BRIDGE_URL", "http://localhost:8000")
+BATCH_EVENTS = 200      # most events sent in one request
+BATCH_WAIT = 0.02       # seconds to wait for more events after the first
+TIMEOUT = 2
+MAX_QUEUED = 10000      # events held in memory; the worker spools them while the bridge is away
+RETRY_MIN = 0.5         # seconds before retrying the spool, doubling up to RETRY_MAX
+RETRY_MAX = 10.0
+
+
+def spool_dir_from_env() -> Path | None:
+    """Read SUS_EMIT_SPOOL; None when spooling is off."""
+    value = os.environ.get("SUS_EMIT_SPOOL", "spool").strip()
+    if not value or value.lower() in {"off", "0", "false", "no"}:
+        return None
+    return Path(value)
+
+
+SPOOL_DIR = spool_dir_from_env()
+
+# Queued by emit() after it moved the queue to the spool, to wake the worker
+_SPILLED = object()
+
+
+def stamped_line(event: dict) -> bytes:
+    """
+    An event as one line of a batch: "<type> <timestamp> <emitter>
+    <emit_seq> <event JSON>". The bridge reads the stamp and passes the
+    JSON on as it is. A type with whitespace in it goes as plain JSON.
+    """
+    etype, data = event["type"], json.dumps(event)
+    if etype.split() != [etype]:
+        return data.encode()
+    return f"{etype} {event['timestamp']!r} {event['emitter']} {event['emit_seq']} {data}".encode()
+
+
+def line_timestamp(line: bytes) -> float | None:
+    """Timestamp of a stamped_line (or of a plain JSON line, as older spools have)."""
+    try:
+        if line.startswith(b"{"):
+            timestamp = json.loads(line).get("timestamp")
+        else:
+            timestamp = float(line.split(b" ", 2)[1])
+    except (ValueError, IndexError):
+        return None
+    return timestamp if isinstance(timestamp, (int, float)) else None
+
+
+class Spool:
+    """
+    Events of one game the bridge hasn't taken yet, one stamped_line per
+    line. Delivered lines are skipped by offset (kept in a .offset file
+    beside it), and the file is removed once all of it is delivered.
+    """
+
+    def __init__(self, directory: Path, game_id: str):
+        name = urllib.parse.quote(game_id, safe="")
+        self.path = Path(directory) / f"{name}.ndjson"
+        self._offset_path = self.path.with_suffix(".offset")
+        self.offset = 0                 # bytes already delivered
+        self.depth = 0                  # events not yet delivered
+        self.oldest: float | None = None    # timestamp of the first of them
+        if self.path.exists():
+            self._recover()
+
+    def _recover(self):
+        try:
+            self.offset = int(self._offset_path.read_text())
+        except (OSError, ValueError):
+            self.offset = 0
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            # A line cut short by a crash mid-append would spoil its batch
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        self.depth = sum(1 for line in data[self.offset:end].split(b"\n") if line.strip())
+        if not self.depth:
+            self._remove()
+
+    def append(self, lines: list[bytes]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(b"".join(line + b"\n" for line in lines))
+            f.flush()
+            os.fsync(f.fileno())
+        self.depth += len(lines)
+
+    def prepend(self, lines: list[bytes]):
+        """Put `lines` before everything undelivered (rewrites the file)."""
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            rest = f.read()
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(b"".join(line + b"\n" for line in lines) + rest)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._offset_path.unlink(missing_ok=True)
+        self.offset = 0
+        self.depth += len(lines)
+
+    def read(self, count: int) -> tuple[list[bytes], int]:
+        """Up to `count` undelivered lines and the offset just past them."""
+        lines, end = [], self.offset
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                end += len(line)
+                if line.strip():
+                    lines.append(line.rstrip(b"\n"))
+                    if len(lines) == count:
+                        break
+        if lines:
+            self.oldest = line_timestamp(lines[0])
+        return lines, end
+
+    def commit(self, end: int, count: int):
+        """The lines before `end` (`count` events) were delivered."""
+        self.depth = max(0, self.depth - count)
+        if not self.depth or end >= self.path.stat().st_size:
+            self._remove()
+            return
+        self.offset = end
+        tmp = self._offset_path.with_suffix(".tmp")
+        tmp.write_text(str(end))
+        os.replace(tmp, self._offset_path)
+
+    def _remove(self):
+        self.path.unlink(missing_ok=True)
+        self._offset_path.unlink(missing_ok=True)
+        self.offset, self.depth, self.oldest = 0, 0, None
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size - self.offset if self.depth else 0
 
 
 class GameEmitter:
@@ -27,8 +189,23 @@ class GameEmitter:
 
     def __init__(self, game_id: str):
         self.game_id = game_id
-        self._q: queue.Queue = queue.Queue()
+        self.emitter_id = uuid.uuid4().hex[:8]
+        self._seqs = itertools.count(1)
+        self._q: queue.Queue = queue.Queue(maxsize=MAX_QUEUED)
         self._stopped = False
+        self.tick: int | None = None   # current game tick, set by the game loop
+        self.sent = 0
+        self.batches = 0
+        self.retries = 0
+        self.dropped = 0
+        self.delivery_lag = 0.0         # age of the oldest event in the last batch delivered
+        self._backoff = RETRY_MIN
+        self._spool = Spool(SPOOL_DIR, game_id) if SPOOL_DIR is not None else None
+        self._spool_lock = threading.Lock()    # emit() spills while the worker delivers
+        url = urllib.parse.urlsplit(BRIDGE_URL)
+        self._address = (url.scheme, url.netloc)
+        self._path = f"{url.path.rstrip('/')}/game/ingest/{urllib.parse.quote(game_id)}/batch"
+        self._conn: http.client.HTTPConnection | None = None
         self._worker = threading.Thread(target=self._run, daemon=True)
         self._worker.start()
 
@@ -38,14 +215,50 @@ class GameEmitter:
 
     def emit(self, event_type: str, **payload: Any):
         """Queue an event for background delivery."""
-        event = {"type": event_type, "game_id": self.game_id, **payload}
-        self._q.put(event)
+        event = {"type": event_type, "game_id": self.game_id,
+                 "timestamp": time.time(), **payload}
+        if self.tick is not None:
+            # Matches the tick in the frame header of the video stream
+            event.setdefault("tick", self.tick)
+        # For the bridge to drop redelivered events
+        event["emitter"], event["emit_seq"] = self.emitter_id, next(self._seqs)
+        try:
+            self._q.put_nowait(event)
+        except queue.Full:
+            self._spill(event)
+
+    def _spill(self, event: dict):
+        """The queue is full: move it, then `event`, to the spool (drop without one)."""
+        if self._spool is None:
+            self.dropped += 1
+            return
+        with self._spool_lock:
+            closed = self._spool_queued([], locked=True)
+            self._keep([stamped_line(event)])
+        if closed:
+            self._q.put(None)
+        try:
+            self._q.put_nowait(_SPILLED)
+        except queue.Full:
+            pass    # the worker has plenty to wake up to
 
-    def close(self):
+    def close(self, timeout: float = 3):
         """Flush remaining events and stop the worker thread."""
         self._stopped = True
         self._q.put(None)  # sentinel
-        self._worker.join(timeout=3)
+        self._worker.join(timeout=timeout)
+
+    def stats(self) -> dict:
+        spool = self._spool
+        spooled = spool.depth if spool is not None else 0
+        if spooled and spool.oldest is not None:
+            lag = time.time() - spool.oldest
+        else:
+            lag = self.delivery_lag
+        return {"queued": self._q.qsize(), "spooled": spooled,
+                "spool_bytes": spool.size if spool is not None else 0,
+                "sent": self.sent, "batches": self.batches, "retries": self.retries,
+                "dropped": self.dropped, "lag_seconds": round(lag, 3)}
 
     # ------------------------------------------------------------------
     # Convenience helpers matching game event types
@@ -77,30 +290,158 @@ class GameEmitter:
     # ------------------------------------------------------------------
 
     def _run(self):
+        done = False
+        while True:
+            if self._spool is not None and self._spool.depth:
+                # Everything new goes behind what is already spooled
+                done = self._spool_queued() or done
+                if self._deliver_spooled():
+                    continue
+                if done:
+                    break   # the rest stays on disk for the next emitter of this game
+                done = self._wait_to_retry()
+            elif done:
+                break
+            else:
+                batch, done = self._next_batch()
+                if batch:
+                    lines = [stamped_line(event) for event in batch]
+                    if not self._post(lines, self._q.qsize()):
+                        with self._spool_lock:
+                            self._keep(lines, first=True)
+        self._disconnect()
+
+    def _next_batch(self) -> tuple[list, bool]:
+        """The events queued up now, and whether close() came after them."""
+        event = self._q.get()
+        if event is None:
+            return [], True
+        if event is _SPILLED:
+            return [], False
+        batch = [event]
+        deadline = time.monotonic() + BATCH_WAIT
+        while len(batch) < BATCH_EVENTS:
+            try:
+                event = self._q.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if event is None:
+                return batch, True
+            if event is _SPILLED:
+                break       # what came after is in the spool, behind this batch
+            batch.append(event)
+        return batch, False
+
+    def _keep(self, lines: list[bytes], first: bool = False):
+        """
+        Spool events the bridge didn't take (or drop them, without a spool);
+        `first` puts them before anything emit() spilled meanwhile. Call
+        with _spool_lock held.
+        """
+        if self._spool is None:
+            self.dropped += len(lines)  # Bridge offline — drop, game continues
+            return
+        if not self._spool.depth:
+            print(f"[EMITTER] Bridge unreachable; spooling events to {self._spool.path}")
+            self._spool.append(lines)
+        elif first:
+            self._spool.prepend(lines)
+        else:
+            self._spool.append(lines)
+
+    def _spool_queued(self, lines: list[bytes] | None = None, locked: bool = False) -> bool:
+        """Move what is queued to the spool; True if close() was among it."""
+        lines = lines or []
+        done = False
         while True:
-            event = self._q.get()
+            try:
+                event = self._q.get_nowait()
+            except queue.Empty:
+                break
             if event is None:
+                done = True
                 break
-            self._post(event)
-            self._q.task_done()
-
-    def _post(self, event: dict):
-        game_id = event.get("game_id", self.game_id)
-        url = f"{BRIDGE_URL}/game/ingest/{game_id}"
-        body = json.dumps(event).encode()
-        req = urllib.request.Request(
-            url,
-            data=body,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        try:
-            with urllib.request.urlopen(req, timeout=2):
-                pass
-        except urllib.error.URLError:
-            pass  # Bridge offline — silently drop, game continues
-        except Exception:
-            pass
+            if event is not _SPILLED:
+                lines.append(stamped_line(event))
+        if lines:
+            if locked:
+                self._keep(lines)
+            else:
+                with self._spool_lock:
+                    self._keep(lines)
+        return done
+
+    def _deliver_spooled(self) -> bool:
+        with self._spool_lock:
+            lines, end = self._spool.read(BATCH_EVENTS)
+        if lines and not self._post(lines, self._q.qsize() + self._spool.depth - len(lines)):
+            self.retries += 1
+            return False
+        with self._spool_lock:
+            self._spool.commit(end, len(lines))
+        self._backoff = RETRY_MIN
+        if not self._spool.depth:
+            print("[EMITTER] Spooled events delivered")
+        return True
+
+    def _wait_to_retry(self) -> bool:
+        """Back off, spooling events as they come; True once close() was called."""
+        deadline = time.monotonic() + self._backoff
+        self._backoff = min(self._backoff * 2, RETRY_MAX)
+        while True:
+            try:
+                event = self._q.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return False
+            if event is _SPILLED:
+                continue
+            if event is None or self._spool_queued([stamped_line(event)]):
+                return True
+
+    def _post(self, lines: list[bytes], backlog: int) -> bool:
+        """
+        Send one batch; False if it should be tried again later. Batches the
+        bridge rejects as malformed (4xx) are dropped: they would never pass.
+        """
+        body = b"\n".join(lines)
+        headers = {"Content-Type": "application/x-ndjson", "X-Emitter-Backlog": str(backlog)}
+        # A kept-alive connection the bridge has since closed fails on first
+        # use; that one is retried on a new connection
+        for fresh in (self._conn is None, True):
+            try:
+                conn = self._connection()
+                conn.request("POST", self._path, body, headers)
+                with conn.getresponse() as resp:
+                    resp.read()
+            except (OSError, http.client.HTTPException):
+                self._disconnect()
+                if fresh:
+                    return False
+                continue
+            if resp.status >= 500:
+                return False    # e.g. 503 while the bridge can't relay events
+            if resp.status >= 400:
+                self.dropped += len(lines)
+                return True
+            self.sent += len(lines)
+            self.batches += 1
+            timestamp = line_timestamp(lines[0])
+            if timestamp is not None:
+                self.delivery_lag = max(0.0, time.time() - timestamp)
+            return True
+        return False
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            scheme, netloc = self._address
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            self._conn = cls(netloc, timeout=TIMEOUT)
+        return self._conn
+
+    def _disconnect(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 
 # ---------------------------------------------------------------------------
@@ -117,3 +458,13 @@ def get_emitter(game_id: str | None = None) -> GameEmitter:
         gid = game_id or os.environ.get("BRIDGE_GAME_ID", "game-001")
         _default = GameEmitter(gid)
     return _default
+
+
+if __name__ == "__main__":
+    # Deliver what emitters left spooled when their game closed with the bridge away
+    if SPOOL_DIR is None or not SPOOL_DIR.is_dir():
+        raise SystemExit("Nothing spooled")
+    for path in sorted(SPOOL_DIR.glob("*.ndjson")):
+        emitter = GameEmitter(urllib.parse.unquote(path.stem))
+        emitter.close(timeout=60)
+        print(f"{emitter.game_id}: {emitter.stats()}")